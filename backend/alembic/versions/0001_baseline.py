@@ -0,0 +1,397 @@
+"""Baseline: the schema as the app originally created it with create_all.
+
+Databases created by create_all from the original models match this
+revision: ``alembic stamp 0001`` them, then upgrade.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-17 22:06:23.027120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('companies',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('domain', sa.String(), nullable=True),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('logo_url', sa.String(), nullable=True),
+    sa.Column('website', sa.String(), nullable=True),
+    sa.Column('address', sa.Text(), nullable=True),
+    sa.Column('phone', sa.String(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_companies_domain'), ['domain'], unique=True)
+        batch_op.create_index(batch_op.f('ix_companies_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_companies_name'), ['name'], unique=False)
+
+    op.create_table('notification_templates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('channel', sa.String(), nullable=False),
+    sa.Column('subject', sa.String(), nullable=True),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('message_template', sa.Text(), nullable=False),
+    sa.Column('variables', sa.JSON(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    with op.batch_alter_table('notification_templates', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_notification_templates_id'), ['id'], unique=False)
+
+    op.create_table('questions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('text', sa.Text(), nullable=False),
+    sa.Column('question_type', sa.String(), nullable=False),
+    sa.Column('is_required', sa.Boolean(), nullable=True),
+    sa.Column('order_index', sa.Integer(), nullable=True),
+    sa.Column('help_text', sa.Text(), nullable=True),
+    sa.Column('validation_rules', sa.JSON(), nullable=True),
+    sa.Column('grid_columns', sa.JSON(), nullable=True),
+    sa.Column('grid_rows', sa.JSON(), nullable=True),
+    sa.Column('min_value', sa.Integer(), nullable=True),
+    sa.Column('max_value', sa.Integer(), nullable=True),
+    sa.Column('min_label', sa.String(), nullable=True),
+    sa.Column('max_label', sa.String(), nullable=True),
+    sa.Column('allowed_file_types', sa.JSON(), nullable=True),
+    sa.Column('max_file_size', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('questions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_questions_id'), ['id'], unique=False)
+
+    op.create_table('chat_integrations',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('platform', sa.String(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('webhook_url', sa.String(), nullable=True),
+    sa.Column('bot_token', sa.String(), nullable=True),
+    sa.Column('signing_secret', sa.String(), nullable=True),
+    sa.Column('app_id', sa.String(), nullable=True),
+    sa.Column('client_id', sa.String(), nullable=True),
+    sa.Column('client_secret', sa.String(), nullable=True),
+    sa.Column('workspace_id', sa.String(), nullable=True),
+    sa.Column('workspace_name', sa.String(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('config', sa.JSON(), nullable=True),
+    sa.Column('last_sync', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('chat_integrations', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_chat_integrations_id'), ['id'], unique=False)
+
+    op.create_table('question_options',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('text', sa.String(), nullable=False),
+    sa.Column('value', sa.String(), nullable=False),
+    sa.Column('order_index', sa.Integer(), nullable=True),
+    sa.Column('is_correct', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('question_options', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_question_options_id'), ['id'], unique=False)
+
+    op.create_table('teams',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('teams', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_teams_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_teams_name'), ['name'], unique=False)
+
+    op.create_table('users',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('username', sa.String(), nullable=False),
+    sa.Column('full_name', sa.String(), nullable=False),
+    sa.Column('hashed_password', sa.String(), nullable=False),
+    sa.Column('role', sa.String(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('is_verified', sa.Boolean(), nullable=True),
+    sa.Column('avatar_url', sa.String(), nullable=True),
+    sa.Column('timezone', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('company_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['company_id'], ['companies.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_users_email'), ['email'], unique=True)
+        batch_op.create_index(batch_op.f('ix_users_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_users_username'), ['username'], unique=True)
+
+    op.create_table('ceremonies',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('cadence', sa.String(), nullable=False),
+    sa.Column('custom_schedule', sa.JSON(), nullable=True),
+    sa.Column('start_time', sa.Time(), nullable=False),
+    sa.Column('timezone', sa.String(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('send_notifications', sa.Boolean(), nullable=True),
+    sa.Column('notification_lead_time', sa.Integer(), nullable=True),
+    sa.Column('chat_notifications_enabled', sa.Boolean(), nullable=True),
+    sa.Column('chat_webhook_url', sa.String(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('ceremonies', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_ceremonies_id'), ['id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_ceremonies_name'), ['name'], unique=False)
+
+    op.create_table('notifications',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('message', sa.Text(), nullable=False),
+    sa.Column('channel', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('additional_data', sa.JSON(), nullable=True),
+    sa.Column('sent_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('read_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_notifications_id'), ['id'], unique=False)
+
+    op.create_table('team_managers',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('permissions', sa.Text(), nullable=True),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('team_managers', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_team_managers_id'), ['id'], unique=False)
+
+    op.create_table('team_members',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('team_members', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_team_members_id'), ['id'], unique=False)
+
+    op.create_table('work_schedules',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('work_days', sa.JSON(), nullable=False),
+    sa.Column('start_time', sa.Time(), nullable=False),
+    sa.Column('end_time', sa.Time(), nullable=False),
+    sa.Column('timezone', sa.String(), nullable=True),
+    sa.Column('notification_time', sa.Time(), nullable=True),
+    sa.Column('use_work_hours', sa.Boolean(), nullable=True),
+    sa.Column('break_times', sa.JSON(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id')
+    )
+    with op.batch_alter_table('work_schedules', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_work_schedules_id'), ['id'], unique=False)
+
+    op.create_table('ceremony_questions',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('ceremony_id', sa.Integer(), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('order_index', sa.Integer(), nullable=True),
+    sa.Column('is_required', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['ceremony_id'], ['ceremonies.id'], ),
+    sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('ceremony_questions', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_ceremony_questions_id'), ['id'], unique=False)
+
+    op.create_table('ceremony_responses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('ceremony_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('submitted_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('is_complete', sa.Boolean(), nullable=True),
+    sa.Column('status', sa.String(), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('mood_rating', sa.Integer(), nullable=True),
+    sa.Column('energy_level', sa.Integer(), nullable=True),
+    sa.ForeignKeyConstraint(['ceremony_id'], ['ceremonies.id'], ),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('ceremony_responses', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_ceremony_responses_id'), ['id'], unique=False)
+
+    op.create_table('question_responses',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('ceremony_response_id', sa.Integer(), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('text_response', sa.Text(), nullable=True),
+    sa.Column('selected_options', sa.JSON(), nullable=True),
+    sa.Column('numeric_response', sa.Float(), nullable=True),
+    sa.Column('date_response', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('time_response', sa.String(), nullable=True),
+    sa.Column('file_path', sa.String(), nullable=True),
+    sa.Column('file_name', sa.String(), nullable=True),
+    sa.Column('file_size', sa.Integer(), nullable=True),
+    sa.Column('file_type', sa.String(), nullable=True),
+    sa.Column('response_time', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('is_required', sa.Boolean(), nullable=True),
+    sa.Column('validation_errors', sa.JSON(), nullable=True),
+    sa.ForeignKeyConstraint(['ceremony_response_id'], ['ceremony_responses.id'], ),
+    sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('question_responses', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_question_responses_id'), ['id'], unique=False)
+
+    op.create_table('response_attachments',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('question_response_id', sa.Integer(), nullable=False),
+    sa.Column('file_path', sa.String(), nullable=False),
+    sa.Column('file_name', sa.String(), nullable=False),
+    sa.Column('file_size', sa.Integer(), nullable=False),
+    sa.Column('file_type', sa.String(), nullable=False),
+    sa.Column('mime_type', sa.String(), nullable=True),
+    sa.Column('uploaded_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.Column('uploaded_by', sa.Integer(), nullable=False),
+    sa.Column('is_valid', sa.Boolean(), nullable=True),
+    sa.Column('validation_errors', sa.JSON(), nullable=True),
+    sa.ForeignKeyConstraint(['question_response_id'], ['question_responses.id'], ),
+    sa.ForeignKeyConstraint(['uploaded_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('response_attachments', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_response_attachments_id'), ['id'], unique=False)
+
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('response_attachments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_response_attachments_id'))
+
+    op.drop_table('response_attachments')
+    with op.batch_alter_table('question_responses', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_question_responses_id'))
+
+    op.drop_table('question_responses')
+    with op.batch_alter_table('ceremony_responses', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_ceremony_responses_id'))
+
+    op.drop_table('ceremony_responses')
+    with op.batch_alter_table('ceremony_questions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_ceremony_questions_id'))
+
+    op.drop_table('ceremony_questions')
+    with op.batch_alter_table('work_schedules', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_work_schedules_id'))
+
+    op.drop_table('work_schedules')
+    with op.batch_alter_table('team_members', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_team_members_id'))
+
+    op.drop_table('team_members')
+    with op.batch_alter_table('team_managers', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_team_managers_id'))
+
+    op.drop_table('team_managers')
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_notifications_id'))
+
+    op.drop_table('notifications')
+    with op.batch_alter_table('ceremonies', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_ceremonies_name'))
+        batch_op.drop_index(batch_op.f('ix_ceremonies_id'))
+
+    op.drop_table('ceremonies')
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_users_username'))
+        batch_op.drop_index(batch_op.f('ix_users_id'))
+        batch_op.drop_index(batch_op.f('ix_users_email'))
+
+    op.drop_table('users')
+    with op.batch_alter_table('teams', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_teams_name'))
+        batch_op.drop_index(batch_op.f('ix_teams_id'))
+
+    op.drop_table('teams')
+    with op.batch_alter_table('question_options', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_question_options_id'))
+
+    op.drop_table('question_options')
+    with op.batch_alter_table('chat_integrations', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_chat_integrations_id'))
+
+    op.drop_table('chat_integrations')
+    with op.batch_alter_table('questions', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_questions_id'))
+
+    op.drop_table('questions')
+    with op.batch_alter_table('notification_templates', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_notification_templates_id'))
+
+    op.drop_table('notification_templates')
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_companies_name'))
+        batch_op.drop_index(batch_op.f('ix_companies_id'))
+        batch_op.drop_index(batch_op.f('ix_companies_domain'))
+
+    op.drop_table('companies')
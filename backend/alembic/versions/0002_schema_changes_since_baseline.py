@@ -0,0 +1,253 @@
+"""Schema changes made since the baseline: response aggregates, ceremony
+digests, stored files, notification delivery bookkeeping, attachment
+content hashes, users.authz_version and the keyset listing indexes.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-17 22:06:29.800179
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('stored_files',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('file_path', sa.String(), nullable=False),
+    sa.Column('file_size', sa.Integer(), nullable=False),
+    sa.Column('ref_count', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('content_hash')
+    )
+    with op.batch_alter_table('stored_files', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_stored_files_id'), ['id'], unique=False)
+
+    op.create_table('ceremony_digests',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('ceremony_id', sa.Integer(), nullable=False),
+    sa.Column('team_id', sa.Integer(), nullable=False),
+    sa.Column('occurs_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('window_start', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('member_count', sa.Integer(), nullable=False),
+    sa.Column('response_count', sa.Integer(), nullable=False),
+    sa.Column('blocker_count', sa.Integer(), nullable=False),
+    sa.Column('average_mood', sa.Float(), nullable=True),
+    sa.Column('average_energy', sa.Float(), nullable=True),
+    sa.Column('content', sa.JSON(), nullable=False),
+    sa.Column('markdown', sa.Text(), nullable=False),
+    sa.Column('html', sa.Text(), nullable=False),
+    sa.Column('generated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['ceremony_id'], ['ceremonies.id'], ),
+    sa.ForeignKeyConstraint(['team_id'], ['teams.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('ceremony_id', 'occurs_at', name='uq_ceremony_digests_ceremony_occurrence')
+    )
+    with op.batch_alter_table('ceremony_digests', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_ceremony_digests_id'), ['id'], unique=False)
+
+    op.create_table('ceremony_response_aggregates',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('ceremony_id', sa.Integer(), nullable=False),
+    sa.Column('question_id', sa.Integer(), nullable=False),
+    sa.Column('response_count', sa.Integer(), nullable=False),
+    sa.Column('text_count', sa.Integer(), nullable=False),
+    sa.Column('text_length_sum', sa.Integer(), nullable=False),
+    sa.Column('numeric_count', sa.Integer(), nullable=False),
+    sa.Column('numeric_sum', sa.Float(), nullable=False),
+    sa.Column('numeric_min', sa.Float(), nullable=True),
+    sa.Column('numeric_max', sa.Float(), nullable=True),
+    sa.Column('option_counts', sa.JSON(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('(CURRENT_TIMESTAMP)'), nullable=True),
+    sa.ForeignKeyConstraint(['ceremony_id'], ['ceremonies.id'], ),
+    sa.ForeignKeyConstraint(['question_id'], ['questions.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('ceremony_id', 'question_id', name='uq_ceremony_response_aggregates_ceremony_question')
+    )
+    with op.batch_alter_table('ceremony_response_aggregates', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_ceremony_response_aggregates_ceremony_id'), ['ceremony_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_ceremony_response_aggregates_id'), ['id'], unique=False)
+
+    with op.batch_alter_table('ceremony_responses', schema=None) as batch_op:
+        batch_op.create_index('ix_ceremony_responses_ceremony_submitted', ['ceremony_id', 'submitted_at', 'id'], unique=False)
+        batch_op.create_index('ix_ceremony_responses_team_submitted', ['team_id', 'submitted_at', 'id'], unique=False)
+        batch_op.create_index('ix_ceremony_responses_user_submitted', ['user_id', 'submitted_at', 'id'], unique=False)
+
+    with op.batch_alter_table('chat_integrations', schema=None) as batch_op:
+        batch_op.create_index('ix_chat_integrations_created', ['created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.create_index('ix_companies_created', ['created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('scheduled_for', sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('lease_id', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(sa.Column('last_error', sa.Text(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_notifications_lease_id'), ['lease_id'], unique=False)
+        batch_op.create_index('ix_notifications_status_scheduled', ['status', 'scheduled_for'], unique=False)
+
+    with op.batch_alter_table('question_responses', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_question_responses_ceremony_response_id'), ['ceremony_response_id'], unique=False)
+
+    with op.batch_alter_table('response_attachments', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('content_hash', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_response_attachments_content_hash'), ['content_hash'], unique=False)
+
+    with op.batch_alter_table('teams', schema=None) as batch_op:
+        batch_op.create_index('ix_teams_company_created', ['company_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_teams_created', ['created_at', 'id'], unique=False)
+
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('authz_version', sa.Integer(), server_default='0', nullable=False))
+        batch_op.create_index('ix_users_company_created', ['company_id', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_users_created', ['created_at', 'id'], unique=False)
+
+    backfill_response_aggregates()
+
+
+# Only completed responses count towards a summary (response_summary.SUMMARY_RESPONSE_STATUS)
+_ceremony_responses = sa.table('ceremony_responses',
+    sa.column('id', sa.Integer()),
+    sa.column('ceremony_id', sa.Integer()),
+    sa.column('status', sa.String()),
+)
+_question_responses = sa.table('question_responses',
+    sa.column('ceremony_response_id', sa.Integer()),
+    sa.column('question_id', sa.Integer()),
+    sa.column('text_response', sa.Text()),
+    sa.column('numeric_response', sa.Float()),
+    sa.column('selected_options', sa.JSON()),
+)
+_aggregates = sa.table('ceremony_response_aggregates',
+    sa.column('ceremony_id', sa.Integer()),
+    sa.column('question_id', sa.Integer()),
+    sa.column('response_count', sa.Integer()),
+    sa.column('text_count', sa.Integer()),
+    sa.column('text_length_sum', sa.Integer()),
+    sa.column('numeric_count', sa.Integer()),
+    sa.column('numeric_sum', sa.Float()),
+    sa.column('numeric_min', sa.Float()),
+    sa.column('numeric_max', sa.Float()),
+    sa.column('option_counts', sa.JSON()),
+)
+
+
+def backfill_response_aggregates() -> None:
+    """
+    Fill the new aggregates from the answers already stored, the way
+    response_summary.compute_question_stats does, so summaries of existing
+    ceremonies are not zeroed. Written against the tables as they are at
+    this revision rather than the app models, which may have moved on.
+    """
+    bind = op.get_bind()
+    completed = _question_responses.join(
+        _ceremony_responses, _ceremony_responses.c.id == _question_responses.c.ceremony_response_id
+    )
+    key = (_ceremony_responses.c.ceremony_id, _question_responses.c.question_id)
+    non_empty_text = sa.func.length(sa.func.trim(_question_responses.c.text_response)) > 0
+
+    aggregates = {}
+    rows = bind.execute(
+        sa.select(
+            *key,
+            sa.func.count(),
+            sa.func.sum(sa.case((non_empty_text, 1), else_=0)),
+            sa.func.sum(sa.case((non_empty_text, sa.func.length(_question_responses.c.text_response)), else_=0)),
+            sa.func.count(_question_responses.c.numeric_response),
+            sa.func.sum(_question_responses.c.numeric_response),
+            sa.func.min(_question_responses.c.numeric_response),
+            sa.func.max(_question_responses.c.numeric_response),
+        ).select_from(completed).where(_ceremony_responses.c.status == 'completed').group_by(*key)
+    )
+    for ceremony_id, question_id, count, text_count, text_length, numeric_count, numeric_sum, numeric_min, numeric_max in rows:
+        aggregates[ceremony_id, question_id] = {
+            'ceremony_id': ceremony_id,
+            'question_id': question_id,
+            'response_count': count,
+            'text_count': text_count or 0,
+            'text_length_sum': text_length or 0,
+            'numeric_count': numeric_count,
+            'numeric_sum': numeric_sum or 0.0,
+            'numeric_min': numeric_min,
+            'numeric_max': numeric_max,
+            'option_counts': {},
+        }
+
+    options = bind.execute(
+        sa.select(*key, _question_responses.c.selected_options).select_from(completed).where(
+            _ceremony_responses.c.status == 'completed',
+            _question_responses.c.selected_options.isnot(None)
+        )
+    )
+    for ceremony_id, question_id, selected_options in options:
+        option_counts = aggregates[ceremony_id, question_id]['option_counts']
+        for option in selected_options or []:
+            option_counts[option] = option_counts.get(option, 0) + 1
+
+    if aggregates:
+        op.bulk_insert(_aggregates, list(aggregates.values()))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_index('ix_users_created')
+        batch_op.drop_index('ix_users_company_created')
+        batch_op.drop_column('authz_version')
+
+    with op.batch_alter_table('teams', schema=None) as batch_op:
+        batch_op.drop_index('ix_teams_created')
+        batch_op.drop_index('ix_teams_company_created')
+
+    with op.batch_alter_table('response_attachments', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_response_attachments_content_hash'))
+        batch_op.drop_column('content_hash')
+
+    with op.batch_alter_table('question_responses', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_question_responses_ceremony_response_id'))
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('ix_notifications_status_scheduled')
+        batch_op.drop_index(batch_op.f('ix_notifications_lease_id'))
+        batch_op.drop_column('last_error')
+        batch_op.drop_column('locked_until')
+        batch_op.drop_column('lease_id')
+        batch_op.drop_column('attempts')
+        batch_op.drop_column('scheduled_for')
+
+    with op.batch_alter_table('companies', schema=None) as batch_op:
+        batch_op.drop_index('ix_companies_created')
+
+    with op.batch_alter_table('chat_integrations', schema=None) as batch_op:
+        batch_op.drop_index('ix_chat_integrations_created')
+
+    with op.batch_alter_table('ceremony_responses', schema=None) as batch_op:
+        batch_op.drop_index('ix_ceremony_responses_user_submitted')
+        batch_op.drop_index('ix_ceremony_responses_team_submitted')
+        batch_op.drop_index('ix_ceremony_responses_ceremony_submitted')
+
+    with op.batch_alter_table('ceremony_response_aggregates', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_ceremony_response_aggregates_id'))
+        batch_op.drop_index(batch_op.f('ix_ceremony_response_aggregates_ceremony_id'))
+
+    op.drop_table('ceremony_response_aggregates')
+    with op.batch_alter_table('ceremony_digests', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_ceremony_digests_id'))
+
+    op.drop_table('ceremony_digests')
+    with op.batch_alter_table('stored_files', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_stored_files_id'))
+
+    op.drop_table('stored_files')
@@ -0,0 +1,70 @@
+"""Indexes for the hot filter paths, and one response per user per ceremony.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17 22:06:46.025899
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if not context.is_offline_mode():
+        duplicates = op.get_bind().execute(sa.text(
+            "SELECT ceremony_id, user_id FROM ceremony_responses "
+            "GROUP BY ceremony_id, user_id HAVING COUNT(*) > 1"
+        )).fetchall()
+        if duplicates:
+            pairs = ", ".join(f"ceremony {ceremony_id}/user {user_id}" for ceremony_id, user_id in duplicates[:10])
+            raise RuntimeError(
+                f"{len(duplicates)} users have more than one response to the same ceremony ({pairs}). "
+                "Remove the extra responses before upgrading."
+            )
+
+    with op.batch_alter_table('ceremony_questions', schema=None) as batch_op:
+        batch_op.create_index('ix_ceremony_questions_ceremony_order', ['ceremony_id', 'order_index'], unique=False)
+
+    with op.batch_alter_table('ceremony_responses', schema=None) as batch_op:
+        batch_op.create_index('uq_ceremony_responses_ceremony_user', ['ceremony_id', 'user_id'], unique=True)
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.create_index('ix_notifications_user_status', ['user_id', 'status'], unique=False)
+
+    with op.batch_alter_table('team_managers', schema=None) as batch_op:
+        batch_op.create_index('ix_team_managers_team_user', ['team_id', 'user_id'], unique=False)
+        batch_op.create_index('ix_team_managers_user', ['user_id'], unique=False)
+
+    with op.batch_alter_table('team_members', schema=None) as batch_op:
+        batch_op.create_index('ix_team_members_team_user', ['team_id', 'user_id'], unique=False)
+        batch_op.create_index('ix_team_members_user', ['user_id'], unique=False)
+
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('team_members', schema=None) as batch_op:
+        batch_op.drop_index('ix_team_members_user')
+        batch_op.drop_index('ix_team_members_team_user')
+
+    with op.batch_alter_table('team_managers', schema=None) as batch_op:
+        batch_op.drop_index('ix_team_managers_user')
+        batch_op.drop_index('ix_team_managers_team_user')
+
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('ix_notifications_user_status')
+
+    with op.batch_alter_table('ceremony_responses', schema=None) as batch_op:
+        batch_op.drop_index('uq_ceremony_responses_ceremony_user')
+
+    with op.batch_alter_table('ceremony_questions', schema=None) as batch_op:
+        batch_op.drop_index('ix_ceremony_questions_ceremony_order')
+
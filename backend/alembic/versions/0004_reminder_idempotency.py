@@ -0,0 +1,33 @@
+"""One reminder per member per ceremony occurrence.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 09:12:04.511730
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Reminders planned before this revision keep NULLs, which never conflict
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('ceremony_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('occurs_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.create_index('uq_notifications_reminder', ['user_id', 'ceremony_id', 'occurs_at'], unique=True)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('notifications', schema=None) as batch_op:
+        batch_op.drop_index('uq_notifications_reminder')
+        batch_op.drop_column('occurs_at')
+        batch_op.drop_column('ceremony_id')
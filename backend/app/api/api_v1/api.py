@@ -1,13 +1,21 @@
-from fastapi import APIRouter
-from app.api.api_v1.endpoints import auth, users, companies, teams, ceremonies, questions, responses, admin
+from importlib import import_module
+from fastapi import FastAPI
 
-api_router = APIRouter()
+# (endpoint module, path prefix, OpenAPI tag). Each router is included on
+# the app directly: FastAPI rebuilds every route at each include_router
+# level, so nesting them under an intermediate APIRouter doubled that work.
+API_ROUTERS = (
+    ("auth", "/auth", "authentication"),
+    ("users", "/users", "users"),
+    ("companies", "/companies", "companies"),
+    ("teams", "/teams", "teams"),
+    ("ceremonies", "/ceremonies", "ceremonies"),
+    ("questions", "/questions", "questions"),
+    ("responses", "/responses", "responses"),
+    ("admin", "/admin", "admin"),
+)
 
-api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
-api_router.include_router(users.router, prefix="/users", tags=["users"])
-api_router.include_router(companies.router, prefix="/companies", tags=["companies"])
-api_router.include_router(teams.router, prefix="/teams", tags=["teams"])
-api_router.include_router(ceremonies.router, prefix="/ceremonies", tags=["ceremonies"])
-api_router.include_router(questions.router, prefix="/questions", tags=["questions"])
-api_router.include_router(responses.router, prefix="/responses", tags=["responses"])
-api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
+def include_api_routers(app: FastAPI, prefix: str) -> None:
+    for module_name, path, tag in API_ROUTERS:
+        module = import_module(f"app.api.api_v1.endpoints.{module_name}")
+        app.include_router(module.router, prefix=prefix + path, tags=[tag])
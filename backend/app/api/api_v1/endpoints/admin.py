@@ -1,22 +1,22 @@
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from datetime import datetime, timedelta
+from sqlalchemy import func, text
+from datetime import datetime
 from app.core.auth import get_current_admin_user
 from app.core.database import get_db
-from app.core.security import get_password_hash
-from app.models.user import User, UserRole
+from app.core.user_cache import invalidate_cached_user
+from app.core.pagination import paginate_keyset
+from app.core.security import hash_password, password_hasher
+from app.models.user import User
 from app.models.company import Company
 from app.models.team import Team, TeamMember, TeamManager
-from app.models.ceremony import Ceremony
-from app.models.response import CeremonyResponse
-from app.models.question import Question
 from app.models.chat_integration import ChatIntegration
 from app.models.work_schedule import WorkSchedule
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserListResponse
 from app.schemas.company import CompanyCreate, CompanyUpdate, CompanyResponse, CompanyListResponse
 from app.schemas.team import TeamCreate, TeamUpdate, TeamResponse, TeamListResponse
+from app.services import admin_stats, attachment_store
 from app.schemas.admin import (
     AdminDashboardStats, UserManagementResponse, CompanyManagementResponse,
     TeamManagementResponse, IntegrationManagementResponse, SystemHealthResponse
@@ -35,68 +35,8 @@ async def get_admin_dashboard(
 ):
     """Get admin dashboard statistics and overview"""
     
-    # User statistics
-    total_users = db.query(func.count(User.id)).scalar()
-    active_users = db.query(func.count(User.id)).filter(User.is_active == True).scalar()
-    verified_users = db.query(func.count(User.id)).filter(User.is_verified == True).scalar()
-    admin_users = db.query(func.count(User.id)).filter(User.role == UserRole.ADMIN).scalar()
-    
-    # Company statistics
-    total_companies = db.query(func.count(Company.id)).scalar()
-    active_companies = db.query(func.count(Company.id)).filter(Company.is_active == True).scalar()
-    
-    # Team statistics
-    total_teams = db.query(func.count(Team.id)).scalar()
-    active_teams = db.query(func.count(Team.id)).filter(Team.is_active == True).scalar()
-    
-    # Ceremony statistics
-    total_ceremonies = db.query(func.count(Ceremony.id)).scalar()
-    active_ceremonies = db.query(func.count(Ceremony.id)).filter(Ceremony.is_active == True).scalar()
-    
-    # Response statistics
-    total_responses = db.query(func.count(CeremonyResponse.id)).scalar()
-    completed_responses = db.query(func.count(CeremonyResponse.id)).filter(CeremonyResponse.status == "completed").scalar()
-    
-    # Question statistics
-    total_questions = db.query(func.count(Question.id)).scalar()
-    
-    # Recent activity (last 7 days)
-    week_ago = datetime.utcnow() - timedelta(days=7)
-    
-    recent_users = db.query(func.count(User.id)).filter(User.created_at >= week_ago).scalar()
-    recent_responses = db.query(func.count(CeremonyResponse.id)).filter(CeremonyResponse.submitted_at >= week_ago).scalar()
-    
-    return AdminDashboardStats(
-        users={
-            "total": total_users,
-            "active": active_users,
-            "verified": verified_users,
-            "admins": admin_users,
-            "recent": recent_users
-        },
-        companies={
-            "total": total_companies,
-            "active": active_companies
-        },
-        teams={
-            "total": total_teams,
-            "active": active_teams
-        },
-        ceremonies={
-            "total": total_ceremonies,
-            "active": active_ceremonies
-        },
-        responses={
-            "total": total_responses,
-            "active": completed_responses,  # Using completed responses as "active"
-            "recent": recent_responses
-        },
-        questions={
-            "total": total_questions,
-            "active": total_questions,  # All questions are considered "active" for now
-            "recent": 0  # No recent questions tracking yet
-        }
-    )
+    stats = admin_stats.get_platform_stats(db)
+    return AdminDashboardStats(**admin_stats.build_dashboard_stats(stats))
 
 # ============================================================================
 # USER MANAGEMENT
@@ -106,6 +46,8 @@ async def get_admin_dashboard(
 async def get_users_management(
     skip: int = Query(0, ge=0, description="Number of users to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of users to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor; takes precedence over skip"),
+    include_total: bool = Query(True, description="Compute total_count (skip it for cheaper deep pages)"),
     company_id: Optional[int] = Query(None, description="Filter by company ID"),
     role: Optional[str] = Query(None, description="Filter by user role"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
@@ -136,16 +78,17 @@ async def get_users_management(
         )
     
     # Get total count for pagination
-    total_count = query.count()
+    total_count = query.count() if include_total else None
     
     # Apply pagination and ordering
-    users = query.order_by(desc(User.created_at)).offset(skip).limit(limit).all()
+    users, next_cursor = paginate_keyset(query, User.created_at, User.id, cursor, limit, skip)
     
     return UserManagementResponse(
         users=users,
         total_count=total_count,
         skip=skip,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor
     )
 
 @router.post("/users", response_model=UserResponse)
@@ -174,7 +117,7 @@ async def create_user_admin(
             )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await hash_password(user_data.password)
     db_user = User(
         email=user_data.email,
         username=user_data.username,
@@ -231,11 +174,12 @@ async def update_user_admin(
     update_data = user_data.dict(exclude_unset=True)
     for field, value in update_data.items():
         if field == "password" and value:
-            setattr(user, "hashed_password", get_password_hash(value))
+            setattr(user, "hashed_password", await hash_password(value))
         elif field != "password":
             setattr(user, field, value)
     
     db.commit()
+    invalidate_cached_user(user_id)
     db.refresh(user)
     
     return user
@@ -264,6 +208,7 @@ async def delete_user_admin(
     # Soft delete - mark as inactive instead of hard delete
     user.is_active = False
     db.commit()
+    invalidate_cached_user(user_id)
     
     return {"message": "User deactivated successfully"}
 
@@ -284,6 +229,7 @@ async def activate_user_admin(
     
     user.is_active = True
     db.commit()
+    invalidate_cached_user(user_id)
     
     return {"message": "User activated successfully"}
 
@@ -295,6 +241,8 @@ async def activate_user_admin(
 async def get_companies_management(
     skip: int = Query(0, ge=0, description="Number of companies to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of companies to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor; takes precedence over skip"),
+    include_total: bool = Query(True, description="Compute total_count (skip it for cheaper deep pages)"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     search: Optional[str] = Query(None, description="Search by name or domain"),
     current_user: User = Depends(get_current_admin_user),
@@ -315,16 +263,17 @@ async def get_companies_management(
         )
     
     # Get total count for pagination
-    total_count = query.count()
+    total_count = query.count() if include_total else None
     
     # Apply pagination and ordering
-    companies = query.order_by(desc(Company.created_at)).offset(skip).limit(limit).all()
+    companies, next_cursor = paginate_keyset(query, Company.created_at, Company.id, cursor, limit, skip)
     
     return CompanyManagementResponse(
         companies=companies,
         total_count=total_count,
         skip=skip,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor
     )
 
 @router.post("/companies", response_model=CompanyResponse)
@@ -455,6 +404,8 @@ async def delete_company_admin(
 async def get_teams_management(
     skip: int = Query(0, ge=0, description="Number of teams to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of teams to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor; takes precedence over skip"),
+    include_total: bool = Query(True, description="Compute total_count (skip it for cheaper deep pages)"),
     company_id: Optional[int] = Query(None, description="Filter by company ID"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     search: Optional[str] = Query(None, description="Search by team name"),
@@ -475,16 +426,17 @@ async def get_teams_management(
         query = query.filter(Team.name.ilike(search_filter))
     
     # Get total count for pagination
-    total_count = query.count()
+    total_count = query.count() if include_total else None
     
     # Apply pagination and ordering
-    teams = query.order_by(desc(Team.created_at)).offset(skip).limit(limit).all()
+    teams, next_cursor = paginate_keyset(query, Team.created_at, Team.id, cursor, limit, skip)
     
     return TeamManagementResponse(
         teams=teams,
         total_count=total_count,
         skip=skip,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor
     )
 
 @router.post("/teams", response_model=TeamResponse)
@@ -599,6 +551,8 @@ async def delete_team_admin(
 async def get_integrations_management(
     skip: int = Query(0, ge=0, description="Number of integrations to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of integrations to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's next_cursor; takes precedence over skip"),
+    include_total: bool = Query(True, description="Compute total_count (skip it for cheaper deep pages)"),
     platform: Optional[str] = Query(None, description="Filter by platform"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     current_user: User = Depends(get_current_admin_user),
@@ -615,16 +569,17 @@ async def get_integrations_management(
         query = query.filter(ChatIntegration.is_active == is_active)
     
     # Get total count for pagination
-    total_count = query.count()
+    total_count = query.count() if include_total else None
     
     # Apply pagination and ordering
-    integrations = query.order_by(desc(ChatIntegration.created_at)).offset(skip).limit(limit).all()
+    integrations, next_cursor = paginate_keyset(query, ChatIntegration.created_at, ChatIntegration.id, cursor, limit, skip)
     
     return IntegrationManagementResponse(
         integrations=integrations,
         total_count=total_count,
         skip=skip,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor
     )
 
 @router.post("/integrations")
@@ -717,57 +672,63 @@ async def get_system_health(
     
     try:
         # Test database connection
-        db.execute("SELECT 1")
+        db.execute(text("SELECT 1"))
         db_status = "healthy"
     except Exception as e:
         db_status = f"error: {str(e)}"
     
     # Get system statistics
-    total_users = db.query(func.count(User.id)).scalar()
-    total_companies = db.query(func.count(Company.id)).scalar()
-    total_teams = db.query(func.count(Team.id)).scalar()
-    total_ceremonies = db.query(func.count(Ceremony.id)).scalar()
+    stats = admin_stats.get_platform_stats(db)
     
     # Check for potential issues
     issues = []
     
     # Check for users without companies
-    orphaned_users = db.query(func.count(User.id)).filter(User.company_id.is_(None)).scalar()
+    orphaned_users = stats["users_without_company"]
     if orphaned_users > 0:
         issues.append(f"{orphaned_users} users without company assignment")
     
     # Check for teams without companies
-    orphaned_teams = db.query(func.count(Team.id)).filter(Team.company_id.is_(None)).scalar()
+    orphaned_teams = stats["teams_without_company"]
     if orphaned_teams > 0:
         issues.append(f"{orphaned_teams} teams without company assignment")
     
     # Check for inactive users
-    inactive_users = db.query(func.count(User.id)).filter(User.is_active == False).scalar()
+    inactive_users = stats["users_inactive"]
     if inactive_users > 0:
         issues.append(f"{inactive_users} inactive users")
     
     return SystemHealthResponse(
         database_status=db_status,
-        total_users=total_users,
-        total_companies=total_companies,
-        total_teams=total_teams,
-        total_ceremonies=total_ceremonies,
+        total_users=stats["users_total"],
+        total_companies=stats["companies_total"],
+        total_teams=stats["teams_total"],
+        total_ceremonies=stats["ceremonies_total"],
         issues=issues,
         timestamp=datetime.utcnow()
     )
 
+@router.get("/system/password-hashing")
+async def get_password_hashing_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Load on this worker's password hashing pool (admin only)"""
+    return password_hasher.stats()._asdict()
+
+# A plain def: FastAPI runs it in the threadpool, as the cleanup walks and stats the upload tree
 @router.post("/system/maintenance/cleanup")
-async def run_system_cleanup(
+def run_system_cleanup(
+    dry_run: bool = Query(False, description="Report what would be removed without removing it"),
     current_user: User = Depends(get_current_admin_user),
     db: Session = Depends(get_db)
 ):
     """Run system cleanup tasks (admin only)"""
     
-    # This is a placeholder for actual cleanup tasks
-    # In a real implementation, you might:
-    # - Clean up old log files
-    # - Archive old data
-    # - Optimize database tables
-    # - Clean up temporary files
+    # Reclaim uploaded files no attachment or answer references any more
+    uploads = attachment_store.collect_garbage(db, dry_run=dry_run)
     
-    return {"message": "System cleanup completed successfully"}
+    return {
+        "message": "System cleanup dry run completed" if dry_run else "System cleanup completed successfully",
+        "dry_run": dry_run,
+        "uploads": uploads._asdict()
+    }
@@ -1,10 +1,12 @@
 from datetime import timedelta
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.auth import get_current_user
-from app.core.database import get_db
-from app.core.security import create_access_token, verify_password
+from app.core.authorization import build_team_claims
+from app.core.database import get_async_db
+from app.core.security import create_access_token, verify_and_update_password
 from app.core.config import settings
 from app.models.user import User
 from app.schemas.auth import Token, LoginRequest
@@ -14,10 +16,17 @@ router = APIRouter()
 @router.post("/login", response_model=Token)
 async def login(
     login_data: LoginRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    user = db.query(User).filter(User.email == login_data.email).first()
-    if not user or not verify_password(login_data.password, user.hashed_password):
+    result = await db.execute(select(User).where(User.email == login_data.email))
+    user = result.scalar_one_or_none()
+    verified, new_hash = False, None
+    if user:
+        # bcrypt takes 100 ms+ and may queue behind other logins: give the
+        # connection back first, then check on the hashing pool, not the event loop
+        await db.commit()
+        verified, new_hash = await verify_and_update_password(login_data.password, user.hashed_password)
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -30,9 +39,16 @@ async def login(
             detail="Inactive user"
         )
     
+    if new_hash:
+        # Bring the stored hash to the configured cost while the password is at hand
+        user.hashed_password = new_hash
+        await db.commit()
+    
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        subject=user.email, expires_delta=access_token_expires
+        subject=user.email,
+        expires_delta=access_token_expires,
+        claims=await build_team_claims(db, user)
     )
     
     return {
@@ -60,11 +76,14 @@ async def logout(
 
 @router.post("/refresh", response_model=Token)
 async def refresh_token(
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
 ):
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        subject=current_user.email, expires_delta=access_token_expires
+        subject=current_user.email,
+        expires_delta=access_token_expires,
+        claims=await build_team_claims(db, current_user)
     )
     
     return {
@@ -1,11 +1,14 @@
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.auth import get_current_user, get_current_admin_user
-from app.core.database import get_db
+from app.core.authorization import TeamAccess, get_team_access
+from app.core.database import get_async_db
 from app.models.ceremony import Ceremony, CeremonyQuestion
-from app.models.team import Team, TeamMember, TeamManager
+from app.models.team import Team
 from app.models.user import User
+from app.services.ceremony_scheduler import remove_ceremony, upsert_ceremony
 from app.schemas.ceremony import (
     CeremonyCreate, CeremonyUpdate, Ceremony as CeremonySchema, CeremonyListResponse,
     CeremonyQuestionCreate, CeremonyQuestionResponse
@@ -20,33 +23,34 @@ async def get_ceremonies(
     team_id: Optional[int] = Query(None, description="Filter by team ID"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get list of ceremonies with optional filtering"""
-    query = db.query(Ceremony)
+    query = select(Ceremony)
     
     # Non-admin users can only see ceremonies from teams they belong to
     if current_user.role != "admin":
-        user_teams = db.query(TeamMember.team_id).filter(TeamMember.user_id == current_user.id).all()
-        team_ids = [tm.team_id for tm in user_teams]
-        query = query.filter(Ceremony.team_id.in_(team_ids))
+        query = query.where(Ceremony.team_id.in_(team_access.member_team_ids()))
     
     if team_id:
-        query = query.filter(Ceremony.team_id == team_id)
+        query = query.where(Ceremony.team_id == team_id)
     if is_active is not None:
-        query = query.filter(Ceremony.is_active == is_active)
+        query = query.where(Ceremony.is_active == is_active)
     
-    ceremonies = query.offset(skip).limit(limit).all()
+    result = await db.execute(query.offset(skip).limit(limit))
+    ceremonies = result.scalars().all()
     return ceremonies
 
 @router.get("/{ceremony_id}", response_model=CeremonySchema)
 async def get_ceremony(
     ceremony_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get ceremony by ID"""
-    ceremony = db.query(Ceremony).filter(Ceremony.id == ceremony_id).first()
+    ceremony = await db.get(Ceremony, ceremony_id)
     if not ceremony:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -55,10 +59,7 @@ async def get_ceremony(
     
     # Check if user has access to this ceremony's team
     if current_user.role != "admin":
-        is_member = db.query(TeamMember).filter(
-            TeamMember.team_id == ceremony.team_id,
-            TeamMember.user_id == current_user.id
-        ).first()
+        is_member = team_access.is_member(ceremony.team_id)
         if not is_member:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -71,11 +72,12 @@ async def get_ceremony(
 async def create_ceremony(
     ceremony_data: CeremonyCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new ceremony"""
     # Check if team exists
-    team = db.query(Team).filter(Team.id == ceremony_data.team_id).first()
+    team = await db.get(Team, ceremony_data.team_id)
     if not team:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -84,10 +86,7 @@ async def create_ceremony(
     
     # Check permissions - only admins or team managers can create ceremonies
     if current_user.role != "admin":
-        is_manager = db.query(TeamManager).filter(
-            TeamManager.team_id == ceremony_data.team_id,
-            TeamManager.user_id == current_user.id
-        ).first()
+        is_manager = team_access.is_manager(ceremony_data.team_id)
         if not is_manager:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -95,10 +94,10 @@ async def create_ceremony(
             )
     
     # Check if ceremony name already exists in the team
-    existing_ceremony = db.query(Ceremony).filter(
+    existing_ceremony = await db.scalar(select(Ceremony).where(
         Ceremony.name == ceremony_data.name,
         Ceremony.team_id == ceremony_data.team_id
-    ).first()
+    ).limit(1))
     if existing_ceremony:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -122,8 +121,9 @@ async def create_ceremony(
     )
     
     db.add(db_ceremony)
-    db.commit()
-    db.refresh(db_ceremony)
+    await db.commit()
+    await db.refresh(db_ceremony)
+    upsert_ceremony(db_ceremony)
     
     return db_ceremony
 
@@ -132,10 +132,11 @@ async def update_ceremony(
     ceremony_id: int,
     ceremony_data: CeremonyUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update ceremony information"""
-    ceremony = db.query(Ceremony).filter(Ceremony.id == ceremony_id).first()
+    ceremony = await db.get(Ceremony, ceremony_id)
     if not ceremony:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -144,10 +145,7 @@ async def update_ceremony(
     
     # Check permissions - only admins or team managers can update
     if current_user.role != "admin":
-        is_manager = db.query(TeamManager).filter(
-            TeamManager.team_id == ceremony.team_id,
-            TeamManager.user_id == current_user.id
-        ).first()
+        is_manager = team_access.is_manager(ceremony.team_id)
         if not is_manager:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -159,11 +157,11 @@ async def update_ceremony(
     
     # Check for name conflicts if name is being updated
     if "name" in update_data and update_data["name"] != ceremony.name:
-        existing_ceremony = db.query(Ceremony).filter(
+        existing_ceremony = await db.scalar(select(Ceremony).where(
             Ceremony.name == update_data["name"],
             Ceremony.team_id == ceremony.team_id,
             Ceremony.id != ceremony_id
-        ).first()
+        ).limit(1))
         if existing_ceremony:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -174,8 +172,9 @@ async def update_ceremony(
     for field, value in update_data.items():
         setattr(ceremony, field, value)
     
-    db.commit()
-    db.refresh(ceremony)
+    await db.commit()
+    await db.refresh(ceremony)
+    upsert_ceremony(ceremony)
     
     return ceremony
 
@@ -183,10 +182,11 @@ async def update_ceremony(
 async def delete_ceremony(
     ceremony_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a ceremony"""
-    ceremony = db.query(Ceremony).filter(Ceremony.id == ceremony_id).first()
+    ceremony = await db.get(Ceremony, ceremony_id)
     if not ceremony:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -195,10 +195,7 @@ async def delete_ceremony(
     
     # Check permissions - only admins or team managers can delete
     if current_user.role != "admin":
-        is_manager = db.query(TeamManager).filter(
-            TeamManager.team_id == ceremony.team_id,
-            TeamManager.user_id == current_user.id
-        ).first()
+        is_manager = team_access.is_manager(ceremony.team_id)
         if not is_manager:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -206,11 +203,12 @@ async def delete_ceremony(
             )
     
     # Delete ceremony questions first
-    db.query(CeremonyQuestion).filter(CeremonyQuestion.ceremony_id == ceremony_id).delete()
+    await db.execute(delete(CeremonyQuestion).where(CeremonyQuestion.ceremony_id == ceremony_id))
     
     # Delete the ceremony
-    db.delete(ceremony)
-    db.commit()
+    await db.delete(ceremony)
+    await db.commit()
+    remove_ceremony(ceremony_id)
     
     return {"message": "Ceremony deleted successfully"}
 
@@ -218,10 +216,11 @@ async def delete_ceremony(
 async def activate_ceremony(
     ceremony_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Activate/deactivate a ceremony"""
-    ceremony = db.query(Ceremony).filter(Ceremony.id == ceremony_id).first()
+    ceremony = await db.get(Ceremony, ceremony_id)
     if not ceremony:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -230,10 +229,7 @@ async def activate_ceremony(
     
     # Check permissions - only admins or team managers can activate/deactivate
     if current_user.role != "admin":
-        is_manager = db.query(TeamManager).filter(
-            TeamManager.team_id == ceremony.team_id,
-            TeamManager.user_id == current_user.id
-        ).first()
+        is_manager = team_access.is_manager(ceremony.team_id)
         if not is_manager:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -241,7 +237,8 @@ async def activate_ceremony(
             )
     
     ceremony.is_active = not ceremony.is_active
-    db.commit()
+    await db.commit()
+    upsert_ceremony(ceremony)
     
     status_text = "activated" if ceremony.is_active else "deactivated"
     return {"message": f"Ceremony {status_text} successfully"}
@@ -251,10 +248,11 @@ async def update_ceremony_status(
     ceremony_id: int,
     status: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update ceremony status"""
-    ceremony = db.query(Ceremony).filter(Ceremony.id == ceremony_id).first()
+    ceremony = await db.get(Ceremony, ceremony_id)
     if not ceremony:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -263,10 +261,7 @@ async def update_ceremony_status(
     
     # Check permissions - only admins or team managers can update status
     if current_user.role != "admin":
-        is_manager = db.query(TeamManager).filter(
-            TeamManager.team_id == ceremony.team_id,
-            TeamManager.user_id == current_user.id
-        ).first()
+        is_manager = team_access.is_manager(ceremony.team_id)
         if not is_manager:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -282,7 +277,8 @@ async def update_ceremony_status(
         )
     
     ceremony.status = status
-    db.commit()
+    await db.commit()
+    upsert_ceremony(ceremony)
     
     return {"message": f"Ceremony status updated to {status}"}
 
@@ -291,11 +287,12 @@ async def update_ceremony_status(
 async def get_ceremony_questions(
     ceremony_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get questions for a ceremony"""
     # Check if ceremony exists
-    ceremony = db.query(Ceremony).filter(Ceremony.id == ceremony_id).first()
+    ceremony = await db.get(Ceremony, ceremony_id)
     if not ceremony:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -304,19 +301,17 @@ async def get_ceremony_questions(
     
     # Check if user has access to this ceremony's team
     if current_user.role != "admin":
-        is_member = db.query(TeamMember).filter(
-            TeamMember.team_id == ceremony.team_id,
-            TeamMember.user_id == current_user.id
-        ).first()
+        is_member = team_access.is_member(ceremony.team_id)
         if not is_member:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not enough permissions to access this ceremony"
             )
     
-    questions = db.query(CeremonyQuestion).filter(
+    result = await db.execute(select(CeremonyQuestion).where(
         CeremonyQuestion.ceremony_id == ceremony_id
-    ).order_by(CeremonyQuestion.order_index).all()
+    ).order_by(CeremonyQuestion.order_index))
+    questions = result.scalars().all()
     
     return questions
 
@@ -325,11 +320,12 @@ async def add_ceremony_question(
     ceremony_id: int,
     question_data: CeremonyQuestionCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Add a question to a ceremony"""
     # Check if ceremony exists
-    ceremony = db.query(Ceremony).filter(Ceremony.id == ceremony_id).first()
+    ceremony = await db.get(Ceremony, ceremony_id)
     if not ceremony:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -338,10 +334,7 @@ async def add_ceremony_question(
     
     # Check permissions - only admins or team managers can add questions
     if current_user.role != "admin":
-        is_manager = db.query(TeamManager).filter(
-            TeamManager.team_id == ceremony.team_id,
-            TeamManager.user_id == current_user.id
-        ).first()
+        is_manager = team_access.is_manager(ceremony.team_id)
         if not is_manager:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -350,7 +343,7 @@ async def add_ceremony_question(
     
     # Check if question exists
     from app.models.question import Question
-    question = db.query(Question).filter(Question.id == question_data.question_id).first()
+    question = await db.get(Question, question_data.question_id)
     if not question:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -358,10 +351,10 @@ async def add_ceremony_question(
         )
     
     # Check if question is already in this ceremony
-    existing_question = db.query(CeremonyQuestion).filter(
+    existing_question = await db.scalar(select(CeremonyQuestion).where(
         CeremonyQuestion.ceremony_id == ceremony_id,
         CeremonyQuestion.question_id == question_data.question_id
-    ).first()
+    ).limit(1))
     if existing_question:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -377,8 +370,8 @@ async def add_ceremony_question(
     )
     
     db.add(ceremony_question)
-    db.commit()
-    db.refresh(ceremony_question)
+    await db.commit()
+    await db.refresh(ceremony_question)
     
     return ceremony_question
 
@@ -388,14 +381,15 @@ async def update_ceremony_question(
     question_id: int,
     question_data: CeremonyQuestionCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a ceremony question"""
     # Check if ceremony question exists
-    ceremony_question = db.query(CeremonyQuestion).filter(
+    ceremony_question = await db.scalar(select(CeremonyQuestion).where(
         CeremonyQuestion.ceremony_id == ceremony_id,
         CeremonyQuestion.question_id == question_id
-    ).first()
+    ).limit(1))
     if not ceremony_question:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -403,12 +397,9 @@ async def update_ceremony_question(
         )
     
     # Check permissions - only admins or team managers can update
-    ceremony = db.query(Ceremony).filter(Ceremony.id == ceremony_id).first()
+    ceremony = await db.get(Ceremony, ceremony_id)
     if current_user.role != "admin":
-        is_manager = db.query(TeamManager).filter(
-            TeamManager.team_id == ceremony.team_id,
-            TeamManager.user_id == current_user.id
-        ).first()
+        is_manager = team_access.is_manager(ceremony.team_id)
         if not is_manager:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -419,8 +410,8 @@ async def update_ceremony_question(
     ceremony_question.order_index = question_data.order_index
     ceremony_question.is_required = question_data.is_required
     
-    db.commit()
-    db.refresh(ceremony_question)
+    await db.commit()
+    await db.refresh(ceremony_question)
     
     return ceremony_question
 
@@ -429,14 +420,15 @@ async def remove_ceremony_question(
     ceremony_id: int,
     question_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Remove a question from a ceremony"""
     # Check if ceremony question exists
-    ceremony_question = db.query(CeremonyQuestion).filter(
+    ceremony_question = await db.scalar(select(CeremonyQuestion).where(
         CeremonyQuestion.ceremony_id == ceremony_id,
         CeremonyQuestion.question_id == question_id
-    ).first()
+    ).limit(1))
     if not ceremony_question:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -444,20 +436,17 @@ async def remove_ceremony_question(
         )
     
     # Check permissions - only admins or team managers can remove
-    ceremony = db.query(Ceremony).filter(Ceremony.id == ceremony_id).first()
+    ceremony = await db.get(Ceremony, ceremony_id)
     if current_user.role != "admin":
-        is_manager = db.query(TeamManager).filter(
-            TeamManager.team_id == ceremony.team_id,
-            TeamManager.user_id == current_user.id
-        ).first()
+        is_manager = team_access.is_manager(ceremony.team_id)
         if not is_manager:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Not enough permissions to manage this ceremony"
             )
     
-    db.delete(ceremony_question)
-    db.commit()
+    await db.delete(ceremony_question)
+    await db.commit()
     
     return {"message": "Question removed from ceremony successfully"}
 
@@ -466,11 +455,12 @@ async def reorder_ceremony_questions(
     ceremony_id: int,
     question_orders: List[dict],
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Reorder questions in a ceremony"""
     # Check if ceremony exists
-    ceremony = db.query(Ceremony).filter(Ceremony.id == ceremony_id).first()
+    ceremony = await db.get(Ceremony, ceremony_id)
     if not ceremony:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -479,10 +469,7 @@ async def reorder_ceremony_questions(
     
     # Check permissions - only admins or team managers can reorder
     if current_user.role != "admin":
-        is_manager = db.query(TeamManager).filter(
-            TeamManager.team_id == ceremony.team_id,
-            TeamManager.user_id == current_user.id
-        ).first()
+        is_manager = team_access.is_manager(ceremony.team_id)
         if not is_manager:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -508,14 +495,14 @@ async def reorder_ceremony_questions(
             )
         
         # Find and update the ceremony question
-        ceremony_question = db.query(CeremonyQuestion).filter(
+        ceremony_question = await db.scalar(select(CeremonyQuestion).where(
             CeremonyQuestion.ceremony_id == ceremony_id,
             CeremonyQuestion.question_id == question_id
-        ).first()
+        ).limit(1))
         
         if ceremony_question:
             ceremony_question.order_index = new_order
     
-    db.commit()
+    await db.commit()
     
     return {"message": "Questions reordered successfully"}
@@ -1,8 +1,9 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
 from app.core.auth import get_current_user, get_current_admin_user
 from app.core.database import get_db
+from app.core.pagination import NEXT_CURSOR_HEADER, paginate_keyset
 from app.models.company import Company
 from app.models.user import User
 from app.schemas.company import CompanyCreate, CompanyUpdate, CompanyResponse, CompanyListResponse
@@ -265,8 +266,10 @@ async def get_company_stats(
 @router.get("/{company_id}/users", response_model=List[dict])
 async def get_company_users(
     company_id: int,
+    http_response: Response,
     skip: int = Query(0, ge=0, description="Number of users to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of users to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
     role: Optional[str] = Query(None, description="Filter by user role"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     current_user: User = Depends(get_current_user),
@@ -294,7 +297,9 @@ async def get_company_users(
     if is_active is not None:
         query = query.filter(User.is_active == is_active)
     
-    users = query.offset(skip).limit(limit).all()
+    users, next_cursor = paginate_keyset(query, User.created_at, User.id, cursor, limit, skip)
+    if next_cursor:
+        http_response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     # Return simplified user data
     return [
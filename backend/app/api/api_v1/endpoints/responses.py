@@ -1,41 +1,71 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer, selectinload
+from sqlalchemy import delete, func, and_, or_, select
 from typing import List, Optional
 import json
 from datetime import datetime, timedelta
 
-from app.core.database import get_db
+from app.core.database import AsyncSessionLocal, get_async_db
 from app.core.auth import get_current_user
+from app.core.authorization import TeamAccess, get_team_access
+from app.core.file_responses import file_response
+from app.core.pagination import NEXT_CURSOR_HEADER
 from app.models.user import User
 from app.models.ceremony import Ceremony, CeremonyQuestion
-from app.models.response import CeremonyResponse, QuestionResponse, ResponseAttachment
-from app.models.team import Team, TeamMember
+from app.models.response import CeremonyDigest, CeremonyResponse, QuestionResponse, ResponseAttachment
+from app.models.question import Question, QuestionType
+from app.models.team import Team
 from app.schemas.response import (
     CeremonyResponseCreate, 
+    BulkCeremonyResponseCreate,
+    BulkResponseResult,
+    CeremonyDigestResponse,
+    CeremonyDigestSummary,
     CeremonyResponseUpdate, 
     CeremonyResponseResponse,
     CeremonyResponseList,
     ResponseSummary,
     QuestionResponseSummary,
+    ResponseAttachmentResponse,
     ResponseStatus
 )
+from app.services.response_bulk import submit_bulk_responses
+from app.services.response_summary import build_ceremony_summary
+from app.services import response_aggregates
+from app.services.response_queries import list_ceremony_responses
+from app.services.response_export import EXPORT_MEDIA_TYPES, ExportFormat, export_filename, stream_export
+from app.services.attachment_upload import UploadTooLarge, is_allowed_type, receive_upload, upload_limit, upload_root
+from app.services.attachment_store import move_attachments, record_attachment, release_attachments
+from app.services.attachment_previews import TEXT_PREVIEW, THUMBNAIL, Derivative, derivatives_for, preview_pipeline
 
 router = APIRouter()
 
+async def _load_response(db: AsyncSession, response_id: int) -> Optional[CeremonyResponse]:
+    """Load a response with its answers, replacing any stale copy in the session"""
+    return await db.scalar(
+        select(CeremonyResponse)
+        .where(CeremonyResponse.id == response_id)
+        .options(selectinload(CeremonyResponse.question_responses))
+        .execution_options(populate_existing=True)
+    )
+
 @router.post("/", response_model=CeremonyResponseResponse)
 async def create_ceremony_response(
     response_data: CeremonyResponseCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new ceremony response"""
     
     # Verify ceremony exists and is active
-    ceremony = db.query(Ceremony).filter(
+    ceremony = await db.scalar(select(Ceremony).where(
         Ceremony.id == response_data.ceremony_id,
         Ceremony.is_active == True
-    ).first()
+    ))
     
     if not ceremony:
         raise HTTPException(
@@ -43,11 +73,14 @@ async def create_ceremony_response(
             detail="Ceremony not found or inactive"
         )
     
+    if ceremony.team_id != response_data.team_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Ceremony does not belong to the specified team"
+        )
+    
     # Verify user is member of the team
-    team_member = db.query(TeamMember).filter(
-        TeamMember.team_id == response_data.team_id,
-        TeamMember.user_id == current_user.id
-    ).first()
+    team_member = team_access.is_member(response_data.team_id)
     
     if not team_member:
         raise HTTPException(
@@ -56,10 +89,10 @@ async def create_ceremony_response(
         )
     
     # Check if user already has a response for this ceremony
-    existing_response = db.query(CeremonyResponse).filter(
+    existing_response = await db.scalar(select(CeremonyResponse.id).where(
         CeremonyResponse.ceremony_id == response_data.ceremony_id,
         CeremonyResponse.user_id == current_user.id
-    ).first()
+    ).limit(1))
     
     if existing_response:
         raise HTTPException(
@@ -68,9 +101,10 @@ async def create_ceremony_response(
         )
     
     # Get ceremony questions to validate responses
-    ceremony_questions = db.query(CeremonyQuestion).filter(
+    result = await db.execute(select(CeremonyQuestion).where(
         CeremonyQuestion.ceremony_id == response_data.ceremony_id
-    ).order_by(CeremonyQuestion.order_index).all()
+    ).order_by(CeremonyQuestion.order_index))
+    ceremony_questions = result.scalars().all()
     
     required_questions = [q for q in ceremony_questions if q.is_required]
     
@@ -98,7 +132,15 @@ async def create_ceremony_response(
     )
     
     db.add(ceremony_response)
-    db.flush()  # Get the ID
+    try:
+        await db.flush()  # Get the ID
+    except IntegrityError:
+        # Another request created it since the check above (one response per user per ceremony)
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User already has a response for this ceremony"
+        )
     
     # Create question responses
     question_responses = []
@@ -116,22 +158,110 @@ async def create_ceremony_response(
         question_responses.append(question_response)
     
     db.add_all(question_responses)
-    db.commit()
-    db.refresh(ceremony_response)
+    await db.commit()
+    
+    return await _load_response(db, ceremony_response.id)
+
+@router.post("/bulk", response_model=BulkResponseResult)
+async def create_ceremony_responses_bulk(
+    bulk_data: BulkCeremonyResponseCreate,
+    current_user: User = Depends(get_current_user),
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create many ceremony responses at once, e.g. from a chat integration"""
+    
+    try:
+        result = await db.run_sync(submit_bulk_responses, bulk_data.responses, current_user, team_access)
+        await db.commit()
+    except IntegrityError:
+        # A response in the batch was created concurrently; nothing was written
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A response in this batch was created concurrently; retry the batch"
+        )
+    
+    return result
+
+@router.get("/export")
+async def export_responses(
+    export_format: ExportFormat = Query(ExportFormat.CSV, alias="format", description="csv or jsonl"),
+    team_id: Optional[int] = Query(None, description="Only this team's responses"),
+    ceremony_id: Optional[int] = Query(None, description="Only this ceremony's responses"),
+    submitted_from: Optional[datetime] = Query(None, description="Submitted at or after this instant"),
+    submitted_to: Optional[datetime] = Query(None, description="Submitted before this instant"),
+    response_status: Optional[ResponseStatus] = Query(None, alias="status", description="Filter by response status"),
+    current_user: User = Depends(get_current_user),
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Stream responses flattened to one row per answer, as CSV or JSON lines.
+    
+    Non-admins must pick a team or ceremony they belong to.
+    """
+    filters = []
+    name_parts = []
+    if ceremony_id is not None:
+        ceremony = await db.get(Ceremony, ceremony_id)
+        if not ceremony:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Ceremony not found"
+            )
+        if current_user.role != "admin" and not team_access.is_member(ceremony.team_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied"
+            )
+        filters.append(CeremonyResponse.ceremony_id == ceremony_id)
+        name_parts.append(f"ceremony{ceremony_id}")
+    if team_id is not None:
+        if current_user.role != "admin" and not team_access.is_member(team_id):
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Access denied"
+            )
+        filters.append(CeremonyResponse.team_id == team_id)
+        name_parts.append(f"team{team_id}")
+    if not filters and current_user.role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="team_id or ceremony_id is required"
+        )
     
-    return ceremony_response
+    if submitted_from:
+        filters.append(CeremonyResponse.submitted_at >= submitted_from)
+        name_parts.append(f"from{submitted_from.date().isoformat()}")
+    if submitted_to:
+        filters.append(CeremonyResponse.submitted_at < submitted_to)
+        name_parts.append(f"to{submitted_to.date().isoformat()}")
+    if response_status:
+        filters.append(CeremonyResponse.status == response_status)
+    
+    filename = export_filename(export_format, name_parts)
+    return StreamingResponse(
+        stream_export(AsyncSessionLocal, export_format, filters),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 @router.get("/ceremony/{ceremony_id}", response_model=List[CeremonyResponseList])
 async def get_ceremony_responses(
     ceremony_id: int,
-    status: Optional[ResponseStatus] = None,
+    http_response: Response,
+    response_status: Optional[ResponseStatus] = Query(None, alias="status", description="Filter by response status"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of responses to return"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all responses for a specific ceremony"""
     
     # Verify ceremony exists
-    ceremony = db.query(Ceremony).filter(Ceremony.id == ceremony_id).first()
+    ceremony = await db.get(Ceremony, ceremony_id)
     if not ceremony:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -140,10 +270,7 @@ async def get_ceremony_responses(
     
     # Check permissions - user must be team member or admin
     if current_user.role != "admin":
-        team_member = db.query(TeamMember).filter(
-            TeamMember.user_id == current_user.id,
-            TeamMember.team_id == ceremony.team_id
-        ).first()
+        team_member = team_access.is_member(ceremony.team_id)
         
         if not team_member:
             raise HTTPException(
@@ -151,34 +278,13 @@ async def get_ceremony_responses(
                 detail="Access denied"
             )
     
-    # Build query
-    query = db.query(CeremonyResponse).filter(
-        CeremonyResponse.ceremony_id == ceremony_id
-    )
+    filters = [CeremonyResponse.ceremony_id == ceremony_id]
+    if response_status:
+        filters.append(CeremonyResponse.status == response_status)
     
-    if status:
-        query = query.filter(CeremonyResponse.status == status)
-    
-    responses = query.all()
-    
-    # Add question response counts
-    result = []
-    for response in responses:
-        response_dict = {
-            "id": response.id,
-            "ceremony_id": response.ceremony_id,
-            "user_id": response.user_id,
-            "team_id": response.team_id,
-            "submitted_at": response.submitted_at,
-            "completed_at": response.completed_at,
-            "is_complete": response.is_complete,
-            "status": response.status,
-            "notes": response.notes,
-            "mood_rating": response.mood_rating,
-            "energy_level": response.energy_level,
-            "question_responses_count": len(response.question_responses)
-        }
-        result.append(response_dict)
+    result, next_cursor = await db.run_sync(list_ceremony_responses, *filters, cursor=cursor, limit=limit)
+    if next_cursor:
+        http_response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     return result
 
@@ -186,13 +292,12 @@ async def get_ceremony_responses(
 async def get_ceremony_response(
     response_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific ceremony response"""
     
-    response = db.query(CeremonyResponse).filter(
-        CeremonyResponse.id == response_id
-    ).first()
+    response = await _load_response(db, response_id)
     
     if not response:
         raise HTTPException(
@@ -203,10 +308,7 @@ async def get_ceremony_response(
     # Check permissions
     if current_user.role != "admin" and response.user_id != current_user.id:
         # Check if user is in the same team
-        team_member = db.query(TeamMember).filter(
-            TeamMember.user_id == current_user.id,
-            TeamMember.team_id == response.team_id
-        ).first()
+        team_member = team_access.is_member(response.team_id)
         
         if not team_member:
             raise HTTPException(
@@ -221,13 +323,11 @@ async def update_ceremony_response(
     response_id: int,
     response_data: CeremonyResponseUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a ceremony response"""
     
-    response = db.query(CeremonyResponse).filter(
-        CeremonyResponse.id == response_id
-    ).first()
+    response = await _load_response(db, response_id)
     
     if not response:
         raise HTTPException(
@@ -249,6 +349,10 @@ async def update_ceremony_response(
             detail="Cannot update completed or archived responses"
         )
     
+    # Remember what this response contributed to the ceremony aggregates
+    previous_answers = response_aggregates.snapshot_answers(response.question_responses)
+    previous_status = response.status
+    
     # Update basic fields
     if response_data.notes is not None:
         response.notes = response_data.notes
@@ -260,16 +364,15 @@ async def update_ceremony_response(
         response.status = response_data.status
     
     # Update question responses if provided
+    current_answers = previous_answers
     if response_data.question_responses:
-        # Delete existing question responses
-        db.query(QuestionResponse).filter(
-            QuestionResponse.ceremony_response_id == response_id
-        ).delete()
+        previous_responses = {qr.question_id: qr for qr in response.question_responses}
         
         # Create new question responses
-        ceremony_questions = db.query(CeremonyQuestion).filter(
+        result = await db.execute(select(CeremonyQuestion).where(
             CeremonyQuestion.ceremony_id == response.ceremony_id
-        ).all()
+        ))
+        ceremony_questions = result.scalars().all()
         
         question_responses = []
         for response_item in response_data.question_responses:
@@ -283,31 +386,56 @@ async def update_ceremony_response(
                 time_response=response_item.time_response,
                 is_required=next((q.is_required for q in ceremony_questions if q.question_id == response_item.question_id), True)
             )
+            # Uploaded files are not part of the payload; keep them with the question's new answer
+            previous = previous_responses.get(response_item.question_id)
+            if previous is not None and previous.file_path:
+                question_response.file_path = previous.file_path
+                question_response.file_name = previous.file_name
+                question_response.file_size = previous.file_size
+                question_response.file_type = previous.file_type
             question_responses.append(question_response)
         
         db.add_all(question_responses)
+        await db.flush()
+        
+        # Move attachments over to the new answers, then delete the old ones
+        replacements = {
+            previous_responses[qr.question_id].id: qr.id
+            for qr in question_responses if qr.question_id in previous_responses
+        }
+        await db.run_sync(move_attachments, replacements)
+        await db.run_sync(release_attachments, [
+            qr.id for qr in previous_responses.values() if qr.id not in replacements
+        ])
+        await db.execute(delete(QuestionResponse).where(
+            QuestionResponse.id.in_([qr.id for qr in previous_responses.values()])
+        ))
+        current_answers = response_aggregates.snapshot_answers(question_responses)
     
     # Update completion status
     if response_data.status == "completed":
         response.is_complete = True
         response.completed_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(response)
+    await db.run_sync(
+        response_aggregates.apply_answer_changes,
+        response.ceremony_id,
+        removed=response_aggregates.counted_answers(previous_status, previous_answers),
+        added=response_aggregates.counted_answers(response.status, current_answers)
+    )
+    await db.commit()
     
-    return response
+    return await _load_response(db, response_id)
 
 @router.delete("/{response_id}")
 async def delete_ceremony_response(
     response_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a ceremony response"""
     
-    response = db.query(CeremonyResponse).filter(
-        CeremonyResponse.id == response_id
-    ).first()
+    response = await _load_response(db, response_id)
     
     if not response:
         raise HTTPException(
@@ -329,21 +457,233 @@ async def delete_ceremony_response(
             detail="Can only delete draft responses"
         )
     
-    db.delete(response)
-    db.commit()
+    await db.run_sync(release_attachments, [qr.id for qr in response.question_responses])
+    await db.delete(response)
+    await db.commit()
     
     return {"message": "Response deleted successfully"}
 
+@router.post(
+    "/{response_id}/questions/{question_id}/attachments",
+    response_model=ResponseAttachmentResponse,
+    status_code=status.HTTP_201_CREATED
+)
+async def upload_response_attachment(
+    response_id: int,
+    question_id: int,
+    request: Request,
+    filename: str = Query(..., min_length=1, max_length=255),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Upload the file answering a file_upload question.
+
+    The request body is the raw file (not multipart) and is written to disk
+    chunk by chunk as it arrives, so uploads are never buffered in memory or
+    spooled to a temporary file first.
+    """
+    
+    response = await db.get(CeremonyResponse, response_id)
+    
+    if not response:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Response not found"
+        )
+    
+    # Check permissions - only the response owner or admin can upload
+    if current_user.role != "admin" and response.user_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    
+    if response.status in ["completed", "archived"]:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot update completed or archived responses"
+        )
+    
+    question = await db.scalar(
+        select(Question)
+        .join(CeremonyQuestion, CeremonyQuestion.question_id == Question.id)
+        .where(Question.id == question_id, CeremonyQuestion.ceremony_id == response.ceremony_id)
+    )
+    
+    if not question:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Question not found in this ceremony"
+        )
+    
+    if question.question_type != QuestionType.FILE_UPLOAD:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Question does not accept file uploads"
+        )
+    
+    if not is_allowed_type(filename, question.allowed_file_types):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"File type not allowed. Allowed types: {', '.join(question.allowed_file_types)}"
+        )
+    
+    max_bytes = upload_limit(question.max_file_size)
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > max_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds the {max_bytes} byte limit"
+        )
+    
+    ceremony_response_id = response.id
+    # Don't hold a transaction open while the body is being received
+    await db.commit()
+    
+    try:
+        upload = await receive_upload(request.stream(), max_bytes)
+    except UploadTooLarge as e:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=str(e)
+        )
+    
+    # If this write fails the stored file stays unreferenced until collect_garbage reclaims it
+    attachment = await db.run_sync(
+        record_attachment,
+        ceremony_response_id,
+        question_id,
+        filename,
+        request.headers.get("content-type"),
+        upload,
+        current_user.id
+    )
+    await db.commit()
+    
+    await db.refresh(attachment)
+    preview_pipeline.schedule(upload.path, attachment.file_type, attachment.mime_type)
+    return attachment
+
+async def _get_readable_attachment(
+    db: AsyncSession,
+    attachment_id: int,
+    current_user: User,
+    team_access: TeamAccess
+) -> ResponseAttachment:
+    """Load an attachment the current user may see, or raise 404/403"""
+    
+    row = (await db.execute(
+        select(ResponseAttachment, CeremonyResponse.user_id, CeremonyResponse.team_id)
+        .join(QuestionResponse, QuestionResponse.id == ResponseAttachment.question_response_id)
+        .join(CeremonyResponse, CeremonyResponse.id == QuestionResponse.ceremony_response_id)
+        .where(ResponseAttachment.id == attachment_id)
+    )).first()
+    
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Attachment not found"
+        )
+    
+    attachment, owner_id, team_id = row
+    # Same rule as reading the response itself
+    if current_user.role != "admin" and owner_id != current_user.id and not team_access.is_member(team_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    
+    return attachment
+
+@router.get("/attachments/{attachment_id}")
+async def download_response_attachment(
+    attachment_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Download an attachment (supports Range and If-None-Match)"""
+    
+    attachment = await _get_readable_attachment(db, attachment_id, current_user, team_access)
+    await db.commit()
+    
+    # Stored files are content-addressed, so the stored name identifies the content
+    return await file_response(
+        request,
+        upload_root() / attachment.file_path,
+        attachment.mime_type or "application/octet-stream",
+        etag=attachment.file_path.rsplit("/", 1)[-1],
+        filename=attachment.file_name,
+        disposition="attachment"
+    )
+
+async def _derivative_response(
+    request: Request,
+    attachment: ResponseAttachment,
+    derivative: Derivative
+):
+    if derivative not in derivatives_for(attachment.file_type, attachment.mime_type):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No preview of this kind for this attachment"
+        )
+    
+    path = await preview_pipeline.derive(attachment.file_path, derivative)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Preview could not be generated"
+        )
+    
+    return await file_response(
+        request,
+        path,
+        derivative.media_type,
+        etag=path.name,
+        cache_control="private, max-age=604800, immutable"
+    )
+
+@router.get("/attachments/{attachment_id}/thumbnail")
+async def get_response_attachment_thumbnail(
+    attachment_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a resized thumbnail of an image attachment"""
+    
+    attachment = await _get_readable_attachment(db, attachment_id, current_user, team_access)
+    await db.commit()
+    return await _derivative_response(request, attachment, THUMBNAIL)
+
+@router.get("/attachments/{attachment_id}/preview")
+async def get_response_attachment_preview(
+    attachment_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get the beginning of a text attachment (logs, CSV, ...)"""
+    
+    attachment = await _get_readable_attachment(db, attachment_id, current_user, team_access)
+    await db.commit()
+    return await _derivative_response(request, attachment, TEXT_PREVIEW)
+
 @router.get("/ceremony/{ceremony_id}/summary", response_model=ResponseSummary)
 async def get_ceremony_response_summary(
     ceremony_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a summary of responses for a specific ceremony"""
     
     # Verify ceremony exists
-    ceremony = db.query(Ceremony).filter(Ceremony.id == ceremony_id).first()
+    ceremony = await db.get(Ceremony, ceremony_id)
     if not ceremony:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -352,10 +692,7 @@ async def get_ceremony_response_summary(
     
     # Check permissions
     if current_user.role != "admin":
-        team_member = db.query(TeamMember).filter(
-            TeamMember.user_id == current_user.id,
-            TeamMember.team_id == ceremony.team_id
-        ).first()
+        team_member = team_access.is_member(ceremony.team_id)
         
         if not team_member:
             raise HTTPException(
@@ -363,142 +700,128 @@ async def get_ceremony_response_summary(
                 detail="Access denied"
             )
     
-    # Get total team members
-    total_team_members = db.query(TeamMember).filter(
-        TeamMember.team_id == ceremony.team_id
-    ).count()
-    
-    # Get completed responses
-    completed_responses = db.query(CeremonyResponse).filter(
-        CeremonyResponse.ceremony_id == ceremony_id,
-        CeremonyResponse.status == "completed"
-    ).all()
-    
-    total_responses = len(completed_responses)
-    completion_rate = (total_responses / total_team_members * 100) if total_team_members > 0 else 0
-    
-    # Calculate averages
-    mood_ratings = [r.mood_rating for r in completed_responses if r.mood_rating is not None]
-    energy_levels = [r.energy_level for r in completed_responses if r.energy_level is not None]
-    
-    average_mood = sum(mood_ratings) / len(mood_ratings) if mood_ratings else None
-    average_energy = sum(energy_levels) / len(energy_levels) if energy_levels else None
-    
-    # Get question summaries
-    ceremony_questions = db.query(CeremonyQuestion).filter(
-        CeremonyQuestion.ceremony_id == ceremony_id
-    ).order_by(CeremonyQuestion.order_index).all()
-    
-    question_summaries = []
-    for question in ceremony_questions:
-        question_responses = db.query(QuestionResponse).join(CeremonyResponse).filter(
-            CeremonyResponse.ceremony_id == ceremony_id,
-            QuestionResponse.question_id == question.question_id,
-            CeremonyResponse.status == "completed"
-        ).all()
-        
-        response_summary = {}
-        if question.question_type in ["short_answer", "paragraph"]:
-            # Count non-empty text responses
-            text_responses = [r.text_response for r in question_responses if r.text_response and r.text_response.strip()]
-            response_summary = {
-                "total_text_responses": len(text_responses),
-                "average_length": sum(len(t) for t in text_responses) / len(text_responses) if text_responses else 0
-            }
-        
-        elif question.question_type in ["multiple_choice", "checkboxes", "dropdown"]:
-            # Count option selections
-            option_counts = {}
-            for response in question_responses:
-                if response.selected_options:
-                    for option in response.selected_options:
-                        option_counts[option] = option_counts.get(option, 0) + 1
-            response_summary = {"option_counts": option_counts}
-        
-        elif question.question_type == "linear_scale":
-            # Calculate average and distribution
-            numeric_responses = [r.numeric_response for r in question_responses if r.numeric_response is not None]
-            if numeric_responses:
-                response_summary = {
-                    "average": sum(numeric_responses) / len(numeric_responses),
-                    "min": min(numeric_responses),
-                    "max": max(numeric_responses),
-                    "total_responses": len(numeric_responses)
-                }
-        
-        question_completion_rate = (len(question_responses) / total_team_members * 100) if total_team_members > 0 else 0
-        
-        question_summaries.append({
-            "question_id": question.question_id,
-            "question_text": question.question.text,
-            "question_type": question.question_type,
-            "response_summary": response_summary,
-            "completion_rate": question_completion_rate
-        })
-    
-    return ResponseSummary(
-        ceremony_id=ceremony_id,
-        total_responses=total_responses,
-        completion_rate=completion_rate,
-        average_mood=average_mood,
-        average_energy=average_energy,
-        question_summaries=question_summaries
+    def summarize(session):
+        question_stats = response_aggregates.get_question_stats(session, ceremony_id)
+        return build_ceremony_summary(session, ceremony, question_stats=question_stats)
+    
+    return ResponseSummary(**await db.run_sync(summarize))
+
+async def _get_readable_ceremony(
+    db: AsyncSession, ceremony_id: int, current_user: User, team_access: TeamAccess
+) -> Ceremony:
+    ceremony = await db.get(Ceremony, ceremony_id)
+    if not ceremony:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Ceremony not found"
+        )
+    if current_user.role != "admin" and not team_access.is_member(ceremony.team_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied"
+        )
+    return ceremony
+
+@router.get("/ceremony/{ceremony_id}/digests", response_model=List[CeremonyDigestSummary])
+async def get_ceremony_digests(
+    ceremony_id: int,
+    limit: int = Query(30, ge=1, le=365, description="Maximum number of digests to return"),
+    current_user: User = Depends(get_current_user),
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """List a ceremony's digests, newest occurrence first, without their content"""
+    await _get_readable_ceremony(db, ceremony_id, current_user, team_access)
+    
+    result = await db.scalars(
+        select(CeremonyDigest)
+        .where(CeremonyDigest.ceremony_id == ceremony_id)
+        .options(defer(CeremonyDigest.content), defer(CeremonyDigest.markdown), defer(CeremonyDigest.html))
+        .order_by(CeremonyDigest.occurs_at.desc())
+        .limit(limit)
+    )
+    return result.all()
+
+@router.get("/ceremony/{ceremony_id}/digests/latest", response_model=CeremonyDigestResponse)
+async def get_latest_ceremony_digest(
+    ceremony_id: int,
+    current_user: User = Depends(get_current_user),
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get the pre-rendered digest of a ceremony's most recent closed occurrence"""
+    await _get_readable_ceremony(db, ceremony_id, current_user, team_access)
+    
+    digest = await db.scalar(
+        select(CeremonyDigest)
+        .where(CeremonyDigest.ceremony_id == ceremony_id)
+        .order_by(CeremonyDigest.occurs_at.desc())
+        .limit(1)
     )
+    if not digest:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No digest yet"
+        )
+    return digest
+
+@router.get("/ceremony/{ceremony_id}/digests/{digest_id}", response_model=CeremonyDigestResponse)
+async def get_ceremony_digest(
+    ceremony_id: int,
+    digest_id: int,
+    current_user: User = Depends(get_current_user),
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get one pre-rendered ceremony digest"""
+    await _get_readable_ceremony(db, ceremony_id, current_user, team_access)
+    
+    digest = await db.get(CeremonyDigest, digest_id)
+    if not digest or digest.ceremony_id != ceremony_id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Digest not found"
+        )
+    return digest
 
 @router.get("/user/me", response_model=List[CeremonyResponseList])
 async def get_user_responses(
-    status: Optional[ResponseStatus] = None,
+    http_response: Response,
+    response_status: Optional[ResponseStatus] = Query(None, alias="status", description="Filter by response status"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of responses to return"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all responses for the current user"""
     
-    query = db.query(CeremonyResponse).filter(
-        CeremonyResponse.user_id == current_user.id
-    )
+    filters = [CeremonyResponse.user_id == current_user.id]
+    if response_status:
+        filters.append(CeremonyResponse.status == response_status)
     
-    if status:
-        query = query.filter(CeremonyResponse.status == status)
-    
-    responses = query.order_by(CeremonyResponse.submitted_at.desc()).all()
-    
-    # Add question response counts
-    result = []
-    for response in responses:
-        response_dict = {
-            "id": response.id,
-            "ceremony_id": response.ceremony_id,
-            "user_id": response.user_id,
-            "team_id": response.team_id,
-            "submitted_at": response.submitted_at,
-            "completed_at": response.completed_at,
-            "is_complete": response.is_complete,
-            "status": response.status,
-            "notes": response.notes,
-            "mood_rating": response.mood_rating,
-            "energy_level": response.energy_level,
-            "question_responses_count": len(response.question_responses)
-        }
-        result.append(response_dict)
+    result, next_cursor = await db.run_sync(list_ceremony_responses, *filters, cursor=cursor, limit=limit)
+    if next_cursor:
+        http_response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     return result
 
 @router.get("/team/{team_id}", response_model=List[CeremonyResponseList])
 async def get_team_responses(
     team_id: int,
+    http_response: Response,
     ceremony_id: Optional[int] = None,
-    status: Optional[ResponseStatus] = None,
+    response_status: Optional[ResponseStatus] = Query(None, alias="status", description="Filter by response status"),
+    cursor: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Maximum number of responses to return"),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    team_access: TeamAccess = Depends(get_team_access),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get all responses for a specific team"""
     
     # Check if user is member of the team or admin
     if current_user.role != "admin":
-        team_member = db.query(TeamMember).filter(
-            TeamMember.team_id == team_id,
-            TeamMember.user_id == current_user.id
-        ).first()
+        team_member = team_access.is_member(team_id)
         
         if not team_member:
             raise HTTPException(
@@ -506,35 +829,14 @@ async def get_team_responses(
                 detail="Access denied"
             )
     
-    query = db.query(CeremonyResponse).filter(
-        CeremonyResponse.team_id == team_id
-    )
-    
+    filters = [CeremonyResponse.team_id == team_id]
     if ceremony_id:
-        query = query.filter(CeremonyResponse.ceremony_id == ceremony_id)
-    
-    if status:
-        query = query.filter(CeremonyResponse.status == status)
-    
-    responses = query.order_by(CeremonyResponse.submitted_at.desc()).all()
-    
-    # Add question response counts
-    result = []
-    for response in responses:
-        response_dict = {
-            "id": response.id,
-            "ceremony_id": response.ceremony_id,
-            "user_id": response.user_id,
-            "team_id": response.team_id,
-            "submitted_at": response.submitted_at,
-            "completed_at": response.completed_at,
-            "is_complete": response.is_complete,
-            "status": response.status,
-            "notes": response.notes,
-            "mood_rating": response.mood_rating,
-            "energy_level": response.energy_level,
-            "question_responses_count": len(response.question_responses)
-        }
-        result.append(response_dict)
+        filters.append(CeremonyResponse.ceremony_id == ceremony_id)
+    if response_status:
+        filters.append(CeremonyResponse.status == response_status)
+    
+    result, next_cursor = await db.run_sync(list_ceremony_responses, *filters, cursor=cursor, limit=limit)
+    if next_cursor:
+        http_response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     return result
@@ -2,6 +2,7 @@ from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from app.core.auth import get_current_user, get_current_admin_user
+from app.core.authorization import TeamAccess, bump_authz_version, get_team_access, invalidate_authz_cache
 from app.core.database import get_db
 from app.models.team import Team, TeamMember, TeamManager
 from app.models.user import User
@@ -19,6 +20,7 @@ async def get_teams(
     company_id: Optional[int] = Query(None, description="Filter by company ID"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     current_user: User = Depends(get_current_user),
+    team_access: TeamAccess = Depends(get_team_access),
     db: Session = Depends(get_db)
 ):
     """Get list of teams with optional filtering"""
@@ -26,9 +28,7 @@ async def get_teams(
     
     # Non-admin users can only see teams they belong to
     if current_user.role != "admin":
-        user_teams = db.query(TeamMember.team_id).filter(TeamMember.user_id == current_user.id).all()
-        team_ids = [tm.team_id for tm in user_teams]
-        query = query.filter(Team.id.in_(team_ids))
+        query = query.filter(Team.id.in_(team_access.member_team_ids()))
     
     if company_id:
         query = query.filter(Team.company_id == company_id)
@@ -42,6 +42,7 @@ async def get_teams(
 async def get_team(
     team_id: int,
     current_user: User = Depends(get_current_user),
+    team_access: TeamAccess = Depends(get_team_access),
     db: Session = Depends(get_db)
 ):
     """Get team by ID"""
@@ -54,10 +55,7 @@ async def get_team(
     
     # Check if user has access to this team
     if current_user.role != "admin":
-        is_member = db.query(TeamMember).filter(
-            TeamMember.team_id == team_id,
-            TeamMember.user_id == current_user.id
-        ).first()
+        is_member = team_access.is_member(team_id)
         if not is_member:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -103,6 +101,7 @@ async def update_team(
     team_id: int,
     team_data: TeamUpdate,
     current_user: User = Depends(get_current_user),
+    team_access: TeamAccess = Depends(get_team_access),
     db: Session = Depends(get_db)
 ):
     """Update team information"""
@@ -115,10 +114,7 @@ async def update_team(
     
     # Check permissions - only admins or team managers can update
     if current_user.role != "admin":
-        is_manager = db.query(TeamManager).filter(
-            TeamManager.team_id == team_id,
-            TeamManager.user_id == current_user.id
-        ).first()
+        is_manager = team_access.is_manager(team_id)
         if not is_manager:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -164,6 +160,11 @@ async def delete_team(
             detail="Team not found"
         )
     
+    # Tokens of former members must stop granting access to this team
+    member_ids = [row.user_id for row in db.query(TeamMember.user_id).filter(TeamMember.team_id == team_id).all()]
+    manager_ids = [row.user_id for row in db.query(TeamManager.user_id).filter(TeamManager.team_id == team_id).all()]
+    affected_user_ids = bump_authz_version(db, member_ids + manager_ids)
+    
     # Delete team members and managers first
     db.query(TeamMember).filter(TeamMember.team_id == team_id).delete()
     db.query(TeamManager).filter(TeamManager.team_id == team_id).delete()
@@ -171,6 +172,7 @@ async def delete_team(
     # Delete the team
     db.delete(team)
     db.commit()
+    invalidate_authz_cache(affected_user_ids)
     
     return {"message": "Team deleted successfully"}
 
@@ -199,15 +201,13 @@ async def activate_team(
 async def get_team_members(
     team_id: int,
     current_user: User = Depends(get_current_user),
+    team_access: TeamAccess = Depends(get_team_access),
     db: Session = Depends(get_db)
 ):
     """Get team members"""
     # Check if user has access to this team
     if current_user.role != "admin":
-        is_member = db.query(TeamMember).filter(
-            TeamMember.team_id == team_id,
-            TeamMember.user_id == current_user.id
-        ).first()
+        is_member = team_access.is_member(team_id)
         if not is_member:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -222,6 +222,7 @@ async def add_team_member(
     team_id: int,
     member_data: TeamMemberCreate,
     current_user: User = Depends(get_current_user),
+    team_access: TeamAccess = Depends(get_team_access),
     db: Session = Depends(get_db)
 ):
     """Add a member to a team"""
@@ -235,10 +236,7 @@ async def add_team_member(
     
     # Check permissions - only admins or team managers can add members
     if current_user.role != "admin":
-        is_manager = db.query(TeamManager).filter(
-            TeamManager.team_id == team_id,
-            TeamManager.user_id == current_user.id
-        ).first()
+        is_manager = team_access.is_manager(team_id)
         if not is_manager:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -271,7 +269,9 @@ async def add_team_member(
     )
     
     db.add(team_member)
+    affected_user_ids = bump_authz_version(db, [member_data.user_id])
     db.commit()
+    invalidate_authz_cache(affected_user_ids)
     db.refresh(team_member)
     
     return team_member
@@ -281,15 +281,13 @@ async def remove_team_member(
     team_id: int,
     user_id: int,
     current_user: User = Depends(get_current_user),
+    team_access: TeamAccess = Depends(get_team_access),
     db: Session = Depends(get_db)
 ):
     """Remove a member from a team"""
     # Check permissions - only admins or team managers can remove members
     if current_user.role != "admin":
-        is_manager = db.query(TeamManager).filter(
-            TeamManager.team_id == team_id,
-            TeamManager.user_id == current_user.id
-        ).first()
+        is_manager = team_access.is_manager(team_id)
         if not is_manager:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -309,7 +307,9 @@ async def remove_team_member(
         )
     
     db.delete(member)
+    affected_user_ids = bump_authz_version(db, [user_id])
     db.commit()
+    invalidate_authz_cache(affected_user_ids)
     
     return {"message": "Team member removed successfully"}
 
@@ -318,15 +318,13 @@ async def remove_team_member(
 async def get_team_managers(
     team_id: int,
     current_user: User = Depends(get_current_user),
+    team_access: TeamAccess = Depends(get_team_access),
     db: Session = Depends(get_db)
 ):
     """Get team managers"""
     # Check if user has access to this team
     if current_user.role != "admin":
-        is_member = db.query(TeamMember).filter(
-            TeamMember.team_id == team_id,
-            TeamMember.user_id == current_user.id
-        ).first()
+        is_member = team_access.is_member(team_id)
         if not is_member:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -389,7 +387,9 @@ async def add_team_manager(
     )
     
     db.add(team_manager)
+    affected_user_ids = bump_authz_version(db, [manager_data.user_id])
     db.commit()
+    invalidate_authz_cache(affected_user_ids)
     db.refresh(team_manager)
     
     return team_manager
@@ -414,6 +414,8 @@ async def remove_team_manager(
         )
     
     db.delete(manager)
+    affected_user_ids = bump_authz_version(db, [user_id])
     db.commit()
+    invalidate_authz_cache(affected_user_ids)
     
     return {"message": "Team manager removed successfully"}
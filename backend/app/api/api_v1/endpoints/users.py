@@ -3,9 +3,10 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from app.core.auth import get_current_user, get_current_admin_user
 from app.core.database import get_db
+from app.core.user_cache import invalidate_cached_user
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate, UserResponse, UserListResponse
-from app.core.security import get_password_hash
+from app.core.security import hash_password
 
 router = APIRouter()
 
@@ -87,7 +88,7 @@ async def create_user(
             )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await hash_password(user_data.password)
     db_user = User(
         email=user_data.email,
         username=user_data.username,
@@ -133,7 +134,7 @@ async def update_user(
     
     # Handle password update
     if "password" in update_data:
-        update_data["hashed_password"] = get_password_hash(update_data.pop("password"))
+        update_data["hashed_password"] = await hash_password(update_data.pop("password"))
     
     # Check for email/username conflicts
     if "email" in update_data and update_data["email"] != user.email:
@@ -157,6 +158,7 @@ async def update_user(
         setattr(user, field, value)
     
     db.commit()
+    invalidate_cached_user(user_id)
     db.refresh(user)
     
     return user
@@ -183,6 +185,7 @@ async def delete_user(
     
     db.delete(user)
     db.commit()
+    invalidate_cached_user(user_id)
     
     return {"message": "User deleted successfully"}
 
@@ -202,6 +205,7 @@ async def activate_user(
     
     user.is_active = not user.is_active
     db.commit()
+    invalidate_cached_user(user_id)
     
     status_text = "activated" if user.is_active else "deactivated"
     return {"message": f"User {status_text} successfully"}
@@ -222,5 +226,6 @@ async def verify_user(
     
     user.is_verified = True
     db.commit()
+    invalidate_cached_user(user_id)
     
     return {"message": "User verified successfully"}
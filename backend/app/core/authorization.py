@@ -0,0 +1,118 @@
+from typing import Iterable, List, Set, Tuple
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.auth import get_current_user, get_token_payload
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.core.user_cache import invalidate_cached_user
+from app.models.team import TeamMember, TeamManager
+from app.models.user import User
+
+# Compact JWT claim names
+MEMBER_TEAMS_CLAIM = "tm"
+MANAGER_TEAMS_CLAIM = "tg"
+AUTHZ_VERSION_CLAIM = "azv"
+
+
+async def load_team_ids(db: AsyncSession, user_id: int) -> Tuple[Set[int], Set[int]]:
+    """Load the ids of the teams a user is a member and a manager of in one query"""
+    memberships = union_all(
+        select(TeamMember.team_id, literal(False).label("is_manager")).where(TeamMember.user_id == user_id),
+        select(TeamManager.team_id, literal(True).label("is_manager")).where(TeamManager.user_id == user_id),
+    )
+    result = await db.execute(memberships)
+    member_teams, manager_teams = set(), set()
+    for team_id, is_manager in result:
+        (manager_teams if is_manager else member_teams).add(team_id)
+    return member_teams, manager_teams
+
+
+async def build_team_claims(db: AsyncSession, user: User) -> dict:
+    """
+    Build the team membership claims to embed in a user's access token.
+
+    Returns an empty dict when claims are disabled or the user belongs to more
+    teams than TOKEN_TEAM_CLAIMS_MAX; such tokens are checked against the
+    database as before.
+    """
+    if not settings.TOKEN_TEAM_CLAIMS_ENABLED:
+        return {}
+
+    member_teams, manager_teams = await load_team_ids(db, user.id)
+    if len(member_teams) + len(manager_teams) > settings.TOKEN_TEAM_CLAIMS_MAX:
+        return {}
+
+    return {
+        MEMBER_TEAMS_CLAIM: sorted(member_teams),
+        MANAGER_TEAMS_CLAIM: sorted(manager_teams),
+        AUTHZ_VERSION_CLAIM: user.authz_version or 0,
+    }
+
+
+class TeamAccess:
+    """Answers "is the current user a member/manager of team X" from known team ids"""
+
+    def __init__(self, member_teams: Iterable[int], manager_teams: Iterable[int]):
+        self._member_teams: Set[int] = set(member_teams)
+        self._manager_teams: Set[int] = set(manager_teams)
+
+    def member_team_ids(self) -> List[int]:
+        return sorted(self._member_teams)
+
+    def is_member(self, team_id: int) -> bool:
+        return team_id in self._member_teams
+
+    def is_manager(self, team_id: int) -> bool:
+        return team_id in self._manager_teams
+
+
+async def get_team_access(
+    payload: dict = Depends(get_token_payload),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+) -> TeamAccess:
+    """
+    Trust the token's team claims while their version matches the user's
+    authz_version; otherwise load the memberships from the database.
+
+    authz_version and is_active are read from the database, not from the
+    user cache: the memory cache is per worker, so a membership change or
+    deactivation made on one worker would not reach the others until their
+    copy expires.
+    """
+    result = await db.execute(
+        select(User.authz_version, User.is_active).where(User.id == current_user.id)
+    )
+    row = result.one_or_none()
+    if row is None or not row.is_active:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Inactive user")
+
+    token_version = payload.get(AUTHZ_VERSION_CLAIM)
+    if token_version is not None and token_version == (row.authz_version or 0):
+        return TeamAccess(payload.get(MEMBER_TEAMS_CLAIM) or [], payload.get(MANAGER_TEAMS_CLAIM) or [])
+    member_teams, manager_teams = await load_team_ids(db, current_user.id)
+    return TeamAccess(member_teams, manager_teams)
+
+
+def bump_authz_version(db: Session, user_ids: Iterable[int]) -> List[int]:
+    """
+    Mark the team claims in existing tokens of these users as stale.
+
+    Call before committing a membership change, then pass the returned ids to
+    invalidate_authz_cache once the commit succeeded.
+    """
+    user_ids = sorted(set(user_ids))
+    if user_ids:
+        db.query(User).filter(User.id.in_(user_ids)).update(
+            {User.authz_version: User.authz_version + 1},
+            synchronize_session=False
+        )
+    return user_ids
+
+
+def invalidate_authz_cache(user_ids: Iterable[int]) -> None:
+    for user_id in user_ids:
+        invalidate_cached_user(user_id)
@@ -25,12 +25,48 @@ class Settings(BaseSettings):
 
     # Database
     DATABASE_URL: str = "sqlite:///./data/standup.db"
+    ASYNC_DATABASE_URL: str = ""  # derived from DATABASE_URL (aiosqlite/asyncpg) when empty
+    SCHEMA_CHECK_ON_STARTUP: bool = True  # refuse to serve unless `python migrate.py` brought the schema to head
+    
+    # Connection pool (server databases; per engine, sync and async each get one)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800  # seconds; stay under server/proxy idle timeouts
+    DB_POOL_PRE_PING: bool = True
+    
+    # SQLite PRAGMAs applied to every connection
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_MMAP_SIZE: int = 256 * 1024 * 1024  # 256MB
+    SQLITE_CACHE_SIZE_KB: int = 64 * 1024  # 64MB page cache per connection
     
     # Security
     SECRET_KEY: str = "your-secret-key-here-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     
+    # Password hashing (bcrypt, on its own thread pool off the event loop)
+    PASSWORD_HASH_ROUNDS: int = 12  # stored hashes with another cost are re-hashed at login
+    PASSWORD_HASH_WORKERS: int = 4  # threads per worker process; bcrypt keeps one CPU busy each
+    PASSWORD_HASH_QUEUE_LIMIT: int = 256  # calls waiting beyond this get a 503 with Retry-After
+    
+    # Authenticated user cache
+    AUTH_CACHE_ENABLED: bool = True
+    # memory is per worker: with several workers, a deactivation reaches the others only
+    # after AUTH_CACHE_TTL_SECONDS. Use redis (REDIS_URL) to invalidate them all at once.
+    AUTH_CACHE_BACKEND: str = "memory"
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_SIZE: int = 10000
+    
+    # Team membership claims embedded in access tokens
+    TOKEN_TEAM_CLAIMS_ENABLED: bool = True
+    TOKEN_TEAM_CLAIMS_MAX: int = 200  # above this many teams the claims are left out
+    
+    # Admin dashboard / system health counts (0 disables caching)
+    ADMIN_STATS_CACHE_TTL_SECONDS: int = 30
+    
     # Email
     SMTP_TLS: bool = True
     SMTP_PORT: int = 587
@@ -39,12 +75,23 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: str = ""
     EMAILS_FROM_EMAIL: str = ""
     EMAILS_FROM_NAME: str = "StandUp"
+    SMTP_TIMEOUT_SECONDS: float = 30.0
+    SMTP_POOL_SIZE: int = 5  # persistent connections shared by all email deliveries
+    SMTP_POOL_MAX_MESSAGES: int = 100  # reconnect after this many messages on one connection
+    SMTP_POOL_IDLE_CHECK_SECONDS: int = 30  # NOOP-check connections idle longer than this
+    NOTIFICATION_TEMPLATE_CACHE_SECONDS: int = 300
     
     # Chat Integration
     SLACK_BOT_TOKEN: str = ""
     SLACK_SIGNING_SECRET: str = ""
     GOOGLE_CHAT_WEBHOOK_URL: str = ""
     MICROSOFT_TEAMS_WEBHOOK_URL: str = ""
+    CHAT_WEBHOOK_HTTP2: bool = False  # needs the h2 package (pip install "httpx[http2]")
+    CHAT_WEBHOOK_TIMEOUT_SECONDS: float = 10.0
+    CHAT_WEBHOOK_MAX_CONNECTIONS_PER_HOST: int = 10
+    CHAT_WEBHOOK_RATE_PER_SECOND: float = 1.0  # per webhook URL
+    CHAT_WEBHOOK_BURST: int = 3
+    CHAT_MESSAGE_MAX_CHARS: int = 3500  # longer messages are truncated
     
     # Redis (for Celery)
     REDIS_URL: str = "redis://localhost:6379"
@@ -52,6 +99,29 @@ class Settings(BaseSettings):
     # File Upload
     UPLOAD_DIR: str = "./uploads"
     MAX_FILE_SIZE: int = 10 * 1024 * 1024  # 10MB
+    UPLOAD_GC_GRACE_SECONDS: int = 3600  # unreferenced files and partial uploads younger than this are kept
+    ATTACHMENT_PREVIEW_WORKERS: int = 2  # processes decoding images for thumbnails
+    ATTACHMENT_THUMBNAIL_SIZE: int = 320  # longest edge, in pixels
+    ATTACHMENT_PREVIEW_CHARS: int = 2000  # leading characters kept in text previews
+    
+    # Ceremony scheduler: run scheduler_worker.py once per deployment, or
+    # enable it in the app when that is a single process
+    SCHEDULER_ENABLED: bool = False
+    SCHEDULER_RESYNC_SECONDS: int = 60  # how often ceremonies changed by other processes are picked up
+    CEREMONY_CLOSE_AFTER_MINUTES: int = 60  # an occurrence is digested this long after it starts
+    CEREMONY_DIGEST_WINDOW_HOURS: int = 12  # answers submitted this long before the start count
+    
+    # Notification delivery worker (safe to run in several processes)
+    NOTIFICATION_WORKER_ENABLED: bool = False  # or run notification_worker.py separately
+    NOTIFICATION_BATCH_SIZE: int = 200
+    NOTIFICATION_LEASE_SECONDS: int = 60  # renewed while a batch is in flight; a stopped worker's rows are claimed again after this
+    NOTIFICATION_MAX_ATTEMPTS: int = 5
+    NOTIFICATION_RETRY_BASE_SECONDS: int = 30
+    NOTIFICATION_RETRY_MAX_SECONDS: int = 3600
+    NOTIFICATION_POLL_SECONDS: float = 2.0
+    NOTIFICATION_EMAIL_CONCURRENCY: int = 20
+    NOTIFICATION_CHAT_CONCURRENCY: int = 10
+    NOTIFICATION_DEFAULT_CONCURRENCY: int = 50
     
     # Timezone
     DEFAULT_TIMEZONE: str = "UTC"
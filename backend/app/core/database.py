@@ -1,21 +1,91 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
-import os
 
-# Create data directory if it doesn't exist
-os.makedirs("./data", exist_ok=True)
+def is_sqlite(database_url: str) -> bool:
+    return make_url(database_url).get_backend_name() == "sqlite"
+
+def engine_options(database_url: str) -> dict:
+    """Pool settings for server databases; SQLite keeps SQLAlchemy's default pool"""
+    if is_sqlite(database_url):
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    """
+    Tune every new SQLite connection: WAL lets readers run alongside a
+    writer, synchronous=NORMAL is durable under WAL with far fewer fsyncs,
+    and busy_timeout makes writers wait for the lock instead of failing
+    with "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+    cursor.execute(f"PRAGMA cache_size={-int(settings.SQLITE_CACHE_SIZE_KB)}")
+    cursor.close()
 
 engine = create_engine(
     settings.DATABASE_URL,
-    connect_args={"check_same_thread": False} if "sqlite" in settings.DATABASE_URL else {}
+    connect_args={"check_same_thread": False} if is_sqlite(settings.DATABASE_URL) else {},
+    **engine_options(settings.DATABASE_URL)
 )
+if is_sqlite(settings.DATABASE_URL):
+    event.listen(engine, "connect", apply_sqlite_pragmas)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async drivers for the same database, used by the request path
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+def get_async_database_url(database_url: str) -> str:
+    """Map DATABASE_URL onto its async driver unless ASYNC_DATABASE_URL is set"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for '{backend}' databases; set ASYNC_DATABASE_URL")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(hide_password=False)
+
+ASYNC_DATABASE_URL = get_async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL))
+if is_sqlite(ASYNC_DATABASE_URL):
+    event.listen(async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+
+# Objects stay usable after commit so endpoints can return them without a reload
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
+# INSERT constructs with ON CONFLICT support, per backend
+CONFLICT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+def conflict_insert(db, model):
+    """An INSERT into ``model`` for the session's database that can take on_conflict_do_*()"""
+    backend = db.get_bind().dialect.name
+    if backend not in CONFLICT_INSERTS:
+        raise ValueError(f"ON CONFLICT inserts are not supported on '{backend}' databases")
+    return CONFLICT_INSERTS[backend](model)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -23,6 +93,7 @@ def get_db():
     finally:
         db.close()
 
-def init_db():
-    """Initialize the database with tables"""
-    Base.metadata.create_all(bind=engine)
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
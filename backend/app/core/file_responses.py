@@ -0,0 +1,108 @@
+import os
+from typing import AsyncIterator, Optional, Tuple
+from urllib.parse import quote
+import aiofiles
+import aiofiles.os
+from fastapi import HTTPException, Request, Response, status
+from fastapi.responses import StreamingResponse
+
+FILE_CHUNK_SIZE = 64 * 1024
+
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    The inclusive (start, end) of a single ``bytes=`` range. Returns None when
+    the header should be ignored (malformed or several ranges: the whole file
+    is sent) and raises 416 when the range lies outside the file.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, dash, last = spec.strip().partition("-")
+    if not dash or not (first or last) or not (first + last).isdigit():
+        return None
+
+    if first:
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range: the last N bytes ("bytes=-0" is unsatisfiable)
+        start, end = max(size - int(last), 0) if int(last) else size, size - 1
+
+    if start >= size:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, end
+
+
+def etag_matches(header: str, etag: str) -> bool:
+    """Weak comparison against an If-None-Match list"""
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+async def _read_range(path: os.PathLike, start: int, end: int) -> AsyncIterator[bytes]:
+    async with aiofiles.open(path, "rb") as source:
+        await source.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await source.read(min(FILE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+
+async def file_response(
+    request: Request,
+    path: os.PathLike,
+    media_type: str,
+    etag: str,
+    filename: Optional[str] = None,
+    disposition: str = "inline",
+    cache_control: str = "private, max-age=86400"
+) -> Response:
+    """
+    Serve a file with ETag revalidation (304) and single byte-range requests
+    (206, honouring If-Range). ``etag`` must change whenever the content does.
+    """
+    try:
+        size = (await aiofiles.os.stat(path)).st_size
+    except FileNotFoundError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="File not found"
+        )
+
+    etag = f'"{etag}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": cache_control,
+        "X-Content-Type-Options": "nosniff",
+    }
+    if filename:
+        headers["Content-Disposition"] = f"{disposition}; filename*=UTF-8''{quote(filename)}"
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    start, end = 0, size - 1
+    status_code = status.HTTP_200_OK
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == etag):
+        byte_range = parse_range(range_header, size)
+        if byte_range is not None:
+            start, end = byte_range
+            status_code = status.HTTP_206_PARTIAL_CONTENT
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(_read_range(path, start, end), status_code=status_code, headers=headers, media_type=media_type)
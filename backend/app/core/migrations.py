@@ -0,0 +1,150 @@
+import ast
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Tuple
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.engine import Connection, Engine, make_url
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+
+# alembic is imported inside the functions that run migrations: importing
+# the package costs ~170 ms, which every web worker would pay on startup
+# just to check the revision.
+
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+VERSIONS_DIR = ALEMBIC_INI.parent / "alembic" / "versions"
+
+
+class SchemaOutOfDate(RuntimeError):
+    """The database is not at the revision this code expects"""
+
+
+def alembic_config(database_url: Optional[str] = None):
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    config.set_main_option("sqlalchemy.url", database_url or settings.DATABASE_URL)
+    return config
+
+
+def _revision_identifiers(path: Path) -> Tuple[Optional[str], Tuple[str, ...]]:
+    """``revision`` and ``down_revision`` of a migration file, read without importing it"""
+    revision, down_revisions = None, ()
+    for node in ast.parse(path.read_text()).body:
+        if isinstance(node, (ast.Assign, ast.AnnAssign)) and node.value is not None:
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names = {target.id for target in targets if isinstance(target, ast.Name)}
+            if "revision" in names:
+                revision = ast.literal_eval(node.value)
+            elif "down_revision" in names:
+                value = ast.literal_eval(node.value)
+                down_revisions = tuple(value) if isinstance(value, (tuple, list)) else ((value,) if value else ())
+    return revision, down_revisions
+
+
+@lru_cache(maxsize=1)
+def head_revision() -> str:
+    """
+    The newest migration shipped with this code (read once per process).
+    Taken from the version files directly: the one revision no other revises.
+    """
+    revisions, revised = set(), set()
+    for path in VERSIONS_DIR.glob("*.py"):
+        revision, down_revisions = _revision_identifiers(path)
+        if revision:
+            revisions.add(revision)
+            revised.update(down_revisions)
+    heads = revisions - revised
+    if len(heads) != 1:
+        raise RuntimeError(f"Expected one migration head, found {sorted(heads) or 'none'}")
+    return heads.pop()
+
+
+def current_revision(connection: Connection) -> Optional[str]:
+    """The revision a database is at; a single read of alembic_version"""
+    if not inspect(connection).has_table("alembic_version"):
+        return None
+    return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+
+
+def ensure_database_directory(database_url: str) -> None:
+    """SQLite creates the database file but not the directory it goes in"""
+    url = make_url(database_url)
+    if url.get_backend_name() == "sqlite" and url.database and url.database != ":memory:":
+        os.makedirs(os.path.dirname(os.path.abspath(url.database)), exist_ok=True)
+
+
+def _check_unversioned(connection: Connection) -> None:
+    """
+    Databases created with create_all have tables but no alembic_version.
+    One that matches the current models exactly can be stamped at head; any
+    other needs to be stamped by hand at the revision it matches.
+    """
+    from alembic.autogenerate import compare_metadata
+    from alembic.runtime.migration import MigrationContext
+    from app.core.database import Base
+    import app.models  # noqa: F401  (registers every table on Base.metadata)
+
+    if compare_metadata(MigrationContext.configure(connection), Base.metadata):
+        raise SchemaOutOfDate(
+            "The database has tables but no migration history and does not match the current models. "
+            "If it was created by the original release, run `python migrate.py --stamp 0001` and then "
+            "`python migrate.py`."
+        )
+
+
+def migrate(database_url: Optional[str] = None, revision: str = "head") -> Tuple[Optional[str], Optional[str]]:
+    """Upgrade the database to ``revision``. Returns the (before, after) revisions."""
+    from alembic import command
+
+    database_url = database_url or settings.DATABASE_URL
+    ensure_database_directory(database_url)
+    config = alembic_config(database_url)
+    config.attributes["configure_logging"] = False
+
+    engine = create_engine(database_url, poolclass=NullPool)
+    try:
+        with engine.connect() as connection:
+            before = current_revision(connection)
+            unversioned = before is None and bool(inspect(connection).get_table_names())
+            if unversioned:
+                _check_unversioned(connection)
+        if unversioned:
+            command.stamp(config, "head")
+            before = head_revision()
+        command.upgrade(config, revision)
+        with engine.connect() as connection:
+            return before, current_revision(connection)
+    finally:
+        engine.dispose()
+
+
+def stamp(revision: str, database_url: Optional[str] = None) -> None:
+    """Record ``revision`` as applied without running anything"""
+    from alembic import command
+
+    database_url = database_url or settings.DATABASE_URL
+    ensure_database_directory(database_url)
+    config = alembic_config(database_url)
+    config.attributes["configure_logging"] = False
+    command.stamp(config, revision)
+
+
+def verify_schema_revision(engine: Engine) -> str:
+    """
+    Refuse to start against a database that is not at head. This looks up
+    alembic_version only (no alembic import, no DDL), so it is cheap and safe
+    for many workers starting at once. Raises SchemaOutOfDate.
+    """
+    expected = head_revision()
+    with engine.connect() as connection:
+        current = current_revision(connection)
+    if current != expected:
+        raise SchemaOutOfDate(
+            f"Database schema is at revision {current or 'none'}, this code needs {expected}. "
+            "Run `python migrate.py` before starting the app."
+        )
+    return current
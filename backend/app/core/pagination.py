@@ -0,0 +1,77 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from fastapi import HTTPException, status
+from sqlalchemy import String, tuple_, type_coerce
+from sqlalchemy.orm import Query
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """Encode the (sort value, id) of the last row on a page as an opaque cursor"""
+    payload = json.dumps([sort_value.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (binascii.Error, ValueError, TypeError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def _comparable(query: Query, column, value: datetime):
+    """
+    SQLite keeps DateTime columns as text: server defaults are written without
+    a fractional part while ORM writes include microseconds. Compare the raw
+    text against a value rendered the same way so the cursor row itself is
+    never matched as "older" than its own key.
+    """
+    if query.session.get_bind().dialect.name == "sqlite":
+        fmt = "%Y-%m-%d %H:%M:%S.%f" if value.microsecond else "%Y-%m-%d %H:%M:%S"
+        return type_coerce(column, String), value.replace(tzinfo=None).strftime(fmt)
+    return column, value
+
+
+def paginate_keyset(
+    query: Query,
+    sort_column,
+    id_column,
+    cursor: Optional[str],
+    limit: int,
+    skip: int = 0
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch one page ordered by (sort_column, id_column) descending.
+
+    Rows after the cursor are found with a row-value comparison, so each page
+    is a single index range scan no matter how deep the client has paged.
+    Without a cursor, ``skip`` falls back to an OFFSET for legacy clients.
+    Returns the rows and the cursor for the next page (None on the last page).
+    """
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor)
+        column, value = _comparable(query, sort_column, sort_value)
+        query = query.filter(tuple_(column, id_column) < tuple_(value, last_id))
+
+    query = query.order_by(sort_column.desc(), id_column.desc())
+    if skip and not cursor:
+        query = query.offset(skip)
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_row = rows[-1]
+        next_cursor = encode_cursor(getattr(last_row, sort_column.key), getattr(last_row, id_column.key))
+
+    return rows, next_cursor
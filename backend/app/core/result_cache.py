@@ -0,0 +1,52 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+class TTLResultCache:
+    """
+    Small in-process cache for expensive, read-mostly results.
+
+    Loads are single-flight per key: when an entry is missing or expired,
+    one caller recomputes it while concurrent callers for the same key wait
+    for that result instead of running the computation themselves.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[Hashable, tuple] = {}
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _fresh(self, key: Hashable) -> Optional[tuple]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry
+        return None
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        if self.ttl_seconds <= 0:
+            return loader()
+
+        entry = self._fresh(key)
+        if entry is not None:
+            return entry[1]
+
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another caller may have finished the load while we waited
+            entry = self._fresh(key)
+            if entry is not None:
+                return entry[1]
+            value = loader()
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
@@ -1,14 +1,32 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
-from jose import jwt
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import Any, Callable, NamedTuple, Optional, Tuple, TypeVar, Union
+from fastapi import HTTPException, status
 from app.core.config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# jose and passlib are imported on first use, not when the app is loaded
+
+@lru_cache(maxsize=1)
+def get_password_context():
+    from passlib.context import CryptContext
+
+    # Hashes made with another cost are flagged by verify_and_update and re-hashed at login
+    return CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.PASSWORD_HASH_ROUNDS)
 
 def create_access_token(
-    subject: Union[str, Any], expires_delta: timedelta = None
+    subject: Union[str, Any], expires_delta: timedelta = None, claims: Optional[dict] = None
 ) -> str:
+    from jose import jwt
+
     if expires_delta:
         expire = datetime.utcnow() + expires_delta
     else:
@@ -16,11 +34,132 @@ def create_access_token(
             minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES
         )
     to_encode = {"exp": expire, "sub": str(subject)}
+    if claims:
+        to_encode.update(claims)
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+# Blocking versions, for scripts. Request handlers use the async ones below.
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_password_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_password_context().hash(password)
+
+
+class PasswordHashStats(NamedTuple):
+    workers: int
+    queue_limit: int
+    running: int
+    waiting: int
+    max_waiting: int  # deepest the queue has been since startup
+    completed: int
+    rejected: int
+    average_wait_ms: float
+    average_run_ms: float
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on a dedicated, fixed-size thread pool so a burst of logins
+    never blocks the event loop (bcrypt releases the GIL, so the threads run
+    in parallel). At most ``queue_limit`` calls wait for a thread; beyond
+    that callers get a 503 instead of queueing for ever.
+    """
+
+    def __init__(self, workers: int, queue_limit: int):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._running = 0
+        self._waiting = 0
+        self._max_waiting = 0
+        self._completed = 0
+        self._rejected = 0
+        self._wait_seconds = 0.0
+        self._run_seconds = 0.0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="password-hash")
+            return self._executor
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        with self._lock:
+            if self._waiting >= self.queue_limit:
+                self._rejected += 1
+                rejected = True
+            else:
+                rejected = False
+                self._waiting += 1
+                self._max_waiting = max(self._max_waiting, self._waiting)
+        if rejected:
+            logger.warning("Password hashing queue is full (%d waiting)", self.queue_limit)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many sign-ins in progress, please try again shortly",
+                headers={"Retry-After": "1"}
+            )
+
+        submitted = time.perf_counter()
+
+        def task() -> T:
+            started = time.perf_counter()
+            with self._lock:
+                self._waiting -= 1
+                self._running += 1
+                self._wait_seconds += started - submitted
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self._running -= 1
+                    self._completed += 1
+                    self._run_seconds += time.perf_counter() - started
+
+        def forget_if_cancelled(future: Future) -> None:
+            # A request that went away before its turn never ran ``task``
+            if future.cancelled():
+                with self._lock:
+                    self._waiting -= 1
+
+        future = self._get_executor().submit(task)
+        future.add_done_callback(forget_if_cancelled)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> PasswordHashStats:
+        with self._lock:
+            completed = self._completed
+            return PasswordHashStats(
+                workers=self.workers,
+                queue_limit=self.queue_limit,
+                running=self._running,
+                waiting=self._waiting,
+                max_waiting=self._max_waiting,
+                completed=completed,
+                rejected=self._rejected,
+                average_wait_ms=round(self._wait_seconds * 1000 / completed, 2) if completed else 0.0,
+                average_run_ms=round(self._run_seconds * 1000 / completed, 2) if completed else 0.0,
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE_LIMIT)
+
+async def hash_password(password: str) -> str:
+    return await password_hasher.run(get_password_hash, password)
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Check a password off the event loop. When it matches but the stored hash
+    uses another cost (or a deprecated format), also returns its replacement.
+    """
+    return await password_hasher.run(get_password_context().verify_and_update, plain_password, hashed_password)
@@ -0,0 +1,181 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Optional
+from sqlalchemy import DateTime
+
+from app.core.config import settings
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Never keep the password hash in the cache, least of all in a shared one
+_CACHED_COLUMNS = [column for column in User.__table__.columns if column.key != "hashed_password"]
+_DATETIME_COLUMNS = {column.key for column in _CACHED_COLUMNS if isinstance(column.type, DateTime)}
+
+
+def snapshot_user(user: User) -> Dict[str, Any]:
+    """Copy the scalar columns of a user that requests rely on"""
+    return {column.key: getattr(user, column.key) for column in _CACHED_COLUMNS}
+
+
+class MemoryUserCache:
+    """Per-process TTL + LRU cache of user snapshots keyed by token subject"""
+
+    def __init__(self, ttl_seconds: int, max_size: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._subjects_by_user_id: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def get(self, subject: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(subject)
+            if entry is None:
+                return None
+            expires_at, snapshot = entry
+            if expires_at <= time.monotonic():
+                self._drop(subject)
+                return None
+            self._entries.move_to_end(subject)
+            return snapshot
+
+    def set(self, subject: str, snapshot: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[subject] = (time.monotonic() + self.ttl_seconds, snapshot)
+            self._entries.move_to_end(subject)
+            self._subjects_by_user_id[snapshot["id"]] = subject
+            while len(self._entries) > self.max_size:
+                oldest, _ = next(iter(self._entries.items()))
+                self._drop(oldest)
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            subject = self._subjects_by_user_id.get(user_id)
+            if subject is not None:
+                self._drop(subject)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._subjects_by_user_id.clear()
+
+    def _drop(self, subject: str) -> None:
+        _, snapshot = self._entries.pop(subject, (None, None))
+        if snapshot is not None and self._subjects_by_user_id.get(snapshot["id"]) == subject:
+            del self._subjects_by_user_id[snapshot["id"]]
+
+
+class RedisUserCache:
+    """
+    Shared cache in Redis so every worker sees the same invalidations.
+
+    Redis errors are treated as cache misses; authentication then falls back
+    to the database instead of failing the request.
+    """
+
+    KEY_PREFIX = "standup:auth_user:"
+
+    def __init__(self, redis_url: str, ttl_seconds: int):
+        import redis
+
+        self.ttl_seconds = ttl_seconds
+        self._client = redis.Redis.from_url(redis_url)
+        self._errors = redis.RedisError
+
+    def _subject_key(self, subject: str) -> str:
+        return f"{self.KEY_PREFIX}subject:{subject}"
+
+    def _user_key(self, user_id: int) -> str:
+        return f"{self.KEY_PREFIX}id:{user_id}"
+
+    def get(self, subject: str) -> Optional[Dict[str, Any]]:
+        try:
+            raw = self._client.get(self._subject_key(subject))
+        except self._errors:
+            logger.warning("Auth cache read failed", exc_info=True)
+            return None
+        if raw is None:
+            return None
+        snapshot = json.loads(raw)
+        for key in _DATETIME_COLUMNS:
+            if snapshot.get(key) is not None:
+                snapshot[key] = datetime.fromisoformat(snapshot[key])
+        return snapshot
+
+    def set(self, subject: str, snapshot: Dict[str, Any]) -> None:
+        payload = json.dumps(snapshot, default=lambda value: value.isoformat())
+        try:
+            pipeline = self._client.pipeline()
+            pipeline.setex(self._subject_key(subject), self.ttl_seconds, payload)
+            pipeline.setex(self._user_key(snapshot["id"]), self.ttl_seconds, subject)
+            pipeline.execute()
+        except self._errors:
+            logger.warning("Auth cache write failed", exc_info=True)
+
+    def invalidate_user(self, user_id: int) -> None:
+        try:
+            subject = self._client.get(self._user_key(user_id))
+            keys = [self._user_key(user_id)]
+            if subject is not None:
+                keys.append(self._subject_key(subject.decode()))
+            self._client.delete(*keys)
+        except self._errors:
+            logger.warning("Auth cache invalidation failed for user %s", user_id, exc_info=True)
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(f"{self.KEY_PREFIX}*"):
+            self._client.delete(key)
+
+
+class NullUserCache:
+    """Used when AUTH_CACHE_ENABLED is off"""
+
+    def get(self, subject: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    def set(self, subject: str, snapshot: Dict[str, Any]) -> None:
+        pass
+
+    def invalidate_user(self, user_id: int) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+
+def _create_user_cache():
+    if not settings.AUTH_CACHE_ENABLED:
+        return NullUserCache()
+    if settings.AUTH_CACHE_BACKEND == "redis":
+        return RedisUserCache(settings.REDIS_URL, settings.AUTH_CACHE_TTL_SECONDS)
+    return MemoryUserCache(settings.AUTH_CACHE_TTL_SECONDS, settings.AUTH_CACHE_MAX_SIZE)
+
+
+user_cache = _create_user_cache()
+
+
+def get_cached_user(subject: str) -> Optional[User]:
+    """
+    Return a detached User built from the cache, or None on a miss.
+
+    The instance is transient: scalar columns are populated but relationships
+    are empty and it must not be added to a session.
+    """
+    snapshot = user_cache.get(subject)
+    if snapshot is None:
+        return None
+    return User(**snapshot)
+
+
+def cache_user(subject: str, user: User) -> None:
+    user_cache.set(subject, snapshot_user(user))
+
+
+def invalidate_cached_user(user_id: int) -> None:
+    """Drop a user from the cache after its row was updated, deactivated or deleted"""
+    user_cache.invalidate_user(user_id)
@@ -2,7 +2,7 @@ from .user import User
 from .company import Company
 from .team import Team, TeamMember, TeamManager
 from .ceremony import Ceremony, CeremonyQuestion
-from .response import CeremonyResponse, QuestionResponse, ResponseAttachment
+from .response import CeremonyResponse, QuestionResponse, ResponseAttachment, StoredFile, CeremonyResponseAggregate, CeremonyDigest
 from .question import Question, QuestionOption
 from .notification import Notification, NotificationTemplate
 from .chat_integration import ChatIntegration
@@ -19,6 +19,9 @@ __all__ = [
     "CeremonyResponse",
     "QuestionResponse",
     "ResponseAttachment",
+    "StoredFile",
+    "CeremonyResponseAggregate",
+    "CeremonyDigest",
     "Question",
     "QuestionOption",
     "Notification",
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, Time
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, Time, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -48,6 +48,10 @@ class Ceremony(Base):
 
 class CeremonyQuestion(Base):
     __tablename__ = "ceremony_questions"
+    __table_args__ = (
+        # A ceremony's questions, in order
+        Index("ix_ceremony_questions_ceremony_order", "ceremony_id", "order_index"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     ceremony_id = Column(Integer, ForeignKey("ceremonies.id"), nullable=False)
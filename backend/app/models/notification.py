@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -23,6 +23,14 @@ class NotificationChannel(str, enum.Enum):
 
 class Notification(Base):
     __tablename__ = "notifications"
+    __table_args__ = (
+        # Lets the delivery side find pending notifications that are due
+        Index("ix_notifications_status_scheduled", "status", "scheduled_for"),
+        # A user's notifications, optionally by status (e.g. unread)
+        Index("ix_notifications_user_status", "user_id", "status"),
+        # One reminder per member per ceremony occurrence, however many schedulers plan it
+        Index("uq_notifications_reminder", "user_id", "ceremony_id", "occurs_at", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -34,9 +42,19 @@ class Notification(Base):
     
     # Additional data
     additional_data = Column(JSON, nullable=True)  # JSON for additional data
+    # Set on ceremony reminders only (no foreign key: reminders outlive deleted ceremonies)
+    ceremony_id = Column(Integer, nullable=True)
+    occurs_at = Column(DateTime(timezone=True), nullable=True)
+    scheduled_for = Column(DateTime(timezone=True), nullable=True)  # not delivered before this instant
     sent_at = Column(DateTime(timezone=True), nullable=True)
     read_at = Column(DateTime(timezone=True), nullable=True)
     
+    # Delivery bookkeeping
+    attempts = Column(Integer, default=0, server_default="0", nullable=False)
+    lease_id = Column(String, nullable=True, index=True)  # set while a worker is delivering it
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(Text, nullable=True)
+    
     # Relationships
     user = relationship("User", back_populates="notifications")
     
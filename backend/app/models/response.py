@@ -1,10 +1,18 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, Float
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, JSON, Float, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 class CeremonyResponse(Base):
     __tablename__ = "ceremony_responses"
+    __table_args__ = (
+        # Back the newest-first keyset listings per ceremony, user and team
+        Index("ix_ceremony_responses_ceremony_submitted", "ceremony_id", "submitted_at", "id"),
+        Index("ix_ceremony_responses_user_submitted", "user_id", "submitted_at", "id"),
+        Index("ix_ceremony_responses_team_submitted", "team_id", "submitted_at", "id"),
+        # One response per user per ceremony; also serves "has this user responded" lookups
+        Index("uq_ceremony_responses_ceremony_user", "ceremony_id", "user_id", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     ceremony_id = Column(Integer, ForeignKey("ceremonies.id"), nullable=False)
@@ -34,7 +42,7 @@ class QuestionResponse(Base):
     __tablename__ = "question_responses"
 
     id = Column(Integer, primary_key=True, index=True)
-    ceremony_response_id = Column(Integer, ForeignKey("ceremony_responses.id"), nullable=False)
+    ceremony_response_id = Column(Integer, ForeignKey("ceremony_responses.id"), nullable=False, index=True)
     question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
     
     # Response data based on question type
@@ -71,6 +79,7 @@ class ResponseAttachment(Base):
     file_size = Column(Integer, nullable=False)
     file_type = Column(String, nullable=False)
     mime_type = Column(String, nullable=True)
+    content_hash = Column(String(64), nullable=True, index=True)  # SHA-256 hex of the file
     
     # Upload metadata
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -83,3 +92,62 @@ class ResponseAttachment(Base):
     # Relationships
     question_response = relationship("QuestionResponse")
     user = relationship("User")
+
+class StoredFile(Base):
+    __tablename__ = "stored_files"
+
+    id = Column(Integer, primary_key=True, index=True)
+    content_hash = Column(String(64), nullable=False, unique=True)  # SHA-256 hex; the file is stored once per hash
+    file_path = Column(String, nullable=False)  # relative to UPLOAD_DIR
+    file_size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)  # ResponseAttachment rows using this file
+    
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class CeremonyResponseAggregate(Base):
+    __tablename__ = "ceremony_response_aggregates"
+    __table_args__ = (
+        UniqueConstraint("ceremony_id", "question_id", name="uq_ceremony_response_aggregates_ceremony_question"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    ceremony_id = Column(Integer, ForeignKey("ceremonies.id"), nullable=False, index=True)
+    question_id = Column(Integer, ForeignKey("questions.id"), nullable=False)
+    
+    # Running totals over completed responses
+    response_count = Column(Integer, nullable=False, default=0)
+    text_count = Column(Integer, nullable=False, default=0)  # Non-empty text answers
+    text_length_sum = Column(Integer, nullable=False, default=0)
+    numeric_count = Column(Integer, nullable=False, default=0)
+    numeric_sum = Column(Float, nullable=False, default=0.0)
+    numeric_min = Column(Float, nullable=True)
+    numeric_max = Column(Float, nullable=True)
+    option_counts = Column(JSON, nullable=True)  # JSON object of option -> selection count
+    
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class CeremonyDigest(Base):
+    __tablename__ = "ceremony_digests"
+    __table_args__ = (
+        UniqueConstraint("ceremony_id", "occurs_at", name="uq_ceremony_digests_ceremony_occurrence"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    ceremony_id = Column(Integer, ForeignKey("ceremonies.id"), nullable=False)
+    team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
+    occurs_at = Column(DateTime(timezone=True), nullable=False)  # when the occurrence started
+    window_start = Column(DateTime(timezone=True), nullable=False)  # answers submitted from here on count
+    
+    # Headline numbers, also inside content
+    member_count = Column(Integer, nullable=False, default=0)
+    response_count = Column(Integer, nullable=False, default=0)
+    blocker_count = Column(Integer, nullable=False, default=0)
+    average_mood = Column(Float, nullable=True)
+    average_energy = Column(Float, nullable=True)
+    
+    # Pre-rendered digest
+    content = Column(JSON, nullable=False)  # members, answers, blockers, mood/energy stats
+    markdown = Column(Text, nullable=False)
+    html = Column(Text, nullable=False)
+    
+    generated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
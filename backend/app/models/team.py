@@ -1,10 +1,15 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
 
 class Team(Base):
     __tablename__ = "teams"
+    __table_args__ = (
+        # Back the newest-first keyset listings, globally and per company
+        Index("ix_teams_created", "created_at", "id"),
+        Index("ix_teams_company_created", "company_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, index=True)
@@ -23,6 +28,11 @@ class Team(Base):
 
 class TeamMember(Base):
     __tablename__ = "team_members"
+    __table_args__ = (
+        # Membership checks and member lists by team; a user's teams by user
+        Index("ix_team_members_team_user", "team_id", "user_id"),
+        Index("ix_team_members_user", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
@@ -36,6 +46,10 @@ class TeamMember(Base):
 
 class TeamManager(Base):
     __tablename__ = "team_managers"
+    __table_args__ = (
+        Index("ix_team_managers_team_user", "team_id", "user_id"),
+        Index("ix_team_managers_user", "user_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     team_id = Column(Integer, ForeignKey("teams.id"), nullable=False)
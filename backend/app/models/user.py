@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -10,6 +10,11 @@ class UserRole(str, enum.Enum):
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Back the newest-first keyset listings, globally and per company
+        Index("ix_users_created", "created_at", "id"),
+        Index("ix_users_company_created", "company_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
@@ -21,6 +26,8 @@ class User(Base):
     is_verified = Column(Boolean, default=False)
     avatar_url = Column(String, nullable=True)
     timezone = Column(String, default="UTC")
+    # Bumped whenever team memberships change so older token claims are ignored
+    authz_version = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -1,12 +1,20 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
+from .user import UserResponse
+from .company import CompanyResponse
+from .team import TeamResponse
+
+class AdminSchema(BaseModel):
+    # Validators are built on first use: most of these schemas are not used
+    # by any route, and building them all slowed every worker's startup
+    model_config = ConfigDict(defer_build=True)
 
 # ============================================================================
 # ADMIN DASHBOARD SCHEMAS
 # ============================================================================
 
-class DashboardStats(BaseModel):
+class DashboardStats(AdminSchema):
     total: int
     active: int
     recent: Optional[int] = None
@@ -15,7 +23,7 @@ class UserDashboardStats(DashboardStats):
     verified: int
     admins: int
 
-class AdminDashboardStats(BaseModel):
+class AdminDashboardStats(AdminSchema):
     users: UserDashboardStats
     companies: DashboardStats
     teams: DashboardStats
@@ -27,37 +35,40 @@ class AdminDashboardStats(BaseModel):
 # USER MANAGEMENT SCHEMAS
 # ============================================================================
 
-class UserManagementResponse(BaseModel):
-    users: List[Any]  # Will be UserResponse objects
-    total_count: int
+class UserManagementResponse(AdminSchema):
+    users: List[UserResponse]
+    total_count: Optional[int] = None  # None when include_total=false
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
 # ============================================================================
 # COMPANY MANAGEMENT SCHEMAS
 # ============================================================================
 
-class CompanyManagementResponse(BaseModel):
-    companies: List[Any]  # Will be CompanyResponse objects
-    total_count: int
+class CompanyManagementResponse(AdminSchema):
+    companies: List[CompanyResponse]
+    total_count: Optional[int] = None  # None when include_total=false
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
 # ============================================================================
 # TEAM MANAGEMENT SCHEMAS
 # ============================================================================
 
-class TeamManagementResponse(BaseModel):
-    teams: List[Any]  # Will be TeamResponse objects
-    total_count: int
+class TeamManagementResponse(AdminSchema):
+    teams: List[TeamResponse]
+    total_count: Optional[int] = None  # None when include_total=false
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
 # ============================================================================
 # INTEGRATION MANAGEMENT SCHEMAS
 # ============================================================================
 
-class IntegrationResponse(BaseModel):
+class IntegrationResponse(AdminSchema):
     id: int
     company_id: int
     platform: str
@@ -78,17 +89,18 @@ class IntegrationResponse(BaseModel):
 
     model_config = {"from_attributes": True}
 
-class IntegrationManagementResponse(BaseModel):
+class IntegrationManagementResponse(AdminSchema):
     integrations: List[IntegrationResponse]
-    total_count: int
+    total_count: Optional[int] = None  # None when include_total=false
     skip: int
     limit: int
+    next_cursor: Optional[str] = None
 
 # ============================================================================
 # SYSTEM HEALTH SCHEMAS
 # ============================================================================
 
-class SystemHealthResponse(BaseModel):
+class SystemHealthResponse(AdminSchema):
     database_status: str
     total_users: int
     total_companies: int
@@ -101,11 +113,11 @@ class SystemHealthResponse(BaseModel):
 # ADMIN ACTIONS SCHEMAS
 # ============================================================================
 
-class BulkActionRequest(BaseModel):
+class BulkActionRequest(AdminSchema):
     action: str = Field(..., description="Action to perform: activate, deactivate, delete")
     ids: List[int] = Field(..., description="List of IDs to perform action on")
 
-class BulkActionResponse(BaseModel):
+class BulkActionResponse(AdminSchema):
     success_count: int
     failed_count: int
     failed_ids: List[int]
@@ -115,7 +127,7 @@ class BulkActionResponse(BaseModel):
 # ADMIN REPORTS SCHEMAS
 # ============================================================================
 
-class UserActivityReport(BaseModel):
+class UserActivityReport(AdminSchema):
     user_id: int
     user_email: str
     user_name: str
@@ -124,7 +136,7 @@ class UserActivityReport(BaseModel):
     last_response: Optional[datetime] = None
     is_active: bool
 
-class CompanyUsageReport(BaseModel):
+class CompanyUsageReport(AdminSchema):
     company_id: int
     company_name: str
     total_users: int
@@ -135,7 +147,7 @@ class CompanyUsageReport(BaseModel):
     total_responses: int
     last_activity: Optional[datetime] = None
 
-class SystemUsageReport(BaseModel):
+class SystemUsageReport(AdminSchema):
     period: str
     new_users: int
     new_companies: int
@@ -149,7 +161,7 @@ class SystemUsageReport(BaseModel):
 # ADMIN SETTINGS SCHEMAS
 # ============================================================================
 
-class SystemSettings(BaseModel):
+class SystemSettings(AdminSchema):
     max_users_per_company: int = 1000
     max_teams_per_company: int = 100
     max_ceremonies_per_team: int = 50
@@ -162,7 +174,7 @@ class SystemSettings(BaseModel):
     require_email_verification: bool = True
     allow_public_registration: bool = False
 
-class AdminSettingsUpdate(BaseModel):
+class AdminSettingsUpdate(AdminSchema):
     max_users_per_company: Optional[int] = None
     max_teams_per_company: Optional[int] = None
     max_ceremonies_per_team: Optional[int] = None
@@ -179,7 +191,7 @@ class AdminSettingsUpdate(BaseModel):
 # ADMIN AUDIT LOG SCHEMAS
 # ============================================================================
 
-class AuditLogEntry(BaseModel):
+class AuditLogEntry(AdminSchema):
     id: int
     user_id: int
     user_email: str
@@ -193,7 +205,7 @@ class AuditLogEntry(BaseModel):
 
     model_config = {"from_attributes": True}
 
-class AuditLogResponse(BaseModel):
+class AuditLogResponse(AdminSchema):
     entries: List[AuditLogEntry]
     total_count: int
     skip: int
@@ -203,7 +215,7 @@ class AuditLogResponse(BaseModel):
 # ADMIN NOTIFICATION SCHEMAS
 # ============================================================================
 
-class AdminNotification(BaseModel):
+class AdminNotification(AdminSchema):
     id: int
     type: str
     title: str
@@ -215,7 +227,7 @@ class AdminNotification(BaseModel):
 
     model_config = {"from_attributes": True}
 
-class AdminNotificationResponse(BaseModel):
+class AdminNotificationResponse(AdminSchema):
     notifications: List[AdminNotification]
     total_count: int
     unread_count: int
@@ -224,7 +236,7 @@ class AdminNotificationResponse(BaseModel):
 # ADMIN BACKUP & RESTORE SCHEMAS
 # ============================================================================
 
-class BackupRequest(BaseModel):
+class BackupRequest(AdminSchema):
     include_users: bool = True
     include_companies: bool = True
     include_teams: bool = True
@@ -233,7 +245,7 @@ class BackupRequest(BaseModel):
     include_questions: bool = True
     backup_format: str = "json"  # json, csv, sql
 
-class BackupResponse(BaseModel):
+class BackupResponse(AdminSchema):
     backup_id: str
     filename: str
     size_bytes: int
@@ -241,7 +253,7 @@ class BackupResponse(BaseModel):
     status: str  # pending, in_progress, completed, failed
     download_url: Optional[str] = None
 
-class RestoreRequest(BaseModel):
+class RestoreRequest(AdminSchema):
     backup_id: str
     restore_options: Dict[str, bool] = Field(
         default_factory=lambda: {
@@ -251,7 +263,7 @@ class RestoreRequest(BaseModel):
         }
     )
 
-class RestoreResponse(BaseModel):
+class RestoreResponse(AdminSchema):
     restore_id: str
     status: str  # pending, in_progress, completed, failed
     progress_percentage: int
@@ -42,6 +42,24 @@ class CeremonyResponseCreate(BaseModel):
     mood_rating: Optional[int] = Field(None, ge=1, le=10)
     energy_level: Optional[int] = Field(None, ge=1, le=10)
 
+class BulkCeremonyResponseItem(CeremonyResponseCreate):
+    # Defaults to the caller; other users need an admin or a manager of the team
+    user_id: Optional[int] = None
+
+class BulkCeremonyResponseCreate(BaseModel):
+    responses: List[BulkCeremonyResponseItem] = Field(..., min_length=1, max_length=500)
+
+class BulkResponseItemResult(BaseModel):
+    index: int
+    status_code: int
+    response_id: Optional[int] = None
+    detail: Optional[str] = None
+
+class BulkResponseResult(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkResponseItemResult]
+
 class CeremonyResponseUpdate(BaseModel):
     question_responses: Optional[List[QuestionResponseData]] = None
     notes: Optional[str] = None
@@ -114,6 +132,7 @@ class ResponseAttachmentResponse(BaseModel):
     file_size: int
     file_type: str
     mime_type: Optional[str] = None
+    content_hash: Optional[str] = None
     uploaded_at: datetime
     uploaded_by: int
     is_valid: bool
@@ -136,3 +155,22 @@ class QuestionResponseSummary(BaseModel):
     total_responses: int
     response_summary: dict  # Varies by question type
     completion_rate: float
+
+class CeremonyDigestSummary(BaseModel):
+    id: int
+    ceremony_id: int
+    team_id: int
+    occurs_at: datetime
+    member_count: int
+    response_count: int
+    blocker_count: int
+    average_mood: Optional[float] = None
+    average_energy: Optional[float] = None
+    generated_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
+
+class CeremonyDigestResponse(CeremonyDigestSummary):
+    content: dict
+    markdown: str
+    html: str
@@ -0,0 +1,116 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict
+from sqlalchemy import case, func, select, true
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.result_cache import TTLResultCache
+from app.models.ceremony import Ceremony
+from app.models.company import Company
+from app.models.question import Question
+from app.models.response import CeremonyResponse
+from app.models.team import Team
+from app.models.user import User, UserRole
+
+RECENT_ACTIVITY_DAYS = 7
+
+platform_stats_cache = TTLResultCache(settings.ADMIN_STATS_CACHE_TTL_SECONDS)
+
+
+def _count_where(condition):
+    """COUNT of the rows matching condition, portable across SQLite and PostgreSQL"""
+    return func.count(case((condition, 1)))
+
+
+def compute_platform_stats(db: Session) -> Dict[str, int]:
+    """
+    Count everything the admin dashboard and system health pages show.
+
+    Each table is scanned once by an aggregate subquery with conditional
+    counts; the subqueries each return a single row and are cross joined so
+    the whole result comes back from one statement.
+    """
+    since = datetime.utcnow() - timedelta(days=RECENT_ACTIVITY_DAYS)
+
+    users = select(
+        func.count(User.id).label("users_total"),
+        _count_where(User.is_active == True).label("users_active"),
+        _count_where(User.is_active == False).label("users_inactive"),
+        _count_where(User.is_verified == True).label("users_verified"),
+        _count_where(User.role == UserRole.ADMIN).label("users_admins"),
+        _count_where(User.created_at >= since).label("users_recent"),
+        _count_where(User.company_id.is_(None)).label("users_without_company"),
+    ).subquery()
+    companies = select(
+        func.count(Company.id).label("companies_total"),
+        _count_where(Company.is_active == True).label("companies_active"),
+    ).subquery()
+    teams = select(
+        func.count(Team.id).label("teams_total"),
+        _count_where(Team.is_active == True).label("teams_active"),
+        _count_where(Team.company_id.is_(None)).label("teams_without_company"),
+    ).subquery()
+    ceremonies = select(
+        func.count(Ceremony.id).label("ceremonies_total"),
+        _count_where(Ceremony.is_active == True).label("ceremonies_active"),
+    ).subquery()
+    responses = select(
+        func.count(CeremonyResponse.id).label("responses_total"),
+        _count_where(CeremonyResponse.status == "completed").label("responses_completed"),
+        _count_where(CeremonyResponse.submitted_at >= since).label("responses_recent"),
+    ).subquery()
+    questions = select(
+        func.count(Question.id).label("questions_total"),
+    ).subquery()
+
+    statement = select(
+        users, companies, teams, ceremonies, responses, questions
+    ).select_from(
+        users.join(companies, true())
+        .join(teams, true())
+        .join(ceremonies, true())
+        .join(responses, true())
+        .join(questions, true())
+    )
+    row = db.execute(statement).one()
+    return {key: value or 0 for key, value in row._mapping.items()}
+
+
+def get_platform_stats(db: Session) -> Dict[str, int]:
+    """Platform stats, recomputed at most once per ADMIN_STATS_CACHE_TTL_SECONDS"""
+    return platform_stats_cache.get_or_load("platform", lambda: compute_platform_stats(db))
+
+
+def build_dashboard_stats(stats: Dict[str, int]) -> Dict[str, Any]:
+    """Shape platform stats as an AdminDashboardStats payload"""
+    return {
+        "users": {
+            "total": stats["users_total"],
+            "active": stats["users_active"],
+            "verified": stats["users_verified"],
+            "admins": stats["users_admins"],
+            "recent": stats["users_recent"]
+        },
+        "companies": {
+            "total": stats["companies_total"],
+            "active": stats["companies_active"]
+        },
+        "teams": {
+            "total": stats["teams_total"],
+            "active": stats["teams_active"]
+        },
+        "ceremonies": {
+            "total": stats["ceremonies_total"],
+            "active": stats["ceremonies_active"]
+        },
+        "responses": {
+            "total": stats["responses_total"],
+            "active": stats["responses_completed"],  # Using completed responses as "active"
+            "recent": stats["responses_recent"]
+        },
+        "questions": {
+            "total": stats["questions_total"],
+            "active": stats["questions_total"],  # All questions are considered "active" for now
+            "recent": 0  # No recent questions tracking yet
+        }
+    }
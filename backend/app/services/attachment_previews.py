@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Set
+import aiofiles.os
+
+from app.core.config import settings
+from app.services.attachment_upload import INCOMING_SUBDIR, derivative_path, upload_root
+
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = frozenset({"png", "jpg", "jpeg", "gif", "webp", "bmp", "tif", "tiff"})
+TEXT_EXTENSIONS = frozenset({"txt", "log", "csv", "md", "json", "yaml", "yml", "xml"})
+
+
+class Derivative(NamedTuple):
+    kind: str  # part of the file name, so changing a setting makes new files
+    extension: str
+    media_type: str
+
+
+THUMBNAIL = Derivative(f"thumb-{settings.ATTACHMENT_THUMBNAIL_SIZE}", "webp", "image/webp")
+TEXT_PREVIEW = Derivative(f"preview-{settings.ATTACHMENT_PREVIEW_CHARS}", "txt", "text/plain")
+
+
+def is_image(file_type: Optional[str], mime_type: Optional[str]) -> bool:
+    return (mime_type or "").startswith("image/") or (file_type or "").lower() in IMAGE_EXTENSIONS
+
+
+def is_text(file_type: Optional[str], mime_type: Optional[str]) -> bool:
+    return (mime_type or "").startswith("text/") or (file_type or "").lower() in TEXT_EXTENSIONS
+
+
+def derivatives_for(file_type: Optional[str], mime_type: Optional[str]) -> List[Derivative]:
+    derivatives = []
+    if is_image(file_type, mime_type):
+        derivatives.append(THUMBNAIL)
+    if is_text(file_type, mime_type):
+        derivatives.append(TEXT_PREVIEW)
+    return derivatives
+
+
+# The renderers run in worker processes. They write to a scratch file under
+# incoming/ and move it into place, so a half-written derivative is never served.
+
+def _scratch_path(target: str) -> str:
+    return str(Path(target).parents[2] / INCOMING_SUBDIR / uuid.uuid4().hex)
+
+
+def render_thumbnail(source: str, target: str) -> None:
+    from PIL import Image, ImageOps  # only the pool's worker processes need Pillow
+
+    size = settings.ATTACHMENT_THUMBNAIL_SIZE
+    scratch = _scratch_path(target)
+    try:
+        with Image.open(source) as image:
+            image.draft("RGB", (size, size))  # JPEGs are decoded at a reduced scale
+            thumbnail = ImageOps.exif_transpose(image)
+            thumbnail = thumbnail.convert("RGBA" if thumbnail.mode in ("RGBA", "LA", "P", "PA") else "RGB")
+            thumbnail.thumbnail((size, size))
+            thumbnail.save(scratch, "WEBP", quality=80)
+        os.replace(scratch, target)
+    finally:
+        if os.path.exists(scratch):
+            os.remove(scratch)
+
+
+def render_text_preview(source: str, target: str) -> None:
+    chars = settings.ATTACHMENT_PREVIEW_CHARS
+    with open(source, "rb") as f:
+        head = f.read(chars * 4)  # enough bytes for ``chars`` characters of UTF-8
+    scratch = _scratch_path(target)
+    try:
+        with open(scratch, "w", encoding="utf-8") as f:
+            f.write(head.decode("utf-8", errors="replace")[:chars])
+        os.replace(scratch, target)
+    finally:
+        if os.path.exists(scratch):
+            os.remove(scratch)
+
+
+RENDERERS: Dict[str, Callable[[str, str], None]] = {
+    THUMBNAIL.kind: render_thumbnail,
+    TEXT_PREVIEW.kind: render_text_preview,
+}
+
+
+class PreviewPipeline:
+    """
+    Makes thumbnails and text previews of stored attachments in a process
+    pool, so image decoding never runs on the event loop or API threads.
+
+    Each derivative is made once per stored file and cached next to it.
+    Concurrent requests for the same derivative share one job, and files
+    that fail to render are not retried until the process restarts.
+    """
+
+    def __init__(self, workers: int = settings.ATTACHMENT_PREVIEW_WORKERS):
+        self.workers = workers
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._failed: Set[str] = set()
+        self._scheduled: Set[asyncio.Task] = set()
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # Forking a process that runs an event loop and threads is unsafe
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def derive(self, stored_path: str, derivative: Derivative) -> Optional[Path]:
+        """The derivative's path, rendering it first if needed; None if it cannot be made"""
+        relative_path = derivative_path(stored_path, derivative.kind, derivative.extension)
+        target = upload_root() / relative_path
+        if await aiofiles.os.path.exists(target):
+            return target
+        if relative_path in self._failed:
+            return None
+
+        job = self._pending.get(relative_path)
+        if job is None:
+            job = self._pending[relative_path] = asyncio.ensure_future(
+                self._render(upload_root() / stored_path, target, derivative, relative_path)
+            )
+            job.add_done_callback(lambda _: self._pending.pop(relative_path, None))
+        # Shielded: a client going away must not cancel work other requests wait on
+        return await asyncio.shield(job)
+
+    async def _render(self, source: Path, target: Path, derivative: Derivative, relative_path: str) -> Optional[Path]:
+        await aiofiles.os.makedirs(upload_root() / INCOMING_SUBDIR, exist_ok=True)
+        try:
+            await asyncio.get_running_loop().run_in_executor(
+                self._pool(), RENDERERS[derivative.kind], str(source), str(target)
+            )
+        except BrokenProcessPool:
+            # A worker died (e.g. killed while decoding); start a fresh pool next time
+            logger.warning("Preview worker pool broke while rendering %s", relative_path)
+            self._executor = None
+            return None
+        except Exception as e:
+            logger.warning("Could not render %s: %s", relative_path, e)
+            self._failed.add(relative_path)
+            return None
+        return target
+
+    def schedule(self, stored_path: str, file_type: Optional[str], mime_type: Optional[str]) -> None:
+        """Start rendering what an attachment will be shown with, without waiting for it"""
+        for derivative in derivatives_for(file_type, mime_type):
+            task = asyncio.create_task(self.derive(stored_path, derivative))
+            self._scheduled.add(task)
+            task.add_done_callback(self._scheduled.discard)
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+preview_pipeline = PreviewPipeline()
@@ -0,0 +1,250 @@
+import logging
+import os
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import conflict_insert
+from app.models.response import QuestionResponse, ResponseAttachment, StoredFile
+from app.services.attachment_upload import (
+    ATTACHMENTS_SUBDIR,
+    INCOMING_SUBDIR,
+    StoredUpload,
+    file_extension,
+    original_path,
+    upload_root
+)
+
+logger = logging.getLogger(__name__)
+
+
+class UploadCleanup(NamedTuple):
+    files_removed: int
+    bytes_reclaimed: int
+    partial_uploads_removed: int
+    ref_counts_repaired: int
+    stored_files: int
+    stored_bytes: int
+    bytes_saved_by_deduplication: int  # what the extra references would take as separate copies
+
+
+def acquire_file(db: Session, upload: StoredUpload) -> None:
+    """
+    Count one more reference to an upload's file, registering the file on
+    first use. A single upsert, so two first uploads of the same content at
+    once both count instead of one failing on the content_hash constraint.
+    """
+    db.execute(
+        conflict_insert(db, StoredFile)
+        .values(content_hash=upload.sha256, file_path=upload.path, file_size=upload.size, ref_count=1)
+        .on_conflict_do_update(
+            index_elements=[StoredFile.content_hash],
+            set_={"ref_count": StoredFile.ref_count + 1}
+        )
+    )
+
+
+def release_files(db: Session, content_hashes: Iterable[Optional[str]]) -> None:
+    """Drop one reference per hash; files left unreferenced are removed by collect_garbage"""
+    for content_hash, count in Counter(h for h in content_hashes if h).items():
+        db.execute(
+            update(StoredFile)
+            .where(StoredFile.content_hash == content_hash)
+            .values(ref_count=StoredFile.ref_count - count)
+        )
+
+
+def release_attachments(db: Session, question_response_ids: Iterable[int]) -> int:
+    """Delete the attachments of answers that are going away and release their files"""
+    ids = list(question_response_ids)
+    if not ids:
+        return 0
+    content_hashes = db.scalars(
+        select(ResponseAttachment.content_hash).where(ResponseAttachment.question_response_id.in_(ids))
+    ).all()
+    db.execute(delete(ResponseAttachment).where(ResponseAttachment.question_response_id.in_(ids)))
+    release_files(db, content_hashes)
+    return len(content_hashes)
+
+
+def move_attachments(db: Session, replacements: Dict[int, int]) -> None:
+    """Point attachments at the answers replacing the ones they were uploaded to"""
+    for old_id, new_id in replacements.items():
+        db.execute(
+            update(ResponseAttachment)
+            .where(ResponseAttachment.question_response_id == old_id)
+            .values(question_response_id=new_id)
+        )
+
+
+def record_attachment(
+    db: Session,
+    ceremony_response_id: int,
+    question_id: int,
+    file_name: str,
+    mime_type: Optional[str],
+    upload: StoredUpload,
+    uploaded_by: int
+) -> ResponseAttachment:
+    """Make a stored upload the answer to a question and reference its file (not committed)"""
+    question_response = db.scalar(select(QuestionResponse).where(
+        QuestionResponse.ceremony_response_id == ceremony_response_id,
+        QuestionResponse.question_id == question_id
+    ))
+    if not question_response:
+        question_response = QuestionResponse(
+            ceremony_response_id=ceremony_response_id,
+            question_id=question_id
+        )
+        db.add(question_response)
+
+    question_response.file_path = upload.path
+    question_response.file_name = file_name
+    question_response.file_size = upload.size
+    question_response.file_type = file_extension(file_name)
+    db.flush()
+
+    attachment = ResponseAttachment(
+        question_response_id=question_response.id,
+        file_path=upload.path,
+        file_name=file_name,
+        file_size=upload.size,
+        file_type=file_extension(file_name),
+        mime_type=mime_type,
+        content_hash=upload.sha256,
+        uploaded_by=uploaded_by
+    )
+    db.add(attachment)
+    acquire_file(db, upload)
+    db.flush()
+    return attachment
+
+
+def _older_than(path: Path, cutoff: float) -> bool:
+    """Missing files count as old: there is nothing left to protect"""
+    try:
+        return path.stat().st_mtime < cutoff
+    except FileNotFoundError:
+        return True
+
+
+def _size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _walk_files(directory: Path) -> List[Path]:
+    return [Path(dirpath) / name for dirpath, _, names in os.walk(directory) for name in names]
+
+
+def _remove(path: Path) -> None:
+    try:
+        path.unlink()
+    except FileNotFoundError:
+        pass
+
+
+def collect_garbage(
+    db: Session,
+    grace_seconds: int = settings.UPLOAD_GC_GRACE_SECONDS,
+    dry_run: bool = False
+) -> UploadCleanup:
+    """
+    Recount references to stored files and reclaim the unreferenced ones.
+
+    A file is referenced while a ResponseAttachment or a QuestionResponse
+    still points at it. ``ref_count`` is corrected where it drifted, files
+    under attachments/ that nothing references (including ones with no
+    StoredFile row, e.g. left by a failed write) are removed along with
+    their thumbnails and previews, and so are stale partial uploads. Anything modified in the last ``grace_seconds``
+    is kept, so uploads in flight are never collected.
+    """
+    root = upload_root()
+    cutoff = time.time() - grace_seconds
+
+    referenced = set(db.scalars(select(ResponseAttachment.file_path).distinct()))
+    referenced.update(db.scalars(
+        select(QuestionResponse.file_path).where(QuestionResponse.file_path.isnot(None)).distinct()
+    ))
+    counts = dict(db.execute(
+        select(ResponseAttachment.content_hash, func.count())
+        .where(ResponseAttachment.content_hash.isnot(None))
+        .group_by(ResponseAttachment.content_hash)
+    ).all())
+
+    repaired = 0
+    kept = set()
+    stored_bytes = saved_bytes = 0
+    reclaimed: List[StoredFile] = []
+    repairs: Dict[int, Tuple[int, int]] = {}  # id -> (ref_count read, actual count)
+    for stored in db.scalars(select(StoredFile)):
+        ref_count = counts.get(stored.content_hash, 0)
+        if stored.ref_count != ref_count:
+            repaired += 1
+            repairs[stored.id] = (stored.ref_count, ref_count)
+        if ref_count == 0 and stored.file_path not in referenced and _older_than(root / stored.file_path, cutoff):
+            reclaimed.append(stored)
+        else:
+            kept.add(stored.file_path)
+            stored_bytes += stored.file_size
+            saved_bytes += stored.file_size * max(ref_count - 1, 0)
+
+    unowned = {stored.file_path for stored in reclaimed}
+    for path in _walk_files(root / ATTACHMENTS_SUBDIR):
+        relative_path = path.relative_to(root).as_posix()
+        if any(owner in referenced or owner in kept for owner in {relative_path, original_path(relative_path)}):
+            continue  # referenced, or a thumbnail/preview of a file that is
+        if _older_than(path, cutoff):
+            unowned.add(relative_path)
+    partials = [path for path in _walk_files(root / INCOMING_SUBDIR) if _older_than(path, cutoff)]
+
+    if dry_run:
+        removed_bytes = sum(_size(root / relative_path) for relative_path in unowned)
+        db.rollback()
+    else:
+        # Both statements only apply if ref_count is still what was read above: an identical
+        # upload that acquired the file since (ON CONFLICT ... ref_count + 1) keeps its row
+        # and its files, and is recounted on the next run.
+        for stored_id, (seen, ref_count) in repairs.items():
+            db.execute(
+                update(StoredFile)
+                .where(StoredFile.id == stored_id, StoredFile.ref_count == seen)
+                .values(ref_count=ref_count)
+            )
+        revived = set()
+        for stored in reclaimed:
+            deleted = db.execute(
+                delete(StoredFile).where(StoredFile.id == stored.id, StoredFile.ref_count == 0)
+            ).rowcount
+            if not deleted:
+                revived.add(stored.file_path)
+        db.commit()
+        unowned = {
+            relative_path for relative_path in unowned
+            if relative_path not in revived and original_path(relative_path) not in revived
+        }
+
+        removed_bytes = sum(_size(root / relative_path) for relative_path in unowned)
+        # Rows are deleted before files: a file left without a row is collected on the next run.
+        # The age is checked again in case an identical upload reused a file since it was picked.
+        for path in [root / relative_path for relative_path in unowned] + partials:
+            if _older_than(path, cutoff):
+                _remove(path)
+        logger.info("Removed %s unreferenced uploads (%s bytes) and %s partial uploads",
+                    len(unowned), removed_bytes, len(partials))
+
+    return UploadCleanup(
+        files_removed=len(unowned),
+        bytes_reclaimed=removed_bytes,
+        partial_uploads_removed=len(partials),
+        ref_counts_repaired=repaired,
+        stored_files=len(kept),
+        stored_bytes=stored_bytes,
+        bytes_saved_by_deduplication=saved_bytes,
+    )
@@ -0,0 +1,120 @@
+import asyncio
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import AsyncIterator, Iterable, NamedTuple, Optional
+import aiofiles
+import aiofiles.os
+
+from app.core.config import settings
+
+ATTACHMENTS_SUBDIR = "attachments"  # attachments/<hash[:2]>/<sha256>, one file per distinct content
+INCOMING_SUBDIR = "incoming"  # partial uploads; never served
+
+
+class UploadTooLarge(Exception):
+    def __init__(self, limit: int):
+        super().__init__(f"File exceeds the {limit} byte limit")
+        self.limit = limit
+
+
+class StoredUpload(NamedTuple):
+    path: str  # relative to UPLOAD_DIR
+    size: int
+    sha256: str
+
+
+def upload_root() -> Path:
+    return Path(settings.UPLOAD_DIR)
+
+
+def object_path(content_hash: str) -> str:
+    """Where the file with this SHA-256 is stored, relative to UPLOAD_DIR"""
+    return f"{ATTACHMENTS_SUBDIR}/{content_hash[:2]}/{content_hash}"
+
+
+def derivative_path(stored_path: str, kind: str, extension: str) -> str:
+    """Files derived from a stored file sit next to it: <sha256>.<kind>.<extension>"""
+    return f"{stored_path}.{kind}.{extension}"
+
+
+def original_path(relative_path: str) -> str:
+    """The stored file a derivative was made from; other paths are returned as they are"""
+    directory, _, name = relative_path.rpartition("/")
+    content_hash, dot, _ = name.partition(".")
+    if dot and len(content_hash) == 64:
+        return f"{directory}/{content_hash}"
+    return relative_path
+
+
+def file_extension(filename: str) -> str:
+    """Lower-case extension without the dot ("" when there is none)"""
+    return Path(filename).suffix.lower().lstrip(".")
+
+
+def is_allowed_type(filename: str, allowed_file_types: Optional[Iterable[str]]) -> bool:
+    """``allowed_file_types`` lists extensions, with or without the dot; empty allows any"""
+    if not allowed_file_types:
+        return True
+    allowed = {file_type.lower().lstrip(".") for file_type in allowed_file_types}
+    return file_extension(filename) in allowed
+
+
+def upload_limit(question_max_file_size: Optional[int]) -> int:
+    """A question may lower the global MAX_FILE_SIZE, never raise it"""
+    if question_max_file_size:
+        return min(question_max_file_size, settings.MAX_FILE_SIZE)
+    return settings.MAX_FILE_SIZE
+
+
+async def receive_upload(chunks: AsyncIterator[bytes], max_bytes: int) -> StoredUpload:
+    """
+    Write an incoming body to disk as it arrives, hashing it on the way.
+
+    At most one chunk is held in memory. The limit is checked per chunk, so
+    an oversized upload is cut off as soon as it crosses ``max_bytes``
+    (UploadTooLarge) instead of after it was received in full. The file is
+    written under ``incoming/`` and, once complete, stored under its content
+    hash; if that content is already stored the new copy is dropped.
+    """
+    root = upload_root()
+    incoming = root / INCOMING_SUBDIR
+    await aiofiles.os.makedirs(incoming, exist_ok=True)
+
+    partial_path = incoming / uuid.uuid4().hex
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        async with aiofiles.open(partial_path, "wb") as target:
+            async for chunk in chunks:
+                if not chunk:
+                    continue
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLarge(max_bytes)
+                digest.update(chunk)
+                await target.write(chunk)
+
+        relative_path = object_path(digest.hexdigest())
+        stored_path = root / relative_path
+        if await aiofiles.os.path.exists(stored_path):
+            # Touching the stored copy keeps garbage collection off it until it is referenced
+            await asyncio.to_thread(os.utime, stored_path)
+            await discard_file(partial_path)
+        else:
+            await aiofiles.os.makedirs(stored_path.parent, exist_ok=True)
+            await aiofiles.os.replace(partial_path, stored_path)
+    except BaseException:
+        # Includes client disconnects (CancelledError) part way through
+        await discard_file(partial_path)
+        raise
+
+    return StoredUpload(relative_path, size, digest.hexdigest())
+
+
+async def discard_file(path: os.PathLike) -> None:
+    try:
+        await aiofiles.os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,339 @@
+import asyncio
+import logging
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from jinja2 import Environment
+from sqlalchemy import insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.ceremony import Ceremony, CeremonyQuestion
+from app.models.notification import Notification, NotificationChannel, NotificationStatus, NotificationType
+from app.models.question import Question
+from app.models.response import CeremonyDigest, CeremonyResponse, QuestionResponse
+from app.models.team import TeamManager, TeamMember
+from app.models.user import User
+from app.services.ceremony_recurrence import Occurrence, get_zone
+from app.services.chat_dispatch import ChatTarget, resolve_targets
+from app.services.ceremony_scheduler import is_schedulable
+
+logger = logging.getLogger(__name__)
+
+DIGEST_RESPONSE_STATUSES = ("submitted", "completed")
+
+# A question is treated as the blocker question when its text mentions one of these
+BLOCKER_KEYWORDS = ("blocker", "blocked", "blocking", "impediment", "obstacle")
+# ...and answers like these mean "no blockers"
+NO_BLOCKER_ANSWERS = {"", "-", "no", "none", "nope", "nothing", "n/a", "na", "no blockers", "not blocked"}
+
+_html_environment = Environment(autoescape=True, trim_blocks=True, lstrip_blocks=True)
+DIGEST_HTML_TEMPLATE = _html_environment.from_string("""\
+<section class="ceremony-digest">
+<h2>{{ title }}</h2>
+<p>{{ content.response_count }}/{{ content.member_count }} responded
+{% if content.mood.average is not none %} &middot; average mood {{ "%.1f"|format(content.mood.average) }}/10{% endif %}
+{% if content.energy.average is not none %} &middot; average energy {{ "%.1f"|format(content.energy.average) }}/10{% endif %}
+</p>
+{% if content.blockers %}
+<h3>Blockers</h3>
+<ul>
+{% for blocker in content.blockers %}
+<li><strong>{{ blocker.full_name }}</strong>: {{ blocker.answer }}</li>
+{% endfor %}
+</ul>
+{% endif %}
+{% for member in content.members %}
+<h3>{{ member.full_name }}</h3>
+<dl>
+{% for answer in member.answers %}
+<dt>{{ answer.question }}</dt><dd>{{ answer.answer }}</dd>
+{% endfor %}
+</dl>
+{% endfor %}
+{% if content.missing %}
+<p>No response from: {{ content.missing|join(", ") }}</p>
+{% endif %}
+</section>
+""")
+
+
+def format_answer(answer: Any) -> Optional[str]:
+    """One line of text for an answer of any question type, or None when it is empty"""
+    if answer.text_response and answer.text_response.strip():
+        return answer.text_response.strip()
+    if answer.selected_options:
+        return ", ".join(str(option) for option in answer.selected_options)
+    if answer.numeric_response is not None:
+        return f"{answer.numeric_response:g}"
+    if answer.date_response is not None:
+        return answer.date_response.date().isoformat()
+    if answer.time_response:
+        return answer.time_response
+    if answer.file_name:
+        return f"📎 {answer.file_name}"
+    return None
+
+
+def is_blocker_question(question_text: str) -> bool:
+    text = question_text.lower()
+    return any(keyword in text for keyword in BLOCKER_KEYWORDS)
+
+
+def _rating_stats(ratings: List[int]) -> Dict[str, Any]:
+    if not ratings:
+        return {"average": None, "min": None, "max": None, "distribution": {}}
+    return {
+        "average": round(sum(ratings) / len(ratings), 2),
+        "min": min(ratings),
+        "max": max(ratings),
+        "distribution": {str(rating): count for rating, count in sorted(Counter(ratings).items())},
+    }
+
+
+def collect_digest(db: Session, ceremony: Ceremony, occurs_at: datetime) -> Dict[str, Any]:
+    """
+    Gather everything a digest shows for one occurrence: each member's
+    latest response submitted within CEREMONY_DIGEST_WINDOW_HOURS before
+    the start, their answers in question order, blockers, mood and energy
+    stats, and who did not respond. Three queries regardless of team size.
+    """
+    window_start = occurs_at - timedelta(hours=settings.CEREMONY_DIGEST_WINDOW_HOURS)
+
+    members = db.execute(
+        select(User.id, User.full_name)
+        .join(TeamMember, TeamMember.user_id == User.id)
+        .where(TeamMember.team_id == ceremony.team_id, TeamMember.is_active == True)
+        .order_by(User.full_name)
+    ).all()
+    responses = db.execute(
+        select(
+            CeremonyResponse.id, CeremonyResponse.user_id, User.full_name,
+            CeremonyResponse.mood_rating, CeremonyResponse.energy_level, CeremonyResponse.submitted_at,
+        )
+        .join(User, User.id == CeremonyResponse.user_id)
+        .where(
+            CeremonyResponse.ceremony_id == ceremony.id,
+            CeremonyResponse.team_id == ceremony.team_id,
+            CeremonyResponse.status.in_(DIGEST_RESPONSE_STATUSES),
+            CeremonyResponse.submitted_at >= window_start,
+        )
+        .order_by(User.full_name, CeremonyResponse.submitted_at, CeremonyResponse.id)
+    ).all()
+
+    # A member who answered twice in the window is shown with their latest response
+    latest: Dict[int, Any] = {}
+    for response in responses:
+        latest[response.user_id] = response
+
+    answers: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+    blockers = []
+    if latest:
+        rows = db.execute(
+            select(QuestionResponse, Question.text)
+            .join(Question, Question.id == QuestionResponse.question_id)
+            .outerjoin(
+                CeremonyQuestion,
+                (CeremonyQuestion.ceremony_id == ceremony.id) & (CeremonyQuestion.question_id == Question.id)
+            )
+            .where(QuestionResponse.ceremony_response_id.in_([response.id for response in latest.values()]))
+            .order_by(QuestionResponse.ceremony_response_id, CeremonyQuestion.order_index, QuestionResponse.id)
+        )
+        names = {response.id: (response.user_id, response.full_name) for response in latest.values()}
+        for answer, question_text in rows:
+            formatted = format_answer(answer)
+            if formatted is None:
+                continue
+            answers[answer.ceremony_response_id].append(
+                {"question_id": answer.question_id, "question": question_text, "answer": formatted}
+            )
+            if is_blocker_question(question_text) and formatted.strip().lower().rstrip(".!") not in NO_BLOCKER_ANSWERS:
+                user_id, full_name = names[answer.ceremony_response_id]
+                blockers.append({"user_id": user_id, "full_name": full_name, "question": question_text, "answer": formatted})
+
+    responded = set(latest)
+    return {
+        "ceremony_id": ceremony.id,
+        "team_id": ceremony.team_id,
+        "occurs_at": occurs_at.isoformat(),
+        "window_start": window_start.isoformat(),
+        "member_count": len(members),
+        "response_count": len(latest),
+        "members": [
+            {
+                "user_id": response.user_id,
+                "full_name": response.full_name,
+                "submitted_at": response.submitted_at.isoformat() if response.submitted_at else None,
+                "mood_rating": response.mood_rating,
+                "energy_level": response.energy_level,
+                "answers": answers.get(response.id, []),
+            }
+            for response in latest.values()
+        ],
+        "blockers": blockers,
+        "missing": [full_name for user_id, full_name in members if user_id not in responded],
+        "mood": _rating_stats([r.mood_rating for r in latest.values() if r.mood_rating is not None]),
+        "energy": _rating_stats([r.energy_level for r in latest.values() if r.energy_level is not None]),
+    }
+
+
+def digest_title(ceremony: Ceremony, occurs_at: datetime) -> str:
+    local_day = occurs_at.astimezone(get_zone(ceremony.timezone)).date()
+    return f"{ceremony.name} — {local_day.isoformat()}"
+
+
+def render_markdown(content: Dict[str, Any]) -> str:
+    """Chat-flavoured markdown (Slack mrkdwn compatible) for a digest's content"""
+    headline = f"{content['response_count']}/{content['member_count']} responded"
+    if content["mood"]["average"] is not None:
+        headline += f" · average mood {content['mood']['average']:.1f}/10"
+    if content["energy"]["average"] is not None:
+        headline += f" · average energy {content['energy']['average']:.1f}/10"
+
+    lines = [headline]
+    if content["blockers"]:
+        lines.append("")
+        lines.append(f"*Blockers ({len(content['blockers'])})*")
+        lines.extend(f"• {blocker['full_name']}: {blocker['answer']}" for blocker in content["blockers"])
+    for member in content["members"]:
+        lines.append("")
+        lines.append(f"*{member['full_name']}*")
+        lines.extend(f"• _{answer['question']}_ {answer['answer']}" for answer in member["answers"])
+        if not member["answers"]:
+            lines.append("• (no answers)")
+    if content["missing"]:
+        lines.append("")
+        lines.append(f"No response from: {', '.join(content['missing'])}")
+    return "\n".join(lines)
+
+
+def render_html(title: str, content: Dict[str, Any]) -> str:
+    return DIGEST_HTML_TEMPLATE.render(title=title, content=content)
+
+
+def generate_digest(db: Session, ceremony: Ceremony, occurs_at: datetime) -> Tuple[CeremonyDigest, bool]:
+    """
+    Build and store (or refresh) the digest of one occurrence. Returns the
+    digest and whether it is new. The caller commits.
+    """
+    content = collect_digest(db, ceremony, occurs_at)
+    values = {
+        "team_id": ceremony.team_id,
+        "window_start": datetime.fromisoformat(content["window_start"]),
+        "member_count": content["member_count"],
+        "response_count": content["response_count"],
+        "blocker_count": len(content["blockers"]),
+        "average_mood": content["mood"]["average"],
+        "average_energy": content["energy"]["average"],
+        "content": content,
+        "markdown": render_markdown(content),
+        "html": render_html(digest_title(ceremony, occurs_at), content),
+    }
+
+    digest = get_digest(db, ceremony.id, occurs_at)
+    created = digest is None
+    if created:
+        digest = CeremonyDigest(ceremony_id=ceremony.id, occurs_at=occurs_at, **values)
+        db.add(digest)
+    else:
+        for field, value in values.items():
+            setattr(digest, field, value)
+    db.flush()
+    return digest, created
+
+
+def get_digest(db: Session, ceremony_id: int, occurs_at: datetime) -> Optional[CeremonyDigest]:
+    return db.query(CeremonyDigest).filter(
+        CeremonyDigest.ceremony_id == ceremony_id,
+        CeremonyDigest.occurs_at == occurs_at
+    ).first()
+
+
+def load_digest_owners(db: Session, team_ids: Iterable[int]) -> Dict[int, int]:
+    """The user a team's chat digests are recorded against: its first manager"""
+    owners: Dict[int, int] = {}
+    rows = db.execute(
+        select(TeamManager.team_id, TeamManager.user_id)
+        .where(TeamManager.team_id.in_(set(team_ids)))
+        .order_by(TeamManager.id)
+    )
+    for team_id, user_id in rows:
+        owners.setdefault(team_id, user_id)
+    return owners
+
+
+def chat_digest_row(ceremony: Ceremony, digest: CeremonyDigest, owner_id: int, target: ChatTarget) -> dict:
+    """
+    A chat notification that posts a stored digest to one target. Each target
+    gets its own notification, so a retry after one webhook failed does not
+    post again to those that succeeded.
+    """
+    return {
+        "user_id": owner_id,
+        "type": NotificationType.TEAM_UPDATE.value,
+        "title": digest_title(ceremony, digest.occurs_at),
+        "message": digest.markdown,
+        "channel": NotificationChannel.CHAT.value,
+        "status": NotificationStatus.PENDING.value,
+        "additional_data": {
+            "digest_id": digest.id,
+            "ceremony_id": ceremony.id,
+            "team_id": ceremony.team_id,
+            "webhook_url": target.url,
+            "platform": target.platform,
+        },
+    }
+
+
+def generate_digests(db: Session, occurrences: List[Occurrence]) -> int:
+    """
+    Digest every closed occurrence and queue a chat post for ceremonies with
+    chat notifications on. An occurrence digested again (e.g. after a
+    restart) is refreshed but not posted twice. Returns the number of
+    digests stored.
+    """
+    ceremonies = {
+        ceremony.id: ceremony
+        for ceremony in db.query(Ceremony).filter(Ceremony.id.in_({o.ceremony_id for o in occurrences}))
+        if is_schedulable(ceremony)
+    }
+    chat_team_ids = {ceremony.team_id for ceremony in ceremonies.values() if ceremony.chat_notifications_enabled}
+    owners = load_digest_owners(db, chat_team_ids) if chat_team_ids else {}
+
+    digests, chat_rows = 0, []
+    for occurrence in occurrences:
+        ceremony = ceremonies.get(occurrence.ceremony_id)
+        if ceremony is None:
+            continue
+        digest, created = generate_digest(db, ceremony, occurrence.occurs_at)
+        digests += 1
+        if created and ceremony.chat_notifications_enabled:
+            targets = resolve_targets(db, ceremony)
+            if ceremony.team_id not in owners:
+                logger.warning("No chat digest for ceremony %s: team %s has no manager", ceremony.id, ceremony.team_id)
+            elif not targets:
+                logger.warning("No chat digest for ceremony %s: it has no chat webhook", ceremony.id)
+            else:
+                chat_rows.extend(
+                    chat_digest_row(ceremony, digest, owners[ceremony.team_id], target) for target in targets
+                )
+
+    if chat_rows:
+        db.execute(insert(Notification), chat_rows)
+    db.commit()
+    return digests
+
+
+def _generate_with_session(occurrences: List[Occurrence]) -> int:
+    db = SessionLocal()
+    try:
+        return generate_digests(db, occurrences)
+    finally:
+        db.close()
+
+
+async def dispatch_digests(occurrences: List[Occurrence]) -> None:
+    """Closing scheduler dispatcher: digest occurrences that just ended"""
+    created = await asyncio.to_thread(_generate_with_session, occurrences)
+    logger.info("Generated %s ceremony digests", created)
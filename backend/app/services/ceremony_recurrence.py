@@ -0,0 +1,146 @@
+import calendar
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any, FrozenSet, NamedTuple, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from app.models.ceremony import CeremonyCadence
+from app.models.work_schedule import WorkDay
+
+WEEKDAY_NAMES = [day.value for day in WorkDay]  # index matches date.weekday()
+ALL_WEEKDAYS = frozenset(range(7))
+
+# Furthest we look ahead for a matching date before giving up on a rule
+MAX_LOOKAHEAD_DAYS = 400
+
+
+class CeremonyRule(NamedTuple):
+    """
+    The scheduling fields of a ceremony, detached from the ORM row.
+
+    ``custom_schedule`` may refine the cadence with:
+    - ``days``: weekday names the ceremony runs on (daily/weekly/bi_weekly/custom)
+    - ``interval_weeks``: run every N weeks (custom, default 1)
+    - ``day_of_month``: day the ceremony runs on (monthly; clamped to short months)
+    - ``anchor_date``: ISO date the week/month counting starts from
+    Without them weekly, bi-weekly and monthly ceremonies repeat on the
+    weekday/day of the month they were created.
+    """
+    ceremony_id: int
+    cadence: str
+    start_time: time
+    timezone: str
+    weekdays: FrozenSet[int]
+    interval_weeks: int
+    day_of_month: Optional[int]
+    anchor: date
+    lead_minutes: int
+
+
+class Occurrence(NamedTuple):
+    ceremony_id: int
+    fire_at: datetime  # when the scheduler fires, e.g. reminders go out (UTC)
+    occurs_at: datetime  # when the ceremony starts (UTC)
+
+
+def get_zone(name: Optional[str]) -> ZoneInfo:
+    """Resolve a timezone name, falling back to UTC for unknown or empty names"""
+    try:
+        return ZoneInfo(name or "UTC")
+    except (ZoneInfoNotFoundError, ValueError):
+        return ZoneInfo("UTC")
+
+
+def _normalize_cadence(cadence: Optional[str]) -> str:
+    return (cadence or CeremonyCadence.DAILY.value).lower().replace("-", "_")
+
+
+def _parse_weekdays(days: Any) -> FrozenSet[int]:
+    if not days:
+        return frozenset()
+    return frozenset(WEEKDAY_NAMES.index(day.lower()) for day in days if day.lower() in WEEKDAY_NAMES)
+
+
+def build_rule(ceremony: Any) -> CeremonyRule:
+    """Build a CeremonyRule from a Ceremony (or any object with the same fields)"""
+    cadence = _normalize_cadence(ceremony.cadence)
+    custom = ceremony.custom_schedule or {}
+    zone = get_zone(ceremony.timezone)
+
+    if custom.get("anchor_date"):
+        anchor = date.fromisoformat(custom["anchor_date"])
+    elif ceremony.created_at is not None:
+        created_at = ceremony.created_at
+        if created_at.tzinfo is None:
+            created_at = created_at.replace(tzinfo=timezone.utc)
+        anchor = created_at.astimezone(zone).date()
+    else:
+        anchor = datetime.now(zone).date()
+
+    weekdays = _parse_weekdays(custom.get("days"))
+    if not weekdays:
+        if cadence in (CeremonyCadence.WEEKLY.value, CeremonyCadence.BI_WEEKLY.value):
+            weekdays = frozenset([anchor.weekday()])
+        else:
+            weekdays = ALL_WEEKDAYS
+
+    if cadence == CeremonyCadence.BI_WEEKLY.value:
+        interval_weeks = 2
+    elif cadence == CeremonyCadence.CUSTOM.value:
+        interval_weeks = max(1, int(custom.get("interval_weeks") or 1))
+    else:
+        interval_weeks = 1
+
+    day_of_month = None
+    if cadence == CeremonyCadence.MONTHLY.value:
+        day_of_month = int(custom.get("day_of_month") or anchor.day)
+
+    return CeremonyRule(
+        ceremony_id=ceremony.id,
+        cadence=cadence,
+        start_time=ceremony.start_time,
+        timezone=zone.key,
+        weekdays=weekdays,
+        interval_weeks=interval_weeks,
+        day_of_month=day_of_month,
+        anchor=anchor,
+        lead_minutes=(ceremony.notification_lead_time or 0) if ceremony.send_notifications else 0,
+    )
+
+
+def _week_index(day: date) -> int:
+    # date.min (0001-01-01) is a Monday, so this counts Monday-based weeks
+    return (day.toordinal() - 1) // 7
+
+
+def runs_on(rule: CeremonyRule, day: date) -> bool:
+    """Whether the ceremony has an occurrence on this local date"""
+    if rule.day_of_month is not None:
+        last_day = calendar.monthrange(day.year, day.month)[1]
+        return day.day == min(rule.day_of_month, last_day)
+
+    if day.weekday() not in rule.weekdays:
+        return False
+    if rule.interval_weeks > 1:
+        return (_week_index(day) - _week_index(rule.anchor)) % rule.interval_weeks == 0
+    return True
+
+
+def next_occurrence(rule: CeremonyRule, after: datetime) -> Optional[Occurrence]:
+    """
+    First occurrence whose reminder fires strictly after ``after`` (aware UTC).
+
+    Local wall-clock times are converted per date, so ceremonies keep their
+    local start time across DST changes.
+    """
+    zone = ZoneInfo(rule.timezone)
+    lead = timedelta(minutes=rule.lead_minutes)
+    day = (after + lead).astimezone(zone).date()
+
+    for _ in range(MAX_LOOKAHEAD_DAYS):
+        if runs_on(rule, day):
+            occurs_at = datetime.combine(day, rule.start_time, tzinfo=zone).astimezone(timezone.utc)
+            fire_at = occurs_at - lead
+            if fire_at > after:
+                return Occurrence(rule.ceremony_id, fire_at, occurs_at)
+        day += timedelta(days=1)
+    return None
@@ -0,0 +1,262 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.ceremony import Ceremony, CeremonyStatus
+from app.services.ceremony_recurrence import CeremonyRule, Occurrence, build_rule, next_occurrence
+
+logger = logging.getLogger(__name__)
+
+# Re-read a little before the last sync to cover clock skew with the database
+SYNC_OVERLAP = timedelta(seconds=5)
+
+Dispatcher = Callable[[List[Occurrence]], Awaitable[None]]
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def is_schedulable(ceremony: Any) -> bool:
+    return bool(ceremony.is_active) and (ceremony.status or CeremonyStatus.ACTIVE.value) == CeremonyStatus.ACTIVE.value
+
+
+class CeremonyScheduler:
+    """
+    Min-heap of the next reminder instant of every schedulable ceremony.
+
+    Each ceremony has at most one live heap entry. Changing or removing a
+    ceremony bumps its generation instead of searching the heap; entries
+    with an outdated generation are discarded when they reach the top.
+    Popping a due entry pushes that ceremony's following occurrence, so the
+    ceremonies table is only scanned once, on load.
+    """
+
+    def __init__(self, rule_builder: Callable[[Any], CeremonyRule] = build_rule):
+        self.rule_builder = rule_builder
+        self._heap: List[Tuple[datetime, int, int]] = []
+        self._entries: Dict[int, Tuple[CeremonyRule, int, Occurrence]] = {}
+        self._generations = itertools.count()
+        self._lock = threading.Lock()
+        self._on_change: Optional[Callable[[], None]] = None
+        self.last_synced_at: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def set_change_callback(self, callback: Optional[Callable[[], None]]) -> None:
+        """Called (from any thread) when the earliest fire time may have moved"""
+        self._on_change = callback
+
+    def _push(self, rule: CeremonyRule, occurrence: Optional[Occurrence]) -> None:
+        if occurrence is None:
+            self._entries.pop(rule.ceremony_id, None)
+            return
+        generation = next(self._generations)
+        self._entries[rule.ceremony_id] = (rule, generation, occurrence)
+        heapq.heappush(self._heap, (occurrence.fire_at, rule.ceremony_id, generation))
+
+    def _is_live(self, ceremony_id: int, generation: int) -> bool:
+        entry = self._entries.get(ceremony_id)
+        return entry is not None and entry[1] == generation
+
+    def _schedule(self, ceremony: Any, now: datetime) -> Optional[Tuple[CeremonyRule, Optional[Occurrence]]]:
+        """A ceremony's rule and next occurrence, or None when its schedule cannot be read"""
+        try:
+            rule = self.rule_builder(ceremony)
+            return rule, next_occurrence(rule, now)
+        except Exception:
+            logger.exception("Ceremony %s has an invalid schedule; not scheduling it", ceremony.id)
+            return None
+
+    def load(self, db: Session, now: Optional[datetime] = None) -> int:
+        """Rebuild the heap from every schedulable ceremony. Returns the entry count."""
+        now = now or utc_now()
+        ceremonies = db.query(Ceremony).filter(
+            Ceremony.is_active == True,
+            or_(Ceremony.status == CeremonyStatus.ACTIVE.value, Ceremony.status.is_(None))
+        ).yield_per(1000)
+
+        entries: Dict[int, Tuple[CeremonyRule, int, Occurrence]] = {}
+        heap = []
+        for ceremony in ceremonies:
+            scheduled = self._schedule(ceremony, now)
+            if scheduled is None:
+                continue
+            rule, occurrence = scheduled
+            if occurrence is not None:
+                generation = next(self._generations)
+                entries[rule.ceremony_id] = (rule, generation, occurrence)
+                heap.append((occurrence.fire_at, rule.ceremony_id, generation))
+        heapq.heapify(heap)
+
+        with self._lock:
+            self._entries, self._heap = entries, heap
+            self.last_synced_at = now
+        self._notify()
+        return len(entries)
+
+    def upsert(self, ceremony: Any, now: Optional[datetime] = None) -> Optional[Occurrence]:
+        """Recompute one ceremony's entry after it was created, updated, paused or resumed"""
+        if not is_schedulable(ceremony):
+            self.remove(ceremony.id)
+            return None
+
+        scheduled = self._schedule(ceremony, now or utc_now())
+        if scheduled is None:
+            self.remove(ceremony.id)
+            return None
+        rule, occurrence = scheduled
+        with self._lock:
+            self._push(rule, occurrence)
+        self._notify()
+        return occurrence
+
+    def remove(self, ceremony_id: int) -> None:
+        with self._lock:
+            self._entries.pop(ceremony_id, None)
+
+    def get(self, ceremony_id: int) -> Optional[Occurrence]:
+        entry = self._entries.get(ceremony_id)
+        return entry[2] if entry else None
+
+    def next_fire_at(self) -> Optional[datetime]:
+        with self._lock:
+            while self._heap and not self._is_live(self._heap[0][1], self._heap[0][2]):
+                heapq.heappop(self._heap)
+            return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: Optional[datetime] = None) -> List[Occurrence]:
+        """Take every occurrence due by ``now`` and schedule each ceremony's next one"""
+        now = now or utc_now()
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                _, ceremony_id, generation = heapq.heappop(self._heap)
+                if not self._is_live(ceremony_id, generation):
+                    continue
+                rule, _, occurrence = self._entries[ceremony_id]
+                due.append(occurrence)
+                self._push(rule, next_occurrence(rule, occurrence.fire_at))
+        return due
+
+    def sync_changed(self, db: Session, now: Optional[datetime] = None) -> int:
+        """
+        Pick up ceremonies created or updated since the last sync, e.g. by
+        another worker process. Returns the number of ceremonies refreshed.
+        """
+        now = now or utc_now()
+        since = (self.last_synced_at or now) - SYNC_OVERLAP
+        changed = db.query(Ceremony).filter(
+            or_(Ceremony.updated_at >= since, Ceremony.created_at >= since)
+        ).all()
+        for ceremony in changed:
+            self.upsert(ceremony, now)
+        self.last_synced_at = now
+        return len(changed)
+
+    def _notify(self) -> None:
+        if self._on_change is not None:
+            self._on_change()
+
+
+def closing_rule(ceremony: Any) -> CeremonyRule:
+    """A rule that fires CEREMONY_CLOSE_AFTER_MINUTES after each occurrence starts"""
+    return build_rule(ceremony)._replace(lead_minutes=-settings.CEREMONY_CLOSE_AFTER_MINUTES)
+
+
+# Fires when reminders are due
+ceremony_scheduler = CeremonyScheduler()
+# Fires when an occurrence is over and its answers can be digested
+closing_scheduler = CeremonyScheduler(rule_builder=closing_rule)
+
+
+def upsert_ceremony(ceremony: Any) -> None:
+    """
+    Reschedule a ceremony in this process's schedulers after it changed.
+    Processes not running them (web workers by default) skip this; the
+    scheduler process picks the change up on its next resync.
+    """
+    for scheduler in (ceremony_scheduler, closing_scheduler):
+        if scheduler.last_synced_at is not None:
+            scheduler.upsert(ceremony)
+
+
+def remove_ceremony(ceremony_id: int) -> None:
+    for scheduler in (ceremony_scheduler, closing_scheduler):
+        if scheduler.last_synced_at is not None:
+            scheduler.remove(ceremony_id)
+
+
+async def log_due_occurrences(occurrences: List[Occurrence]) -> None:
+    for occurrence in occurrences:
+        logger.info(
+            "Ceremony %s due: reminders at %s for %s",
+            occurrence.ceremony_id, occurrence.fire_at.isoformat(), occurrence.occurs_at.isoformat()
+        )
+
+
+def _run_with_session(method: Callable[[Session], Any]) -> Any:
+    db = SessionLocal()
+    try:
+        return method(db)
+    finally:
+        db.close()
+
+
+async def run_scheduler(
+    dispatch: Dispatcher = log_due_occurrences,
+    scheduler: CeremonyScheduler = ceremony_scheduler
+) -> None:
+    """
+    Sleep until the next reminder is due, hand due occurrences to
+    ``dispatch`` and periodically pick up ceremonies changed elsewhere.
+
+    Run it in a single process (scheduler_worker.py, or one app process
+    with SCHEDULER_ENABLED): every running scheduler dispatches every
+    occurrence.
+    """
+    loop = asyncio.get_running_loop()
+    wakeup = asyncio.Event()
+    scheduler.set_change_callback(lambda: loop.call_soon_threadsafe(wakeup.set))
+
+    try:
+        count = await asyncio.to_thread(_run_with_session, scheduler.load)
+        logger.info("Ceremony scheduler loaded %s ceremonies", count)
+        resync_interval = timedelta(seconds=settings.SCHEDULER_RESYNC_SECONDS)
+
+        while True:
+            wakeup.clear()
+            now = utc_now()
+
+            due = scheduler.pop_due(now)
+            if due:
+                try:
+                    await dispatch(due)
+                except Exception:
+                    logger.exception("Dispatching %s due ceremonies failed", len(due))
+
+            if now - scheduler.last_synced_at >= resync_interval:
+                try:
+                    await asyncio.to_thread(_run_with_session, lambda db: scheduler.sync_changed(db, now))
+                except Exception:
+                    logger.exception("Resyncing changed ceremonies failed")
+
+            next_fire_at = scheduler.next_fire_at()
+            timeout = resync_interval.total_seconds()
+            if next_fire_at is not None:
+                timeout = min(timeout, max(0.0, (next_fire_at - utc_now()).total_seconds()))
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        scheduler.set_change_callback(None)
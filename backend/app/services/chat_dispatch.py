@@ -0,0 +1,187 @@
+import asyncio
+import time
+from typing import Any, Dict, List, NamedTuple, Optional
+from urllib.parse import urlsplit
+import httpx
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.ceremony import Ceremony
+from app.models.chat_integration import ChatIntegration, ChatPlatform
+from app.models.team import Team
+
+# Hosts of the webhook endpoints each platform hands out
+PLATFORM_HOSTS = {
+    "hooks.slack.com": ChatPlatform.SLACK.value,
+    "chat.googleapis.com": ChatPlatform.GOOGLE_CHAT.value,
+}
+TEAMS_HOST_SUFFIXES = (".webhook.office.com", ".logic.azure.com")
+
+
+class ChatTarget(NamedTuple):
+    url: str
+    platform: Optional[str]
+
+
+class ChatPostError(Exception):
+    def __init__(self, message: str, retryable: bool):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+class TokenBucket:
+    """
+    Allows ``rate`` requests per second on average with bursts of up to
+    ``capacity``. ``acquire`` waits until a token is available.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        # Waiters are served in order: the lock is held while sleeping for a token
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+    def pause(self, seconds: float) -> None:
+        """Spend the tokens of the next ``seconds`` (e.g. after a 429 with Retry-After)"""
+        self._refill()
+        self._tokens = min(self._tokens, 0) - seconds * self.rate
+
+
+def detect_platform(url: str) -> Optional[str]:
+    host = (urlsplit(url).hostname or "").lower()
+    if host in PLATFORM_HOSTS:
+        return PLATFORM_HOSTS[host]
+    if host.endswith(TEAMS_HOST_SUFFIXES):
+        return ChatPlatform.MICROSOFT_TEAMS.value
+    return None
+
+
+def format_payload(platform: Optional[str], title: str, text: str) -> Dict[str, Any]:
+    """Webhook body for a platform; unknown platforms get Slack-style ``text``"""
+    if len(text) > settings.CHAT_MESSAGE_MAX_CHARS:
+        text = text[:settings.CHAT_MESSAGE_MAX_CHARS - 1].rstrip() + "…"
+    if platform == ChatPlatform.MICROSOFT_TEAMS.value:
+        return {
+            "@type": "MessageCard",
+            "@context": "https://schema.org/extensions",
+            "summary": title,
+            "title": title,
+            "text": text,
+        }
+    return {"text": f"*{title}*\n{text}"}
+
+
+class ChatDispatcher:
+    """
+    Posts to chat webhooks over one keep-alive client per webhook host, so
+    every message to the same Slack/Google Chat/Teams host reuses pooled
+    connections (HTTP/2 when CHAT_WEBHOOK_HTTP2 is on and h2 is installed).
+    Each webhook URL has its own token bucket; a 429 drains it for the
+    Retry-After period.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float = settings.CHAT_WEBHOOK_RATE_PER_SECOND,
+        burst: int = settings.CHAT_WEBHOOK_BURST,
+        timeout: float = settings.CHAT_WEBHOOK_TIMEOUT_SECONDS,
+        http2: bool = settings.CHAT_WEBHOOK_HTTP2,
+        max_connections_per_host: int = settings.CHAT_WEBHOOK_MAX_CONNECTIONS_PER_HOST
+    ):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.timeout = timeout
+        self.http2 = http2
+        self.max_connections_per_host = max_connections_per_host
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    def client_for(self, url: str) -> httpx.AsyncClient:
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}".lower()
+        client = self._clients.get(origin)
+        if client is None:
+            client = self._clients[origin] = httpx.AsyncClient(
+                http2=self.http2,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections_per_host,
+                    max_keepalive_connections=self.max_connections_per_host,
+                ),
+            )
+        return client
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        bucket = self._buckets.get(url)
+        if bucket is None:
+            bucket = self._buckets[url] = TokenBucket(self.rate_per_second, self.burst)
+        return bucket
+
+    async def post(self, target: ChatTarget, title: str, text: str) -> None:
+        """Post one message; raises ChatPostError, retryable for 429, 5xx and network errors"""
+        bucket = self.bucket_for(target.url)
+        await bucket.acquire()
+        payload = format_payload(target.platform or detect_platform(target.url), title, text)
+        try:
+            response = await self.client_for(target.url).post(target.url, json=payload)
+        except httpx.HTTPError as e:
+            raise ChatPostError(str(e) or e.__class__.__name__, retryable=True) from e
+
+        if response.status_code == 429:
+            retry_after = response.headers.get("Retry-After", "")
+            bucket.pause(float(retry_after) if retry_after.isdigit() else 1.0)
+            raise ChatPostError("Webhook rate limited (429)", retryable=True)
+        if response.status_code >= 500:
+            raise ChatPostError(f"Webhook returned {response.status_code}", retryable=True)
+        if response.status_code >= 400:
+            raise ChatPostError(f"Webhook returned {response.status_code}", retryable=False)
+
+    async def close(self) -> None:
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            await client.aclose()
+
+
+def resolve_targets(db: Session, ceremony: Ceremony) -> List[ChatTarget]:
+    """
+    Where a ceremony's chat messages go: its own chat_webhook_url, or else
+    every active integration of the team's company that has a webhook and
+    either lists the team in ``config["team_ids"]`` or has no team filter.
+    """
+    integrations = db.query(ChatIntegration).join(
+        Team, Team.company_id == ChatIntegration.company_id
+    ).filter(
+        Team.id == ceremony.team_id,
+        ChatIntegration.is_active == True,
+        ChatIntegration.webhook_url.isnot(None)
+    ).order_by(ChatIntegration.id).all()
+
+    if ceremony.chat_webhook_url:
+        platform = next(
+            (integration.platform for integration in integrations
+             if urlsplit(integration.webhook_url).netloc == urlsplit(ceremony.chat_webhook_url).netloc),
+            None
+        )
+        return [ChatTarget(ceremony.chat_webhook_url, platform)]
+
+    targets = []
+    for integration in integrations:
+        team_ids = (integration.config or {}).get("team_ids")
+        if team_ids is None or ceremony.team_id in team_ids:
+            targets.append(ChatTarget(integration.webhook_url, integration.platform))
+    return targets
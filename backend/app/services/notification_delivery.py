@@ -0,0 +1,255 @@
+import asyncio
+import logging
+import random
+import uuid
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.notification import Notification, NotificationChannel, NotificationStatus
+from app.models.user import User
+from app.services.notification_senders import (
+    DeliveryError,
+    InAppSender,
+    OutgoingNotification,
+    PermanentDeliveryError,
+    SmtpEmailSender,
+    WebhookChatSender,
+)
+
+logger = logging.getLogger(__name__)
+
+_notifications = Notification.__table__
+
+# Written back in one executemany per batch; only rows still holding our lease are touched
+_finish_statement = update(_notifications).where(
+    _notifications.c.id == bindparam("b_id"),
+    _notifications.c.lease_id == bindparam("b_lease_id"),
+).values(
+    status=bindparam("b_status"),
+    sent_at=bindparam("b_sent_at"),
+    scheduled_for=bindparam("b_scheduled_for"),
+    last_error=bindparam("b_last_error"),
+    lease_id=None,
+    locked_until=None,
+)
+
+
+def utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff with jitter: base * 2^(attempts-1), capped"""
+    delay = min(
+        settings.NOTIFICATION_RETRY_BASE_SECONDS * (2 ** max(0, attempts - 1)),
+        settings.NOTIFICATION_RETRY_MAX_SECONDS,
+    )
+    return timedelta(seconds=delay * random.uniform(0.5, 1.0))
+
+
+def claim_batch(
+    db: Session, channels: List[str], limit: int, lease_seconds: int
+) -> Tuple[str, List[OutgoingNotification]]:
+    """
+    Lease up to ``limit`` due notifications. Returns the lease id and the
+    leased notifications with their recipient.
+
+    The lease is committed before returning, so no transaction stays open
+    while the notifications are sent. On PostgreSQL concurrent workers skip
+    each other's rows with FOR UPDATE SKIP LOCKED; on SQLite the UPDATE
+    itself is atomic. Rows whose lease expired (a crashed worker) are
+    claimed again.
+    """
+    now = utc_now()
+    lease_id = uuid.uuid4().hex
+
+    candidates = select(Notification.id).where(
+        Notification.status == NotificationStatus.PENDING.value,
+        Notification.channel.in_(channels),
+        or_(Notification.scheduled_for.is_(None), Notification.scheduled_for <= now),
+        or_(Notification.locked_until.is_(None), Notification.locked_until < now),
+    ).order_by(Notification.scheduled_for, Notification.id).limit(limit)
+    if db.get_bind().dialect.name != "sqlite":
+        candidates = candidates.with_for_update(skip_locked=True)
+
+    db.execute(
+        update(Notification)
+        .where(Notification.id.in_(candidates.scalar_subquery()))
+        .values(
+            lease_id=lease_id,
+            locked_until=now + timedelta(seconds=lease_seconds),
+            attempts=Notification.attempts + 1,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    rows = db.execute(
+        select(
+            Notification.id, Notification.user_id, Notification.channel, Notification.type,
+            Notification.title, Notification.message, Notification.additional_data,
+            Notification.attempts, User.email, User.full_name,
+        )
+        .join(User, User.id == Notification.user_id)
+        .where(Notification.lease_id == lease_id)
+    )
+    return lease_id, [OutgoingNotification(*row) for row in rows]
+
+
+def finish_batch(db: Session, results: List[Dict[str, Any]]) -> None:
+    if results:
+        db.execute(_finish_statement, results)
+        db.commit()
+
+
+def extend_lease(db: Session, lease_id: str, lease_seconds: int) -> int:
+    """Push back the expiry of the rows a lease still holds. Returns how many it holds."""
+    extended = db.execute(
+        update(Notification)
+        .where(Notification.lease_id == lease_id)
+        .values(locked_until=utc_now() + timedelta(seconds=lease_seconds))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return extended
+
+
+class NotificationWorker:
+    """
+    Claims pending notifications in leased batches and delivers them.
+
+    Each channel has its own sender, concurrency limit and claim loop, so a
+    slow SMTP server does not hold up chat or in-app deliveries. A channel
+    claims its next batch once the previous one is done, which bounds the
+    work in flight to one batch per channel. While a batch is in flight,
+    finished deliveries are written back and the lease on the rest is
+    renewed every third of NOTIFICATION_LEASE_SECONDS, so another worker
+    only reclaims the rows of a worker that stopped. Failed deliveries are
+    retried with exponential backoff until NOTIFICATION_MAX_ATTEMPTS, then
+    marked failed.
+    """
+
+    def __init__(
+        self,
+        senders: Optional[Dict[str, Any]] = None,
+        concurrency: Optional[Dict[str, int]] = None,
+        batch_size: int = settings.NOTIFICATION_BATCH_SIZE,
+        lease_seconds: int = settings.NOTIFICATION_LEASE_SECONDS,
+        max_attempts: int = settings.NOTIFICATION_MAX_ATTEMPTS,
+        poll_seconds: float = settings.NOTIFICATION_POLL_SECONDS,
+        session_factory=SessionLocal
+    ):
+        self.senders = senders if senders is not None else {
+            NotificationChannel.EMAIL.value: SmtpEmailSender(),
+            NotificationChannel.CHAT.value: WebhookChatSender(),
+            NotificationChannel.IN_APP.value: InAppSender(),
+        }
+        concurrency = concurrency or {
+            NotificationChannel.EMAIL.value: settings.NOTIFICATION_EMAIL_CONCURRENCY,
+            NotificationChannel.CHAT.value: settings.NOTIFICATION_CHAT_CONCURRENCY,
+        }
+        self._limits = {
+            channel: asyncio.Semaphore(concurrency.get(channel, settings.NOTIFICATION_DEFAULT_CONCURRENCY))
+            for channel in self.senders
+        }
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.poll_seconds = poll_seconds
+        self.session_factory = session_factory
+
+    def _with_session(self, method, *args):
+        db = self.session_factory()
+        try:
+            return method(db, *args)
+        finally:
+            db.close()
+
+    async def _deliver(self, notification: OutgoingNotification) -> Dict[str, Any]:
+        result = {
+            "b_id": notification.id,
+            "b_status": NotificationStatus.SENT.value,
+            "b_sent_at": None,
+            "b_scheduled_for": None,
+            "b_last_error": None,
+        }
+        try:
+            async with self._limits[notification.channel]:
+                await self.senders[notification.channel].send(notification)
+            result["b_sent_at"] = utc_now()
+        except PermanentDeliveryError as e:
+            result.update(b_status=NotificationStatus.FAILED.value, b_last_error=str(e))
+        except Exception as e:
+            error = str(e) if isinstance(e, DeliveryError) else f"{e.__class__.__name__}: {e}"
+            if notification.attempts >= self.max_attempts:
+                result.update(b_status=NotificationStatus.FAILED.value, b_last_error=error)
+            else:
+                result.update(
+                    b_status=NotificationStatus.PENDING.value,
+                    b_scheduled_for=utc_now() + retry_delay(notification.attempts),
+                    b_last_error=error,
+                )
+        return result
+
+    async def run_once(self, channels: Optional[List[str]] = None) -> int:
+        """
+        Claim and deliver one batch of ``channels`` (default: all). Returns
+        the number of notifications handled.
+        """
+        lease_id, batch = await asyncio.to_thread(
+            self._with_session, claim_batch, channels or list(self.senders), self.batch_size, self.lease_seconds
+        )
+        if not batch:
+            return 0
+
+        outcome = defaultdict(int)
+        pending = {asyncio.ensure_future(self._deliver(notification)) for notification in batch}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, timeout=self.lease_seconds / 3)
+                results = [task.result() for task in done]
+                for result in results:
+                    result["b_lease_id"] = lease_id
+                    outcome[result["b_status"]] += 1
+                await asyncio.to_thread(self._with_session, finish_batch, results)
+                if pending:
+                    await asyncio.to_thread(self._with_session, extend_lease, lease_id, self.lease_seconds)
+        finally:
+            for task in pending:
+                task.cancel()
+
+        logger.info("Delivered notification batch: %s", dict(outcome))
+        return len(batch)
+
+    async def _run_channel(self, channel: str, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            try:
+                handled = await self.run_once([channel])
+            except Exception:
+                logger.exception("Notification delivery batch failed (%s)", channel)
+                handled = 0
+            if handled < self.batch_size:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """
+        Deliver until ``stop`` is set, one claim loop per channel; full
+        batches are followed immediately by the next
+        """
+        stop = stop or asyncio.Event()
+        try:
+            await asyncio.gather(*(self._run_channel(channel, stop) for channel in self.senders))
+        finally:
+            await self.close()
+
+    async def close(self) -> None:
+        for sender in self.senders.values():
+            await sender.close()
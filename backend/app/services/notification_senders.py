@@ -0,0 +1,290 @@
+import asyncio
+import logging
+import smtplib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email.message import EmailMessage
+from typing import Any, Dict, List, NamedTuple, Optional
+from jinja2 import TemplateError
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.notification import NotificationChannel
+from app.services.chat_dispatch import ChatDispatcher, ChatPostError, ChatTarget
+from app.services.notification_templates import (
+    CompiledTemplate,
+    RenderedNotification,
+    TemplateRegistry,
+    TemplateValidationError,
+    render_notification,
+    template_registry,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class DeliveryError(Exception):
+    """A delivery attempt failed and may be retried"""
+
+
+class PermanentDeliveryError(DeliveryError):
+    """A delivery can never succeed (bad address, missing webhook, ...)"""
+
+
+class OutgoingNotification(NamedTuple):
+    id: int
+    user_id: int
+    channel: str
+    type: str
+    title: str
+    message: str
+    additional_data: Optional[Dict[str, Any]]
+    attempts: int
+    email: str
+    full_name: str
+
+
+class InAppSender:
+    """In-app notifications are read from the database; delivering only marks them sent"""
+
+    async def send(self, notification: OutgoingNotification) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+
+class SmtpConnectionPool:
+    """
+    A fixed number of persistent, authenticated SMTP connections.
+
+    Each connection is opened (and TLS/login negotiated) on first use and
+    then reused for many messages, so a burst of reminders costs a handful
+    of handshakes instead of one per email. smtplib is blocking, so
+    connections are driven from a dedicated thread pool sized to the
+    connection count. Connections idle for a while are checked with NOOP
+    before reuse, and recycled after ``max_messages`` to stay under server
+    per-connection limits.
+    """
+
+    def __init__(
+        self,
+        host: str = settings.SMTP_HOST,
+        port: int = settings.SMTP_PORT,
+        username: str = settings.SMTP_USER,
+        password: str = settings.SMTP_PASSWORD,
+        use_tls: bool = settings.SMTP_TLS,
+        size: int = settings.SMTP_POOL_SIZE,
+        max_messages: int = settings.SMTP_POOL_MAX_MESSAGES,
+        idle_check_seconds: float = settings.SMTP_POOL_IDLE_CHECK_SECONDS,
+        timeout: float = settings.SMTP_TIMEOUT_SECONDS
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.size = size
+        self.max_messages = max_messages
+        self.idle_check_seconds = idle_check_seconds
+        self.timeout = timeout
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="smtp")
+        self._slots: Optional[asyncio.Queue] = None
+        self._connections: List[_PooledConnection] = []
+
+    def _get_slots(self) -> asyncio.Queue:
+        # Created lazily so the queue belongs to the loop that sends
+        if self._slots is None:
+            self._slots = asyncio.Queue()
+            for _ in range(self.size):
+                connection = _PooledConnection()
+                self._connections.append(connection)
+                self._slots.put_nowait(connection)
+        return self._slots
+
+    def _connect(self, connection: "_PooledConnection") -> None:
+        connection.close()
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+        except Exception:
+            smtp.close()
+            raise
+        connection.smtp = smtp
+        connection.sent = 0
+
+    def _is_usable(self, connection: "_PooledConnection") -> bool:
+        if connection.smtp is None or connection.sent >= self.max_messages:
+            return False
+        if time.monotonic() - connection.last_used < self.idle_check_seconds:
+            return True
+        try:
+            return connection.smtp.noop()[0] == 250
+        except (smtplib.SMTPException, OSError):
+            return False
+
+    def _send_sync(self, connection: "_PooledConnection", message: EmailMessage) -> None:
+        if not self._is_usable(connection):
+            self._connect(connection)
+        try:
+            connection.smtp.send_message(message)
+        except smtplib.SMTPServerDisconnected:
+            # The server dropped a connection we believed healthy; retry once on a fresh one
+            self._connect(connection)
+            connection.smtp.send_message(message)
+        except smtplib.SMTPRecipientsRefused:
+            raise
+        except (smtplib.SMTPException, OSError):
+            connection.close()
+            raise
+        connection.sent += 1
+        connection.last_used = time.monotonic()
+
+    async def send_message(self, message: EmailMessage) -> None:
+        slots = self._get_slots()
+        connection = await slots.get()
+        try:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(self._executor, self._send_sync, connection, message)
+        finally:
+            slots.put_nowait(connection)
+
+    async def close(self) -> None:
+        loop = asyncio.get_running_loop()
+        for connection in self._connections:
+            await loop.run_in_executor(self._executor, connection.quit)
+        self._connections = []
+        self._slots = None
+        self._executor.shutdown(wait=False)
+
+
+class _PooledConnection:
+    def __init__(self):
+        self.smtp: Optional[smtplib.SMTP] = None
+        self.sent = 0
+        self.last_used = 0.0
+
+    def close(self) -> None:
+        if self.smtp is not None:
+            self.smtp.close()
+            self.smtp = None
+
+    def quit(self) -> None:
+        if self.smtp is not None:
+            try:
+                self.smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self.close()
+
+
+class SmtpEmailSender:
+    """
+    Send email notifications over a shared SMTP connection pool.
+
+    Notifications rendered when they were created (reminders carry their
+    ``template_id``) are sent as stored. Others are rendered from the active
+    email NotificationTemplate for their type, if there is one; the template
+    registry is refreshed every NOTIFICATION_TEMPLATE_CACHE_SECONDS.
+    """
+
+    def __init__(
+        self,
+        pool: Optional[SmtpConnectionPool] = None,
+        from_email: str = settings.EMAILS_FROM_EMAIL,
+        from_name: str = settings.EMAILS_FROM_NAME,
+        templates: TemplateRegistry = template_registry,
+        session_factory=SessionLocal
+    ):
+        self.pool = pool or SmtpConnectionPool()
+        self.from_email = from_email
+        self.from_name = from_name
+        self.templates = templates
+        self.session_factory = session_factory
+        self._templates_refreshed_at: Optional[float] = None
+        self._templates_lock = asyncio.Lock()
+
+    def _refresh_templates(self) -> None:
+        db = self.session_factory()
+        try:
+            for template_id, error in self.templates.refresh(db).items():
+                logger.warning("Notification template %s is invalid: %s", template_id, error)
+        finally:
+            db.close()
+
+    def _templates_stale(self) -> bool:
+        return (
+            self._templates_refreshed_at is None
+            or time.monotonic() - self._templates_refreshed_at >= settings.NOTIFICATION_TEMPLATE_CACHE_SECONDS
+        )
+
+    async def _get_template(self, notification_type: str) -> Optional[CompiledTemplate]:
+        if self._templates_stale():
+            # One refresh per expiry, however many sends are waiting on it
+            async with self._templates_lock:
+                if self._templates_stale():
+                    await asyncio.to_thread(self._refresh_templates)
+                    self._templates_refreshed_at = time.monotonic()
+        return self.templates.get(notification_type, NotificationChannel.EMAIL.value)
+
+    def build_message(self, notification: OutgoingNotification, subject: str, body: str) -> EmailMessage:
+        message = EmailMessage()
+        message["From"] = f"{self.from_name} <{self.from_email}>" if self.from_email else self.from_name
+        message["To"] = notification.email
+        message["Subject"] = subject
+        message.set_content(body)
+        return message
+
+    async def render(self, notification: OutgoingNotification) -> RenderedNotification:
+        if "template_id" not in (notification.additional_data or {}):
+            template = await self._get_template(notification.type)
+            if template is not None:
+                return render_notification(template, notification)
+        return RenderedNotification(notification.title, notification.message)
+
+    async def send(self, notification: OutgoingNotification) -> None:
+        if not notification.email:
+            raise PermanentDeliveryError("User has no email address")
+        try:
+            message = self.build_message(notification, *await self.render(notification))
+        except (TemplateError, TemplateValidationError) as e:
+            raise PermanentDeliveryError(f"Template error: {e}") from e
+        try:
+            await self.pool.send_message(message)
+        except smtplib.SMTPRecipientsRefused as e:
+            raise PermanentDeliveryError(f"Recipient refused: {e.recipients}") from e
+        except (smtplib.SMTPException, OSError) as e:
+            raise DeliveryError(str(e) or e.__class__.__name__) from e
+
+    async def close(self) -> None:
+        await self.pool.close()
+
+
+class WebhookChatSender:
+    """
+    Post chat notifications through a ChatDispatcher to
+    ``additional_data["webhook_url"]``. A notification has a single target,
+    so retrying it never reposts to a webhook that already has the message.
+    """
+
+    def __init__(self, dispatcher: Optional[ChatDispatcher] = None):
+        self.dispatcher = dispatcher or ChatDispatcher()
+
+    async def send(self, notification: OutgoingNotification) -> None:
+        data = notification.additional_data or {}
+        if not data.get("webhook_url"):
+            raise PermanentDeliveryError("Chat notification has no webhook")
+
+        target = ChatTarget(data["webhook_url"], data.get("platform"))
+        try:
+            await self.dispatcher.post(target, notification.title, notification.message)
+        except ChatPostError as e:
+            if e.retryable:
+                raise DeliveryError(str(e)) from e
+            raise PermanentDeliveryError(str(e)) from e
+
+    async def close(self) -> None:
+        await self.dispatcher.close()
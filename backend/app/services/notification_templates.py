@@ -0,0 +1,210 @@
+import threading
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+from jinja2 import Environment, Template, TemplateSyntaxError, meta
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.notification import NotificationTemplate
+
+# Notifications are plain text; templates are authored by admins, not users
+template_environment = Environment(autoescape=False, keep_trailing_newline=True)
+
+# Names every template may use without declaring them in ``variables``
+BUILTIN_VARIABLES = frozenset({"user", "title", "message"})
+# The per-recipient part of the context; everything else is shared by a batch
+RECIPIENT_VARIABLE = "user"
+
+
+class TemplateValidationError(ValueError):
+    """A template does not compile or uses variables it does not declare"""
+
+
+@lru_cache(maxsize=512)
+def compile_template(source: str) -> Template:
+    """Compile a template once; later renders with the same source reuse it"""
+    return template_environment.from_string(source)
+
+
+def _declared_variables(variables: Any) -> FrozenSet[str]:
+    """``variables`` is a JSON list of names or of {"name": ...} objects"""
+    names = set()
+    for variable in variables or []:
+        name = variable.get("name") if isinstance(variable, dict) else variable
+        if not isinstance(name, str) or not name.isidentifier():
+            raise TemplateValidationError(f"Invalid variable declaration: {variable!r}")
+        names.add(name)
+    return frozenset(names)
+
+
+class TemplatePart(NamedTuple):
+    template: Template
+    per_recipient: bool  # False: renders the same for everyone in a batch
+
+
+class CompiledTemplate(NamedTuple):
+    id: int
+    name: str
+    type: str
+    channel: str
+    version: Optional[datetime]  # updated_at (or created_at) the template was compiled from
+    variables: FrozenSet[str]
+    subject: TemplatePart
+    body: TemplatePart
+
+
+class RenderedNotification(NamedTuple):
+    subject: str
+    body: str
+
+
+def _compile_part(name: str, source: str, allowed: FrozenSet[str]) -> TemplatePart:
+    try:
+        used = meta.find_undeclared_variables(template_environment.parse(source))
+    except TemplateSyntaxError as e:
+        raise TemplateValidationError(f"{name}: line {e.lineno}: {e.message}") from e
+    undeclared = used - allowed
+    if undeclared:
+        raise TemplateValidationError(f"{name} uses undeclared variables: {', '.join(sorted(undeclared))}")
+    return TemplatePart(compile_template(source), RECIPIENT_VARIABLE in used)
+
+
+def compile_notification_template(template: NotificationTemplate) -> CompiledTemplate:
+    """
+    Compile and validate a NotificationTemplate. Every variable its subject
+    (or title) and message use must be declared in ``variables`` or be one
+    of BUILTIN_VARIABLES.
+    """
+    variables = _declared_variables(template.variables)
+    allowed = variables | BUILTIN_VARIABLES
+    return CompiledTemplate(
+        id=template.id,
+        name=template.name,
+        type=template.type,
+        channel=template.channel,
+        version=template.updated_at or template.created_at,
+        variables=variables,
+        subject=_compile_part("subject", template.subject or template.title, allowed),
+        body=_compile_part("message_template", template.message_template, allowed),
+    )
+
+
+def check_context(template: CompiledTemplate, context: Mapping[str, Any]) -> None:
+    """Fail before rendering anything when the context lacks a declared variable"""
+    missing = template.variables - context.keys()
+    if missing:
+        raise TemplateValidationError(
+            f"Template '{template.name}' is missing variables: {', '.join(sorted(missing))}"
+        )
+
+
+def render_batch(
+    template: CompiledTemplate,
+    shared_context: Mapping[str, Any],
+    recipients: Iterable[Mapping[str, Any]]
+) -> List[RenderedNotification]:
+    """
+    Render a template for many recipients of the same event.
+
+    ``shared_context`` is validated once. Parts that do not reference
+    ``user`` are rendered once for the whole batch; the others are rendered
+    per recipient with only ``user`` swapped in.
+    """
+    check_context(template, shared_context)
+    context = dict(shared_context)
+    shared = {
+        part_name: part.template.render(context)
+        for part_name, part in (("subject", template.subject), ("body", template.body))
+        if not part.per_recipient
+    }
+    if len(shared) == 2:
+        rendered = RenderedNotification(shared["subject"], shared["body"])
+        return [rendered for _ in recipients]
+
+    results = []
+    for recipient in recipients:
+        context[RECIPIENT_VARIABLE] = recipient
+        results.append(RenderedNotification(
+            shared["subject"] if "subject" in shared else template.subject.template.render(context),
+            shared["body"] if "body" in shared else template.body.template.render(context),
+        ))
+    return results
+
+
+def render_notification(template: CompiledTemplate, notification: Any) -> RenderedNotification:
+    """
+    Render a template for one stored notification. The context is the
+    notification's additional_data plus ``user``, ``title`` and ``message``.
+    """
+    context = dict(notification.additional_data or {})
+    context.update(title=notification.title, message=notification.message)
+    recipient = {"id": notification.user_id, "email": notification.email, "full_name": notification.full_name}
+    return render_batch(template, context, [recipient])[0]
+
+
+class TemplateRegistry:
+    """
+    Compiled active templates, keyed by (type, channel).
+
+    ``refresh`` only reads ids and timestamps; a template is recompiled
+    when its updated_at changes, and dropped when it is deleted or
+    deactivated. Templates that fail validation are skipped (and reported)
+    until they are edited, so one bad template does not stop other
+    notifications.
+    """
+
+    def __init__(self):
+        self._compiled: Dict[int, CompiledTemplate] = {}
+        self._failed: Dict[int, Tuple[Optional[datetime], str]] = {}
+        self._by_kind: Dict[Tuple[str, str], CompiledTemplate] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def errors(self) -> Dict[int, str]:
+        return {template_id: error for template_id, (_, error) in self._failed.items()}
+
+    def refresh(self, db: Session) -> Dict[int, str]:
+        """Bring the cache in line with the table. Returns validation errors by template id."""
+        versions = dict(db.execute(
+            select(NotificationTemplate.id, func.coalesce(NotificationTemplate.updated_at, NotificationTemplate.created_at))
+            .where(NotificationTemplate.is_active == True)
+        ).all())
+
+        with self._lock:
+            compiled = {
+                template_id: template
+                for template_id, template in self._compiled.items()
+                if versions.get(template_id, False) == template.version
+            }
+            failed = {
+                template_id: failure
+                for template_id, failure in self._failed.items()
+                if versions.get(template_id, False) == failure[0]
+            }
+
+        stale = [template_id for template_id in versions if template_id not in compiled and template_id not in failed]
+        if stale:
+            for template in db.query(NotificationTemplate).filter(NotificationTemplate.id.in_(stale)):
+                try:
+                    compiled[template.id] = compile_notification_template(template)
+                except TemplateValidationError as e:
+                    failed[template.id] = (versions[template.id], str(e))
+
+        by_kind = {}
+        for template in sorted(compiled.values(), key=lambda template: template.id):
+            by_kind.setdefault((template.type, template.channel), template)
+
+        with self._lock:
+            self._compiled, self._failed, self._by_kind = compiled, failed, by_kind
+        return self.errors
+
+    def get(self, notification_type: str, channel: str) -> Optional[CompiledTemplate]:
+        return self._by_kind.get((notification_type, channel))
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._compiled, self._failed, self._by_kind = {}, {}, {}
+
+
+template_registry = TemplateRegistry()
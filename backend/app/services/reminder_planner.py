@@ -0,0 +1,302 @@
+import asyncio
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from jinja2 import TemplateError
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import SessionLocal, conflict_insert
+from app.models.ceremony import Ceremony
+from app.models.notification import Notification, NotificationChannel, NotificationStatus, NotificationType
+from app.models.team import TeamMember
+from app.models.user import User
+from app.models.work_schedule import WorkSchedule
+from app.services.ceremony_recurrence import WEEKDAY_NAMES, Occurrence, get_zone
+from app.services.ceremony_scheduler import is_schedulable
+from app.services.notification_templates import (
+    CompiledTemplate,
+    RenderedNotification,
+    TemplateValidationError,
+    render_batch,
+    template_registry,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class DeliveryProfile(NamedTuple):
+    """
+    The inputs that decide when a member is reminded. Members sharing a
+    profile (same timezone and schedule) share a delivery instant, so it is
+    computed once per profile rather than once per member.
+    """
+    timezone: str
+    work_days: Optional[Tuple[int, ...]]  # None: every day
+    work_start: Optional[time]
+    notification_time: Optional[time]
+    break_times: Tuple[Tuple[time, time], ...]
+
+
+class ReminderPlan(NamedTuple):
+    occurrence: Occurrence
+    buckets: Dict[datetime, List[int]]  # delivery minute (UTC) -> user ids
+    skipped_user_ids: List[int]  # not working on the occurrence's day
+
+
+def _parse_time(value: Any) -> Optional[time]:
+    if value is None or isinstance(value, time):
+        return value
+    return time.fromisoformat(value)
+
+
+def _parse_breaks(break_times: Any) -> Tuple[Tuple[time, time], ...]:
+    """Accept [{"start": "12:00", "end": "13:00"}, ...] or [["12:00", "13:00"], ...]"""
+    breaks = []
+    for entry in break_times or []:
+        start, end = (entry.get("start"), entry.get("end")) if isinstance(entry, dict) else entry
+        breaks.append((_parse_time(start), _parse_time(end)))
+    return tuple(sorted(breaks))
+
+
+def build_profile(user_timezone: Optional[str], schedule: Optional[WorkSchedule]) -> DeliveryProfile:
+    """
+    Members with an active work schedule are reminded within it; everyone
+    else is reminded no earlier than DEFAULT_WORK_START_HOUR in their own
+    timezone.
+    """
+    if schedule is None or not schedule.is_active:
+        return DeliveryProfile(
+            timezone=get_zone(user_timezone).key,
+            work_days=None,
+            work_start=time(settings.DEFAULT_WORK_START_HOUR),
+            notification_time=None,
+            break_times=(),
+        )
+
+    work_days = tuple(sorted(
+        WEEKDAY_NAMES.index(day.lower()) for day in schedule.work_days or [] if day.lower() in WEEKDAY_NAMES
+    ))
+    return DeliveryProfile(
+        timezone=get_zone(schedule.timezone or user_timezone).key,
+        work_days=work_days,
+        work_start=schedule.start_time if schedule.use_work_hours else None,
+        notification_time=None if schedule.use_work_hours else schedule.notification_time,
+        break_times=_parse_breaks(schedule.break_times),
+    )
+
+
+def delivery_instant(profile: DeliveryProfile, occurrence: Occurrence) -> Optional[datetime]:
+    """
+    When a member with this profile should get the reminder (UTC, floored to
+    the minute), or None when the occurrence falls on one of their days off.
+
+    Never earlier than the ceremony's own reminder time; pushed to the start
+    of work or the preferred notification time, and out of breaks.
+    """
+    zone = get_zone(profile.timezone)
+    local_fire = occurrence.fire_at.astimezone(zone)
+    local_day: date = occurrence.occurs_at.astimezone(zone).date()
+
+    if profile.work_days is not None and local_day.weekday() not in profile.work_days:
+        return None
+
+    deliver_at = local_fire
+    preferred = profile.notification_time or profile.work_start
+    if preferred is not None:
+        deliver_at = max(deliver_at, datetime.combine(local_day, preferred, tzinfo=zone))
+
+    for break_start, break_end in profile.break_times:
+        local_time = deliver_at.timetz().replace(tzinfo=None)
+        if break_start <= local_time < break_end:
+            deliver_at = datetime.combine(deliver_at.date(), break_end, tzinfo=zone)
+
+    return deliver_at.astimezone(timezone.utc).replace(second=0, microsecond=0)
+
+
+def plan_occurrence(occurrence: Occurrence, members: Iterable[Tuple[int, DeliveryProfile]]) -> ReminderPlan:
+    """Bucket members by delivery minute, resolving each distinct profile once"""
+    instants: Dict[DeliveryProfile, Optional[datetime]] = {}
+    buckets: Dict[datetime, List[int]] = defaultdict(list)
+    skipped = []
+
+    for user_id, profile in members:
+        if profile not in instants:
+            instants[profile] = delivery_instant(profile, occurrence)
+        deliver_at = instants[profile]
+        if deliver_at is None:
+            skipped.append(user_id)
+        else:
+            buckets[deliver_at].append(user_id)
+
+    return ReminderPlan(occurrence, dict(sorted(buckets.items())), skipped)
+
+
+def load_team_profiles(db: Session, team_ids: Iterable[int]) -> Dict[int, List[Tuple[int, DeliveryProfile]]]:
+    """Active members of the given teams with their delivery profiles, in one query"""
+    rows = db.execute(
+        select(TeamMember.team_id, User.id, User.timezone, WorkSchedule)
+        .join(User, User.id == TeamMember.user_id)
+        .outerjoin(WorkSchedule, WorkSchedule.user_id == User.id)
+        .where(TeamMember.team_id.in_(set(team_ids)), TeamMember.is_active == True, User.is_active == True)
+    )
+
+    profiles: Dict[tuple, DeliveryProfile] = {}
+    members: Dict[int, List[Tuple[int, DeliveryProfile]]] = defaultdict(list)
+    for team_id, user_id, user_timezone, schedule in rows:
+        key = (user_timezone, schedule.id if schedule is not None else None)
+        if key not in profiles:
+            profiles[key] = build_profile(user_timezone, schedule)
+        members[team_id].append((user_id, profiles[key]))
+    return members
+
+
+def load_recipients(db: Session, user_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+    """The ``user`` fields reminder templates can use, by user id"""
+    rows = db.execute(select(User.id, User.email, User.full_name, User.timezone).where(User.id.in_(set(user_ids))))
+    return {
+        user_id: {"id": user_id, "email": email, "full_name": full_name, "timezone": get_zone(user_timezone).key}
+        for user_id, email, full_name, user_timezone in rows
+    }
+
+
+def reminder_context(ceremony: Ceremony, occurrence: Occurrence) -> Dict[str, Any]:
+    """What every recipient of one occurrence's reminder shares"""
+    local_start = occurrence.occurs_at.astimezone(get_zone(ceremony.timezone))
+    return {
+        "ceremony": {"id": ceremony.id, "name": ceremony.name, "description": ceremony.description},
+        "ceremony_id": ceremony.id,
+        "team_id": ceremony.team_id,
+        "occurs_at": occurrence.occurs_at.isoformat(),
+        "start_time": local_start.strftime("%H:%M"),
+        "timezone": local_start.tzname(),
+        "title": f"Reminder: {ceremony.name}",
+        "message": f"{ceremony.name} starts at {local_start.strftime('%H:%M')} ({local_start.tzname()}).",
+    }
+
+
+def _with_local_start(recipient: Dict[str, Any], occurs_at: datetime, local_starts: Dict[str, str]) -> Dict[str, Any]:
+    zone_name = recipient["timezone"]
+    if zone_name not in local_starts:
+        local_starts[zone_name] = occurs_at.astimezone(get_zone(zone_name)).strftime("%H:%M %Z")
+    return {**recipient, "local_start": local_starts[zone_name]}
+
+
+def reminder_rows(
+    ceremony: Ceremony,
+    plan: ReminderPlan,
+    template: Optional[CompiledTemplate] = None,
+    recipients: Optional[Dict[int, Dict[str, Any]]] = None
+) -> List[dict]:
+    """
+    Notification rows for a plan, ordered by delivery minute.
+
+    With a template, the whole occurrence is rendered as one batch: the
+    shared context is built and checked once, and only each member's own
+    ``user`` fields (including ``local_start`` in their timezone) vary.
+    """
+    context = reminder_context(ceremony, plan.occurrence)
+    additional_data = {
+        "ceremony_id": ceremony.id,
+        "team_id": ceremony.team_id,
+        "occurs_at": context["occurs_at"],
+    }
+
+    user_ids = [user_id for user_ids in plan.buckets.values() for user_id in user_ids]
+    delivery = [deliver_at for deliver_at, user_ids in plan.buckets.items() for _ in user_ids]
+    if template is not None:
+        additional_data["template_id"] = template.id
+        local_starts: Dict[str, str] = {}
+        rendered = render_batch(template, context, (
+            _with_local_start(recipients[user_id], plan.occurrence.occurs_at, local_starts)
+            for user_id in user_ids
+        ))
+    else:
+        rendered = [RenderedNotification(context["title"], context["message"])] * len(user_ids)
+
+    return [
+        {
+            "user_id": user_id,
+            "type": NotificationType.CEREMONY_REMINDER.value,
+            "title": content.subject,
+            "message": content.body,
+            "channel": NotificationChannel.EMAIL.value,
+            "status": NotificationStatus.PENDING.value,
+            "scheduled_for": deliver_at,
+            "additional_data": additional_data,
+            "ceremony_id": ceremony.id,
+            "occurs_at": plan.occurrence.occurs_at,
+        }
+        for user_id, deliver_at, content in zip(user_ids, delivery, rendered)
+    ]
+
+
+def plan_reminders(db: Session, occurrences: List[Occurrence]) -> int:
+    """
+    Plan and store reminder notifications for due ceremony occurrences.
+
+    Ceremonies are re-read so ones deleted, paused or muted since they were
+    scheduled are skipped. Reminders are rendered here from the active
+    ceremony reminder email template, if any. Returns the number of
+    notifications created.
+
+    Every running scheduler plans every occurrence; the unique
+    (user, ceremony, occurrence) index makes the inserts after the first
+    no-ops, so each member is reminded once.
+    """
+    ceremony_ids = {occurrence.ceremony_id for occurrence in occurrences}
+    ceremonies = {
+        ceremony.id: ceremony
+        for ceremony in db.query(Ceremony).filter(Ceremony.id.in_(ceremony_ids))
+        if is_schedulable(ceremony) and ceremony.send_notifications
+    }
+    if not ceremonies:
+        return 0
+
+    for template_id, error in template_registry.refresh(db).items():
+        logger.warning("Notification template %s is invalid: %s", template_id, error)
+    template = template_registry.get(NotificationType.CEREMONY_REMINDER.value, NotificationChannel.EMAIL.value)
+
+    members = load_team_profiles(db, {ceremony.team_id for ceremony in ceremonies.values()})
+    recipients = None
+    if template is not None:
+        recipients = load_recipients(db, {user_id for team in members.values() for user_id, _ in team})
+
+    rows = []
+    for occurrence in occurrences:
+        ceremony = ceremonies.get(occurrence.ceremony_id)
+        if ceremony is None:
+            continue
+        plan = plan_occurrence(occurrence, members.get(ceremony.team_id, []))
+        try:
+            rows.extend(reminder_rows(ceremony, plan, template, recipients))
+        except (TemplateError, TemplateValidationError) as e:
+            # Fall back to the plain reminder rather than dropping it
+            logger.warning("Reminder template not used for ceremony %s: %s", ceremony.id, e)
+            rows.extend(reminder_rows(ceremony, plan))
+
+    created = 0
+    if rows:
+        result = db.execute(
+            conflict_insert(db, Notification).on_conflict_do_nothing().returning(Notification.id),
+            rows
+        )
+        created = len(result.all())
+    db.commit()
+    return created
+
+
+def _plan_with_session(occurrences: List[Occurrence]) -> int:
+    db = SessionLocal()
+    try:
+        return plan_reminders(db, occurrences)
+    finally:
+        db.close()
+
+
+async def dispatch_reminders(occurrences: List[Occurrence]) -> None:
+    """Scheduler dispatcher: turn due occurrences into pending notifications"""
+    created = await asyncio.to_thread(_plan_with_session, occurrences)
+    logger.info("Planned %s reminders for %s ceremony occurrences", created, len(occurrences))
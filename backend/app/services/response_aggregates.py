@@ -0,0 +1,238 @@
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set
+from sqlalchemy.orm import Session
+
+from app.core.database import conflict_insert
+from app.models.ceremony import Ceremony
+from app.models.response import CeremonyResponseAggregate
+from app.services.response_summary import (
+    SUMMARY_RESPONSE_STATUS,
+    compute_question_stats,
+    empty_question_stats,
+)
+
+AGGREGATE_FIELDS = (
+    "response_count",
+    "text_count",
+    "text_length_sum",
+    "numeric_count",
+    "numeric_sum",
+    "numeric_min",
+    "numeric_max",
+    "option_counts",
+)
+
+
+class AnswerSnapshot(NamedTuple):
+    """The parts of a QuestionResponse that feed the aggregates"""
+    question_id: int
+    text_response: Optional[str]
+    numeric_response: Optional[float]
+    selected_options: Optional[List[str]]
+
+
+def snapshot_answers(question_responses: Iterable[Any]) -> List[AnswerSnapshot]:
+    """Capture answer values before the rows are modified or deleted"""
+    return [
+        AnswerSnapshot(
+            question_id=qr.question_id,
+            text_response=qr.text_response,
+            numeric_response=qr.numeric_response,
+            selected_options=list(qr.selected_options) if qr.selected_options else None,
+        )
+        for qr in question_responses
+    ]
+
+
+def counted_answers(response_status: Optional[str], answers: List[AnswerSnapshot]) -> List[AnswerSnapshot]:
+    """
+    Return the answers only if a response in this status counts towards the summary.
+
+    Only completed responses count, and a response becomes completed only
+    through an update. Completed responses cannot be edited or deleted, so
+    that update is the one write that changes the aggregates. New responses
+    (single or bulk) are stored as submitted and do not touch them.
+    """
+    return answers if response_status == SUMMARY_RESPONSE_STATUS else []
+
+
+def _get_or_create_aggregate(db: Session, ceremony_id: int, question_id: int) -> CeremonyResponseAggregate:
+    """
+    Load an aggregate row for update, inserting a zeroed one first if needed.
+
+    The insert skips rows that already exist, so two first answers to a
+    question at once do not both try to create the row. It also takes
+    SQLite's write lock, and the SELECT ... FOR UPDATE then locks the row
+    on PostgreSQL until the transaction ends.
+    """
+    db.execute(
+        conflict_insert(db, CeremonyResponseAggregate)
+        .values(ceremony_id=ceremony_id, question_id=question_id, **empty_question_stats())
+        .on_conflict_do_nothing(index_elements=[
+            CeremonyResponseAggregate.ceremony_id, CeremonyResponseAggregate.question_id
+        ])
+    )
+    return db.query(CeremonyResponseAggregate).filter(
+        CeremonyResponseAggregate.ceremony_id == ceremony_id,
+        CeremonyResponseAggregate.question_id == question_id
+    ).with_for_update().populate_existing().one()
+
+
+def _assign_stats(aggregate: CeremonyResponseAggregate, stats: Dict[str, Any]) -> None:
+    for field in AGGREGATE_FIELDS:
+        value = stats[field]
+        setattr(aggregate, field, dict(value) if field == "option_counts" else value)
+
+
+def _aggregate_stats(aggregate: CeremonyResponseAggregate) -> Dict[str, Any]:
+    stats = {field: getattr(aggregate, field) for field in AGGREGATE_FIELDS}
+    stats["option_counts"] = dict(aggregate.option_counts or {})
+    return stats
+
+
+def _apply_answer(aggregate: CeremonyResponseAggregate, answer: AnswerSnapshot, sign: int) -> bool:
+    """
+    Add (sign=1) or remove (sign=-1) one answer from an aggregate row.
+
+    Returns True when the row can no longer be maintained incrementally, which
+    happens when the removed value was the current numeric min or max.
+    """
+    aggregate.response_count += sign
+
+    text = answer.text_response
+    if text and text.strip():
+        aggregate.text_count += sign
+        aggregate.text_length_sum += sign * len(text)
+
+    needs_recompute = False
+    value = answer.numeric_response
+    if value is not None:
+        aggregate.numeric_count += sign
+        aggregate.numeric_sum += sign * value
+        if sign > 0:
+            aggregate.numeric_min = value if aggregate.numeric_min is None else min(aggregate.numeric_min, value)
+            aggregate.numeric_max = value if aggregate.numeric_max is None else max(aggregate.numeric_max, value)
+        elif value in (aggregate.numeric_min, aggregate.numeric_max):
+            needs_recompute = True
+
+    if answer.selected_options:
+        # Reassign rather than mutate so the JSON column is flagged as dirty
+        option_counts = dict(aggregate.option_counts or {})
+        for option in answer.selected_options:
+            count = option_counts.get(option, 0) + sign
+            if count > 0:
+                option_counts[option] = count
+            else:
+                option_counts.pop(option, None)
+        aggregate.option_counts = option_counts
+
+    return needs_recompute
+
+
+def apply_answer_changes(
+    db: Session,
+    ceremony_id: int,
+    removed: List[AnswerSnapshot],
+    added: List[AnswerSnapshot]
+) -> None:
+    """
+    Update the ceremony aggregates for answers leaving and entering the summary.
+
+    Must be called inside the same transaction as the response write so the
+    aggregates commit (or roll back) together with the answers.
+    """
+    if not removed and not added:
+        return
+
+    aggregates: Dict[int, CeremonyResponseAggregate] = {}
+    stale: Set[int] = set()
+
+    for sign, answers in ((-1, removed), (1, added)):
+        for answer in answers:
+            aggregate = aggregates.get(answer.question_id)
+            if aggregate is None:
+                aggregate = _get_or_create_aggregate(db, ceremony_id, answer.question_id)
+                aggregates[answer.question_id] = aggregate
+            if _apply_answer(aggregate, answer, sign):
+                stale.add(answer.question_id)
+
+    if stale:
+        # Make the answer rows written by the caller visible to the recompute
+        db.flush()
+        recomputed = compute_question_stats(db, ceremony_id, question_ids=list(stale))
+        for question_id in stale:
+            _assign_stats(aggregates[question_id], recomputed.get(question_id) or empty_question_stats())
+
+
+def get_question_stats(db: Session, ceremony_id: int) -> Dict[int, Dict[str, Any]]:
+    """Read the maintained per-question stats for a ceremony"""
+    aggregates = db.query(CeremonyResponseAggregate).filter(
+        CeremonyResponseAggregate.ceremony_id == ceremony_id
+    ).all()
+    return {aggregate.question_id: _aggregate_stats(aggregate) for aggregate in aggregates}
+
+
+def rebuild_ceremony_aggregates(db: Session, ceremony_id: int) -> int:
+    """Replace a ceremony's aggregates with a full recompute. Returns the row count."""
+    recomputed = compute_question_stats(db, ceremony_id)
+
+    db.query(CeremonyResponseAggregate).filter(
+        CeremonyResponseAggregate.ceremony_id == ceremony_id
+    ).delete(synchronize_session=False)
+
+    for question_id, stats in recomputed.items():
+        aggregate = CeremonyResponseAggregate(ceremony_id=ceremony_id, question_id=question_id)
+        _assign_stats(aggregate, stats)
+        db.add(aggregate)
+
+    return len(recomputed)
+
+
+def rebuild_all_aggregates(db: Session) -> int:
+    """Backfill aggregates for every ceremony, committing per ceremony"""
+    ceremony_ids = [row.id for row in db.query(Ceremony.id).order_by(Ceremony.id).all()]
+    for ceremony_id in ceremony_ids:
+        rebuild_ceremony_aggregates(db, ceremony_id)
+        db.commit()
+    return len(ceremony_ids)
+
+
+def _mismatched_fields(expected: Dict[str, Any], actual: Dict[str, Any]) -> List[str]:
+    mismatched = []
+    for field in AGGREGATE_FIELDS:
+        left, right = expected[field], actual[field]
+        if isinstance(left, float) or isinstance(right, float):
+            if left is None or right is None:
+                equal = left is right
+            else:
+                equal = abs(left - right) <= 1e-6 * max(1.0, abs(left))
+        else:
+            equal = left == right
+        if not equal:
+            mismatched.append(field)
+    return mismatched
+
+
+def check_ceremony_aggregates(db: Session, ceremony_id: int) -> List[dict]:
+    """
+    Compare the maintained aggregates against a full recompute.
+
+    Returns one entry per question whose stored stats drifted; an empty list
+    means the aggregates are consistent.
+    """
+    expected = compute_question_stats(db, ceremony_id)
+    actual = get_question_stats(db, ceremony_id)
+
+    problems = []
+    for question_id in sorted(set(expected) | set(actual)):
+        expected_stats = expected.get(question_id) or empty_question_stats()
+        actual_stats = actual.get(question_id) or empty_question_stats()
+        fields = _mismatched_fields(expected_stats, actual_stats)
+        if fields:
+            problems.append({
+                "ceremony_id": ceremony_id,
+                "question_id": question_id,
+                "fields": fields,
+                "expected": {field: expected_stats[field] for field in fields},
+                "actual": {field: actual_stats[field] for field in fields},
+            })
+    return problems
@@ -0,0 +1,162 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+from fastapi import status
+from sqlalchemy import insert, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.core.authorization import TeamAccess
+from app.models.ceremony import Ceremony, CeremonyQuestion
+from app.models.response import CeremonyResponse, QuestionResponse
+from app.models.team import TeamMember
+from app.models.user import User
+from app.schemas.response import BulkCeremonyResponseItem
+
+BULK_RESPONSE_STATUS = "submitted"
+
+QUESTION_RESPONSE_FIELDS = (
+    "question_id",
+    "text_response",
+    "selected_options",
+    "numeric_response",
+    "date_response",
+    "time_response",
+)
+
+
+class BulkSnapshot:
+    """Everything needed to validate a batch, loaded with one query per table"""
+
+    def __init__(self, db: Session, items: List[BulkCeremonyResponseItem], user_ids: List[int]):
+        ceremony_ids = {item.ceremony_id for item in items}
+        team_ids = {item.team_id for item in items}
+
+        # Active ceremony id -> the team it belongs to
+        self.ceremony_teams: Dict[int, int] = dict(db.execute(
+            select(Ceremony.id, Ceremony.team_id).where(Ceremony.id.in_(ceremony_ids), Ceremony.is_active == True)
+        ).all())
+
+        self.questions: Dict[int, Dict[int, bool]] = defaultdict(dict)
+        for ceremony_id, question_id, is_required in db.execute(
+            select(CeremonyQuestion.ceremony_id, CeremonyQuestion.question_id, CeremonyQuestion.is_required)
+            .where(CeremonyQuestion.ceremony_id.in_(self.ceremony_teams))
+        ):
+            self.questions[ceremony_id][question_id] = is_required
+
+        self.memberships: Set[Tuple[int, int]] = set(db.execute(
+            select(TeamMember.user_id, TeamMember.team_id)
+            .where(TeamMember.user_id.in_(user_ids), TeamMember.team_id.in_(team_ids))
+        ).tuples())
+
+        self.existing: Set[Tuple[int, int]] = set(db.execute(
+            select(CeremonyResponse.ceremony_id, CeremonyResponse.user_id)
+            .where(tuple_(CeremonyResponse.ceremony_id, CeremonyResponse.user_id).in_(
+                [(item.ceremony_id, user_id) for item, user_id in zip(items, user_ids)]
+            ))
+        ).tuples())
+
+
+def _validate_item(
+    item: BulkCeremonyResponseItem,
+    user_id: int,
+    submitter: User,
+    team_access: TeamAccess,
+    snapshot: BulkSnapshot
+) -> Optional[Tuple[int, str]]:
+    """Return (status code, detail) for an item that cannot be created, or None"""
+    if user_id != submitter.id and submitter.role != "admin" and not team_access.is_manager(item.team_id):
+        return status.HTTP_403_FORBIDDEN, "Not enough permissions to submit responses for other users in this team"
+
+    if item.ceremony_id not in snapshot.ceremony_teams:
+        return status.HTTP_404_NOT_FOUND, "Ceremony not found or inactive"
+
+    if snapshot.ceremony_teams[item.ceremony_id] != item.team_id:
+        return status.HTTP_400_BAD_REQUEST, "Ceremony does not belong to the specified team"
+
+    if (user_id, item.team_id) not in snapshot.memberships:
+        return status.HTTP_403_FORBIDDEN, "User is not a member of the specified team"
+
+    if (item.ceremony_id, user_id) in snapshot.existing:
+        return status.HTTP_409_CONFLICT, "User already has a response for this ceremony"
+
+    provided_question_ids = {answer.question_id for answer in item.question_responses}
+    missing_required = [
+        question_id
+        for question_id, is_required in snapshot.questions[item.ceremony_id].items()
+        if is_required and question_id not in provided_question_ids
+    ]
+    if missing_required:
+        return status.HTTP_400_BAD_REQUEST, f"Missing responses for required questions: {missing_required}"
+
+    return None
+
+
+def submit_bulk_responses(
+    db: Session,
+    items: List[BulkCeremonyResponseItem],
+    submitter: User,
+    team_access: TeamAccess
+) -> dict:
+    """
+    Validate and insert a batch of ceremony responses; the caller commits.
+
+    Items are checked against a snapshot loaded up front instead of per item.
+    Valid items are written with two executemany inserts (responses, then
+    answers); invalid ones are reported without failing the batch.
+    Returns a BulkResponseResult dict with per-item results in input order.
+    """
+    user_ids = [item.user_id or submitter.id for item in items]
+    snapshot = BulkSnapshot(db, items, user_ids)
+
+    results: List[dict] = []
+    accepted: List[Tuple[int, BulkCeremonyResponseItem, int]] = []
+    for index, (item, user_id) in enumerate(zip(items, user_ids)):
+        error = _validate_item(item, user_id, submitter, team_access, snapshot)
+        if error is None:
+            # Later duplicates within the same batch conflict with this one
+            snapshot.existing.add((item.ceremony_id, user_id))
+            accepted.append((index, item, user_id))
+            results.append({"index": index, "status_code": status.HTTP_201_CREATED})
+        else:
+            status_code, detail = error
+            results.append({"index": index, "status_code": status_code, "detail": detail})
+
+    if accepted:
+        completed_at = datetime.utcnow()
+        response_ids = db.scalars(
+            insert(CeremonyResponse).returning(CeremonyResponse.id, sort_by_parameter_order=True),
+            [
+                {
+                    "ceremony_id": item.ceremony_id,
+                    "user_id": user_id,
+                    "team_id": item.team_id,
+                    "notes": item.notes,
+                    "mood_rating": item.mood_rating,
+                    "energy_level": item.energy_level,
+                    "status": BULK_RESPONSE_STATUS,
+                    "is_complete": True,
+                    "completed_at": completed_at,
+                }
+                for _, item, user_id in accepted
+            ]
+        ).all()
+
+        answer_rows = []
+        for (index, item, _), response_id in zip(accepted, response_ids):
+            results[index]["response_id"] = response_id
+            questions = snapshot.questions[item.ceremony_id]
+            rows = [
+                {
+                    "ceremony_response_id": response_id,
+                    "is_required": questions.get(answer.question_id, True),
+                    **{field: getattr(answer, field) for field in QUESTION_RESPONSE_FIELDS},
+                }
+                for answer in item.question_responses
+            ]
+            answer_rows.extend(rows)
+
+        if answer_rows:
+            db.execute(insert(QuestionResponse), answer_rows)
+
+    created = len(accepted)
+    return {"created": created, "failed": len(items) - created, "results": results}
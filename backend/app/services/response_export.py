@@ -0,0 +1,135 @@
+import csv
+import io
+import json
+from datetime import date, datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Callable, Iterable, List, Sequence
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.ceremony import Ceremony
+from app.models.question import Question
+from app.models.response import CeremonyResponse, QuestionResponse
+from app.models.team import Team
+from app.models.user import User
+
+# Rows fetched (and encoded) per round trip; memory stays bounded by this
+EXPORT_BATCH_SIZE = 1000
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    JSONL = "jsonl"
+
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.CSV: "text/csv",  # StreamingResponse appends charset=utf-8
+    ExportFormat.JSONL: "application/x-ndjson",
+}
+
+# One row per answer; responses without answers appear once with empty answer columns
+EXPORT_COLUMNS = (
+    CeremonyResponse.id.label("response_id"),
+    CeremonyResponse.ceremony_id,
+    Ceremony.name.label("ceremony_name"),
+    CeremonyResponse.team_id,
+    Team.name.label("team_name"),
+    CeremonyResponse.user_id,
+    User.email.label("user_email"),
+    User.full_name.label("user_name"),
+    CeremonyResponse.status,
+    CeremonyResponse.submitted_at,
+    CeremonyResponse.completed_at,
+    CeremonyResponse.mood_rating,
+    CeremonyResponse.energy_level,
+    CeremonyResponse.notes,
+    QuestionResponse.question_id,
+    Question.text.label("question_text"),
+    Question.question_type,
+    QuestionResponse.text_response,
+    QuestionResponse.selected_options,
+    QuestionResponse.numeric_response,
+    QuestionResponse.date_response,
+    QuestionResponse.time_response,
+    QuestionResponse.file_name,
+)
+EXPORT_FIELDS = [column.key for column in EXPORT_COLUMNS]
+
+
+def build_export_query(*filters) -> Select:
+    """The flattened response x answer rows matching ``filters``, in a stable order"""
+    return (
+        select(*EXPORT_COLUMNS)
+        .join(Ceremony, Ceremony.id == CeremonyResponse.ceremony_id)
+        .join(Team, Team.id == CeremonyResponse.team_id)
+        .join(User, User.id == CeremonyResponse.user_id)
+        .outerjoin(QuestionResponse, QuestionResponse.ceremony_response_id == CeremonyResponse.id)
+        .outerjoin(Question, Question.id == QuestionResponse.question_id)
+        .where(*filters)
+        .order_by(CeremonyResponse.submitted_at, CeremonyResponse.id, QuestionResponse.id)
+    )
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, list):
+        return "; ".join(str(item) for item in value)
+    return value
+
+
+def encode_csv(rows: Sequence[Sequence[Any]]) -> bytes:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows([_csv_value(value) for value in row] for row in rows)
+    return buffer.getvalue().encode("utf-8")
+
+
+def encode_jsonl(rows: Sequence[Sequence[Any]]) -> bytes:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, (_json_value(value) for value in row))), ensure_ascii=False) + "\n"
+        for row in rows
+    ).encode("utf-8")
+
+
+ENCODERS = {
+    ExportFormat.CSV: encode_csv,
+    ExportFormat.JSONL: encode_jsonl,
+}
+
+
+async def stream_export(
+    session_factory: async_sessionmaker,
+    export_format: ExportFormat,
+    filters: Iterable[Any],
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> AsyncIterator[bytes]:
+    """
+    Yield an export chunk by chunk. Rows come from a server-side cursor
+    ``batch_size`` at a time and each batch is encoded and sent before the
+    next is fetched, so memory use does not grow with the export.
+
+    The export opens its own session: it is consumed after the endpoint has
+    returned, when the request's session may already be closed.
+    """
+    encode: Callable[[Sequence[Sequence[Any]]], bytes] = ENCODERS[export_format]
+    if export_format == ExportFormat.CSV:
+        yield encode_csv([EXPORT_FIELDS])
+
+    query = build_export_query(*filters).execution_options(yield_per=batch_size)
+    async with session_factory() as db:
+        result = await db.stream(query)
+        async for partition in result.partitions():
+            yield encode(partition)
+
+
+def export_filename(export_format: ExportFormat, parts: List[str]) -> str:
+    return "-".join(["responses", *parts]) + f".{export_format.value}"
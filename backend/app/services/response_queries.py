@@ -0,0 +1,54 @@
+from typing import List, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.pagination import paginate_keyset
+from app.models.response import CeremonyResponse, QuestionResponse
+
+# Correlated count so list rows never touch the question_responses collection
+question_responses_count = select(
+    func.count(QuestionResponse.id)
+).where(
+    QuestionResponse.ceremony_response_id == CeremonyResponse.id
+).correlate(CeremonyResponse).scalar_subquery().label("question_responses_count")
+
+RESPONSE_LIST_COLUMNS = (
+    CeremonyResponse.id,
+    CeremonyResponse.ceremony_id,
+    CeremonyResponse.user_id,
+    CeremonyResponse.team_id,
+    CeremonyResponse.submitted_at,
+    CeremonyResponse.completed_at,
+    CeremonyResponse.is_complete,
+    CeremonyResponse.status,
+    CeremonyResponse.notes,
+    CeremonyResponse.mood_rating,
+    CeremonyResponse.energy_level,
+    question_responses_count,
+)
+
+
+def list_ceremony_responses(
+    db: Session,
+    *filters,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    List CeremonyResponse rows matching ``filters`` as CeremonyResponseList dicts.
+
+    Only the list columns are selected and the answer count comes from a
+    correlated subquery, so the whole page is one statement. Results are
+    newest first; pass ``limit`` (and the returned cursor) to page through them.
+    """
+    query = db.query(*RESPONSE_LIST_COLUMNS).filter(*filters)
+
+    if limit is None and cursor is None:
+        rows = query.order_by(CeremonyResponse.submitted_at.desc(), CeremonyResponse.id.desc()).all()
+        next_cursor = None
+    else:
+        rows, next_cursor = paginate_keyset(
+            query, CeremonyResponse.submitted_at, CeremonyResponse.id, cursor, limit or 100
+        )
+
+    return [dict(row._mapping) for row in rows], next_cursor
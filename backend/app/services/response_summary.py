@@ -0,0 +1,206 @@
+from typing import Any, Dict, List, Optional
+from sqlalchemy.orm import Session
+from sqlalchemy import func, case
+
+from app.models.ceremony import Ceremony, CeremonyQuestion
+from app.models.question import Question, QuestionType
+from app.models.response import CeremonyResponse, QuestionResponse
+from app.models.team import TeamMember
+
+TEXT_QUESTION_TYPES = {QuestionType.SHORT_ANSWER.value, QuestionType.PARAGRAPH.value}
+OPTION_QUESTION_TYPES = {
+    QuestionType.MULTIPLE_CHOICE.value,
+    QuestionType.CHECKBOXES.value,
+    QuestionType.DROPDOWN.value,
+}
+SCALE_QUESTION_TYPES = {QuestionType.LINEAR_SCALE.value}
+
+# Only completed responses count towards a ceremony summary
+SUMMARY_RESPONSE_STATUS = "completed"
+
+
+def empty_question_stats() -> Dict[str, Any]:
+    """Return a zeroed per-question stats bucket"""
+    return {
+        "response_count": 0,
+        "text_count": 0,
+        "text_length_sum": 0,
+        "numeric_count": 0,
+        "numeric_sum": 0.0,
+        "numeric_min": None,
+        "numeric_max": None,
+        "option_counts": {},
+    }
+
+
+def format_question_summary(question_type: str, stats: Dict[str, Any]) -> dict:
+    """Turn raw per-question stats into the type specific response_summary dict"""
+    if question_type in TEXT_QUESTION_TYPES:
+        text_count = stats["text_count"]
+        return {
+            "total_text_responses": text_count,
+            "average_length": stats["text_length_sum"] / text_count if text_count else 0
+        }
+
+    if question_type in OPTION_QUESTION_TYPES:
+        return {"option_counts": dict(stats["option_counts"])}
+
+    if question_type in SCALE_QUESTION_TYPES:
+        numeric_count = stats["numeric_count"]
+        if not numeric_count:
+            return {}
+        return {
+            "average": stats["numeric_sum"] / numeric_count,
+            "min": stats["numeric_min"],
+            "max": stats["numeric_max"],
+            "total_responses": numeric_count
+        }
+
+    return {}
+
+
+def _percentage(count: int, total: int) -> float:
+    return (count / total * 100) if total > 0 else 0
+
+
+def get_ceremony_questions(db: Session, ceremony_id: int) -> List[Any]:
+    """Fetch the ordered question columns needed for a summary"""
+    return db.query(
+        CeremonyQuestion.question_id,
+        Question.text,
+        Question.question_type,
+    ).join(
+        Question, Question.id == CeremonyQuestion.question_id
+    ).filter(
+        CeremonyQuestion.ceremony_id == ceremony_id
+    ).order_by(CeremonyQuestion.order_index).all()
+
+
+def compute_question_stats(
+    db: Session,
+    ceremony_id: int,
+    option_question_ids: Optional[List[int]] = None,
+    question_ids: Optional[List[int]] = None
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Compute per-question stats for a ceremony from the raw answer rows.
+
+    Counters, text lengths and numeric aggregates come from a single GROUP BY
+    over question_responses. Option histograms live in a JSON column that we
+    cannot aggregate portably, so those are tallied in Python from a narrow
+    (question_id, selected_options) projection.
+
+    ``option_question_ids`` limits that Python pass to the listed questions
+    (an empty list skips it) and ``question_ids`` restricts the whole
+    computation to a subset of questions.
+    """
+    non_empty_text = func.length(func.trim(QuestionResponse.text_response)) > 0
+
+    rows = db.query(
+        QuestionResponse.question_id,
+        func.count(QuestionResponse.id),
+        func.sum(case((non_empty_text, 1), else_=0)),
+        func.sum(case((non_empty_text, func.length(QuestionResponse.text_response)), else_=0)),
+        func.count(QuestionResponse.numeric_response),
+        func.sum(QuestionResponse.numeric_response),
+        func.min(QuestionResponse.numeric_response),
+        func.max(QuestionResponse.numeric_response),
+    ).join(
+        CeremonyResponse, CeremonyResponse.id == QuestionResponse.ceremony_response_id
+    ).filter(
+        CeremonyResponse.ceremony_id == ceremony_id,
+        CeremonyResponse.status == SUMMARY_RESPONSE_STATUS
+    )
+    if question_ids is not None:
+        rows = rows.filter(QuestionResponse.question_id.in_(question_ids))
+    rows = rows.group_by(QuestionResponse.question_id).all()
+
+    stats: Dict[int, Dict[str, Any]] = {}
+    for question_id, responses, text_count, text_length, numeric_count, numeric_sum, numeric_min, numeric_max in rows:
+        bucket = empty_question_stats()
+        bucket.update({
+            "response_count": responses,
+            "text_count": text_count or 0,
+            "text_length_sum": text_length or 0,
+            "numeric_count": numeric_count,
+            "numeric_sum": numeric_sum or 0.0,
+            "numeric_min": numeric_min,
+            "numeric_max": numeric_max,
+        })
+        stats[question_id] = bucket
+
+    if option_question_ids is None or option_question_ids:
+        option_query = db.query(
+            QuestionResponse.question_id,
+            QuestionResponse.selected_options
+        ).join(
+            CeremonyResponse, CeremonyResponse.id == QuestionResponse.ceremony_response_id
+        ).filter(
+            CeremonyResponse.ceremony_id == ceremony_id,
+            CeremonyResponse.status == SUMMARY_RESPONSE_STATUS,
+            QuestionResponse.selected_options.isnot(None)
+        )
+        if question_ids is not None:
+            option_query = option_query.filter(QuestionResponse.question_id.in_(question_ids))
+        if option_question_ids:
+            option_query = option_query.filter(QuestionResponse.question_id.in_(option_question_ids))
+
+        for question_id, selected_options in option_query.yield_per(1000):
+            if not selected_options:
+                continue
+            option_counts = stats.setdefault(question_id, empty_question_stats())["option_counts"]
+            for option in selected_options:
+                option_counts[option] = option_counts.get(option, 0) + 1
+
+    return stats
+
+
+def build_ceremony_summary(
+    db: Session,
+    ceremony: Ceremony,
+    question_stats: Optional[Dict[int, Dict[str, Any]]] = None
+) -> dict:
+    """
+    Build the payload for a ceremony response summary.
+
+    ``question_stats`` may be supplied by a precomputed source; otherwise the
+    stats are computed from the raw answers.
+    """
+    total_team_members = db.query(func.count(TeamMember.id)).filter(
+        TeamMember.team_id == ceremony.team_id
+    ).scalar()
+
+    total_responses, average_mood, average_energy = db.query(
+        func.count(CeremonyResponse.id),
+        func.avg(CeremonyResponse.mood_rating),
+        func.avg(CeremonyResponse.energy_level)
+    ).filter(
+        CeremonyResponse.ceremony_id == ceremony.id,
+        CeremonyResponse.status == SUMMARY_RESPONSE_STATUS
+    ).one()
+
+    questions = get_ceremony_questions(db, ceremony.id)
+
+    if question_stats is None:
+        option_question_ids = [q.question_id for q in questions if q.question_type in OPTION_QUESTION_TYPES]
+        question_stats = compute_question_stats(db, ceremony.id, option_question_ids)
+
+    question_summaries = []
+    for question in questions:
+        stats = question_stats.get(question.question_id) or empty_question_stats()
+        question_summaries.append({
+            "question_id": question.question_id,
+            "question_text": question.text,
+            "question_type": question.question_type,
+            "response_summary": format_question_summary(question.question_type, stats),
+            "completion_rate": _percentage(stats["response_count"], total_team_members)
+        })
+
+    return {
+        "ceremony_id": ceremony.id,
+        "total_responses": total_responses,
+        "completion_rate": _percentage(total_responses, total_team_members),
+        "average_mood": float(average_mood) if average_mood is not None else None,
+        "average_energy": float(average_energy) if average_energy is not None else None,
+        "question_summaries": question_summaries
+    }
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Hot Path Index Benchmark
+
+Builds a throwaway SQLite database at the revision before the hot path
+indexes (0002), fills it with synthetic teams, memberships, responses and
+notifications, then runs the hot lookups before and after upgrading to
+0003. Prints each query's plan and average latency on both sides.
+
+Usage:
+    python benchmark_indexes.py                      # 20k users, 200 teams
+    python benchmark_indexes.py --users 50000        # larger dataset
+    python benchmark_indexes.py --runs 500           # more lookups per query
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, text
+
+BEFORE_REVISION = "0002"
+AFTER_REVISION = "0003"
+CEREMONIES_PER_TEAM = 2
+QUESTIONS_PER_CEREMONY = 6
+ANSWERS_PER_RESPONSE = 4
+NOTIFICATIONS_PER_USER = 10
+
+# (name, SQL, parameter factory)
+HOT_QUERIES = [
+    (
+        "membership check",
+        "SELECT 1 FROM team_members WHERE team_id = :team_id AND user_id = :user_id",
+        lambda d: {"team_id": random.randrange(1, d.teams + 1), "user_id": random.randrange(1, d.users + 1)},
+    ),
+    (
+        "teams of a user",
+        "SELECT team_id FROM team_members WHERE user_id = :user_id "
+        "UNION ALL SELECT team_id FROM team_managers WHERE user_id = :user_id",
+        lambda d: {"user_id": random.randrange(1, d.users + 1)},
+    ),
+    (
+        "already responded",
+        "SELECT id FROM ceremony_responses WHERE ceremony_id = :ceremony_id AND user_id = :user_id LIMIT 1",
+        lambda d: {"ceremony_id": random.randrange(1, d.ceremonies + 1), "user_id": random.randrange(1, d.users + 1)},
+    ),
+    (
+        "ceremony questions",
+        "SELECT question_id, is_required FROM ceremony_questions WHERE ceremony_id = :ceremony_id ORDER BY order_index",
+        lambda d: {"ceremony_id": random.randrange(1, d.ceremonies + 1)},
+    ),
+    (
+        "unread notifications",
+        "SELECT id, title FROM notifications WHERE user_id = :user_id AND status = 'sent'",
+        lambda d: {"user_id": random.randrange(1, d.users + 1)},
+    ),
+    (
+        "team feed page",
+        "SELECT id FROM ceremony_responses WHERE team_id = :team_id ORDER BY submitted_at DESC, id DESC LIMIT 20",
+        lambda d: {"team_id": random.randrange(1, d.teams + 1)},
+    ),
+]
+
+class Dataset:
+    def __init__(self, users, teams):
+        self.users = users
+        self.teams = teams
+        self.ceremonies = teams * CEREMONIES_PER_TEAM
+
+def alembic_config(database_url):
+    config = Config(os.path.join(os.path.dirname(os.path.abspath(__file__)), "alembic.ini"))
+    config.set_main_option("sqlalchemy.url", database_url)
+    config.attributes["configure_logging"] = False
+    return config
+
+def insert_many(connection, table, rows):
+    if rows:
+        columns = list(rows[0])
+        connection.execute(
+            text(f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(':' + c for c in columns)})"),
+            rows
+        )
+
+def seed(engine, data):
+    """Fill the database; every user is in one team and answers both of its ceremonies"""
+    with engine.begin() as connection:
+        insert_many(connection, "companies", [{"name": "Benchmark Corp"}])
+        insert_many(connection, "teams", [{"name": f"Team {i}", "company_id": 1} for i in range(1, data.teams + 1)])
+        insert_many(connection, "users", [
+            {"email": f"user{i}@example.com", "username": f"user{i}", "full_name": f"User {i}",
+             "hashed_password": "x", "company_id": 1}
+            for i in range(1, data.users + 1)
+        ])
+        team_of = {user_id: (user_id - 1) % data.teams + 1 for user_id in range(1, data.users + 1)}
+        insert_many(connection, "team_members", [
+            {"team_id": team_id, "user_id": user_id, "is_active": True} for user_id, team_id in team_of.items()
+        ])
+        insert_many(connection, "team_managers", [
+            {"team_id": team_id, "user_id": team_id} for team_id in range(1, data.teams + 1)
+        ])
+        insert_many(connection, "ceremonies", [
+            {"name": f"Standup {i}", "team_id": (i - 1) // CEREMONIES_PER_TEAM + 1, "cadence": "daily", "start_time": "09:00:00"}
+            for i in range(1, data.ceremonies + 1)
+        ])
+        insert_many(connection, "questions", [
+            {"text": f"Question {i}", "question_type": "short_answer"} for i in range(1, QUESTIONS_PER_CEREMONY + 1)
+        ])
+        insert_many(connection, "ceremony_questions", [
+            {"ceremony_id": ceremony_id, "question_id": question_id, "order_index": question_id}
+            for ceremony_id in range(1, data.ceremonies + 1)
+            for question_id in range(1, QUESTIONS_PER_CEREMONY + 1)
+        ])
+
+        responses = []
+        for user_id, team_id in team_of.items():
+            for offset in range(CEREMONIES_PER_TEAM):
+                responses.append({
+                    "ceremony_id": (team_id - 1) * CEREMONIES_PER_TEAM + offset + 1,
+                    "user_id": user_id,
+                    "team_id": team_id,
+                    "status": "submitted",
+                })
+        insert_many(connection, "ceremony_responses", responses)
+        insert_many(connection, "question_responses", [
+            {"ceremony_response_id": response_id, "question_id": question_id, "text_response": "Working on it"}
+            for response_id in range(1, len(responses) + 1)
+            for question_id in range(1, ANSWERS_PER_RESPONSE + 1)
+        ])
+        insert_many(connection, "notifications", [
+            {"user_id": user_id, "type": "ceremony_reminder", "title": "Reminder", "message": "Standup soon",
+             "channel": "in_app", "status": random.choice(["pending", "sent", "read"])}
+            for user_id in range(1, data.users + 1)
+            for _ in range(NOTIFICATIONS_PER_USER)
+        ])
+        connection.execute(text("ANALYZE"))
+
+def measure(engine, data, runs):
+    """Plan and average latency (ms) of every hot query"""
+    results = {}
+    with engine.connect() as connection:
+        for name, sql, params in HOT_QUERIES:
+            plan = connection.execute(text("EXPLAIN QUERY PLAN " + sql), params(data)).fetchall()
+            timings = []
+            for _ in range(runs):
+                bound = params(data)
+                started = time.perf_counter()
+                connection.execute(text(sql), bound).fetchall()
+                timings.append((time.perf_counter() - started) * 1000)
+            results[name] = (" / ".join(row[-1] for row in plan), statistics.mean(timings))
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare hot query plans before and after the hot path indexes")
+    parser.add_argument("--users", type=int, default=20000, help="Users (one team each)")
+    parser.add_argument("--teams", type=int, default=200, help="Teams")
+    parser.add_argument("--runs", type=int, default=200, help="Lookups per query and side")
+    args = parser.parse_args()
+
+    random.seed(42)
+    data = Dataset(args.users, args.teams)
+    with tempfile.TemporaryDirectory() as directory:
+        database_url = f"sqlite:///{os.path.join(directory, 'benchmark.db')}"
+        config = alembic_config(database_url)
+        engine = create_engine(database_url)
+
+        print(f"🏗️  Migrating a scratch database to {BEFORE_REVISION}...")
+        command.upgrade(config, BEFORE_REVISION)
+        print(f"🌱 Seeding {args.users} users in {args.teams} teams...")
+        started = time.perf_counter()
+        seed(engine, data)
+        print(f"   done in {time.perf_counter() - started:.1f}s")
+
+        before = measure(engine, data, args.runs)
+        print(f"🔧 Upgrading to {AFTER_REVISION}...")
+        command.upgrade(config, AFTER_REVISION)
+        with engine.begin() as connection:
+            connection.execute(text("ANALYZE"))
+        after = measure(engine, data, args.runs)
+        engine.dispose()
+
+    print()
+    for name, _, _ in HOT_QUERIES:
+        plan_before, ms_before = before[name]
+        plan_after, ms_after = after[name]
+        print(f"📊 {name}: {ms_before:.3f} ms -> {ms_after:.3f} ms ({ms_before / ms_after:.1f}x)")
+        print(f"   before: {plan_before}")
+        print(f"   after:  {plan_after}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Login Throughput Benchmark
+
+Creates a throwaway SQLite database, seeds users whose password hashes use
+a lower bcrypt cost than PASSWORD_HASH_ROUNDS, and fires concurrent logins
+at the app in-process. A probe requests /health throughout, so the report
+shows how much the logins stall the rest of the worker. The first login of
+each user also upgrades their hash to the configured cost.
+
+Usage:
+    python benchmark_login.py                        # 500 logins, 50 at a time
+    python benchmark_login.py --logins 2000 --concurrency 200
+    python benchmark_login.py --inline               # verify on the event loop, as before
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from collections import Counter
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+PASSWORD = "benchmark-password"
+HEALTH_INTERVAL_SECONDS = 0.01
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)] if ordered else 0.0
+
+def seed(database_url, users, rounds):
+    """Migrate the scratch database and add ``users`` users sharing one low-cost hash"""
+    from passlib.context import CryptContext
+    from app.core.database import SessionLocal
+    from app.core.migrations import migrate
+    from app.models.company import Company
+    from app.models.user import User
+
+    migrate(database_url)
+    hashed_password = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds).hash(PASSWORD)
+    db = SessionLocal()
+    try:
+        company = Company(name="Benchmark Corp")
+        db.add(company)
+        db.flush()
+        db.add_all([
+            User(email=f"user{i}@example.com", username=f"user{i}", full_name=f"User {i}",
+                 hashed_password=hashed_password, company_id=company.id)
+            for i in range(users)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+def count_upgraded(rounds):
+    from app.core.database import SessionLocal
+    from app.models.user import User
+
+    db = SessionLocal()
+    try:
+        return db.query(User).filter(User.hashed_password.like(f"$2b${rounds:02d}$%")).count()
+    finally:
+        db.close()
+
+async def run(args):
+    import httpx
+    from app.core import security
+    from app.core.config import settings
+    from main import app
+
+    if args.inline:
+        async def run_inline(fn, *fn_args):
+            return fn(*fn_args)
+        security.password_hasher.run = run_inline
+
+    login_ms, health_ms, statuses = [], [], Counter()
+    done = asyncio.Event()
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)  # errors count as 500s
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        async def probe():
+            # Timed from when the probe was due, so a blocked event loop shows up as latency
+            due = time.perf_counter()
+            while not done.is_set():
+                await client.get("/health")
+                health_ms.append((time.perf_counter() - due) * 1000)
+                due = time.perf_counter() + HEALTH_INTERVAL_SECONDS
+                await asyncio.sleep(HEALTH_INTERVAL_SECONDS)
+
+        queue = asyncio.Queue()
+        for i in range(args.logins):
+            queue.put_nowait(i % args.users)
+
+        async def login_worker():
+            while not queue.empty():
+                user = queue.get_nowait()
+                started = time.perf_counter()
+                response = await client.post(
+                    f"{settings.API_V1_STR}/auth/login",
+                    json={"email": f"user{user}@example.com", "password": PASSWORD}
+                )
+                login_ms.append((time.perf_counter() - started) * 1000)
+                statuses[response.status_code] += 1
+
+        probe_task = asyncio.create_task(probe())
+        started = time.perf_counter()
+        await asyncio.gather(*(login_worker() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - started
+        done.set()
+        await probe_task
+
+    security.password_hasher.close()
+    return elapsed, login_ms, health_ms, statuses, security.password_hasher.stats()
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure login throughput and event loop stalls")
+    parser.add_argument("--users", type=int, default=100, help="Distinct users logging in")
+    parser.add_argument("--logins", type=int, default=500, help="Logins in total")
+    parser.add_argument("--concurrency", type=int, default=50, help="Logins in flight at once")
+    parser.add_argument("--seed-rounds", type=int, default=10, help="bcrypt cost of the seeded hashes")
+    parser.add_argument("--inline", action="store_true", help="Verify passwords on the event loop for comparison")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        # Settings are read on import, so the scratch database is chosen first
+        os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(directory, 'benchmark.db')}"
+        os.environ["ASYNC_DATABASE_URL"] = ""
+        from app.core.config import settings
+
+        print(f"🌱 Seeding {args.users} users (bcrypt cost {args.seed_rounds})...")
+        seed(settings.DATABASE_URL, args.users, args.seed_rounds)
+
+        mode = "on the event loop" if args.inline else f"on {settings.PASSWORD_HASH_WORKERS} hashing threads"
+        print(f"🔐 {args.logins} logins, {args.concurrency} at a time, verified {mode}...")
+        elapsed, login_ms, health_ms, statuses, stats = asyncio.run(run(args))
+        upgraded = count_upgraded(settings.PASSWORD_HASH_ROUNDS)
+
+    print()
+    print(f"📊 Throughput: {len(login_ms) / elapsed:.1f} logins/s over {elapsed:.1f}s")
+    print(f"   Responses: {dict(sorted(statuses.items()))}")
+    print(f"   Login latency:  p50 {percentile(login_ms, 0.5):.0f} ms, p95 {percentile(login_ms, 0.95):.0f} ms, "
+          f"p99 {percentile(login_ms, 0.99):.0f} ms")
+    if health_ms:
+        print(f"   /health during: p50 {statistics.median(health_ms):.1f} ms, p95 {percentile(health_ms, 0.95):.1f} ms, "
+              f"max {max(health_ms):.1f} ms ({len(health_ms)} probes)")
+    print(f"   Hashes upgraded to cost {settings.PASSWORD_HASH_ROUNDS}: {upgraded} of {args.users}")
+    if not args.inline:
+        print(f"   Hashing pool: max queue {stats.max_waiting}, avg wait {stats.average_wait_ms:.0f} ms, "
+              f"avg bcrypt {stats.average_run_ms:.0f} ms, rejected {stats.rejected}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
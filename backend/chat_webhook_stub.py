@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Chat Webhook Stub Server
+
+A local stand-in for Slack / Google Chat / Teams incoming webhooks, for
+trying chat digests end to end. Point a ceremony's chat_webhook_url at it
+and run the notification worker; every post is printed.
+
+Usage:
+    python chat_webhook_stub.py                        # listen on 127.0.0.1:8025
+    python chat_webhook_stub.py --port 9000
+    python chat_webhook_stub.py --rate-limit-every 3   # answer every 3rd post with 429
+"""
+
+import argparse
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class StubWebhookHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real webhook hosts
+    posts = 0
+    rate_limit_every = 0
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        StubWebhookHandler.posts += 1
+
+        if self.rate_limit_every and StubWebhookHandler.posts % self.rate_limit_every == 0:
+            print(f"⏳ #{self.posts} {self.path}: answered 429")
+            self._reply(429, b"rate limited", {"Retry-After": "1"})
+            return
+
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            self._reply(400, b"invalid json")
+            return
+        print(f"💬 #{self.posts} {self.path} (connection from port {self.client_address[1]})")
+        print(payload.get("text") or json.dumps(payload, indent=2))
+        self._reply(200, b"ok")
+
+    def _reply(self, status, body, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description="Print chat webhook posts")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Answer every Nth post with 429")
+    args = parser.parse_args()
+
+    StubWebhookHandler.rate_limit_every = args.rate_limit_every
+    server = ThreadingHTTPServer((args.host, args.port), StubWebhookHandler)
+    print(f"🧪 Stub webhook listening on http://{args.host}:{args.port}/ (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("👋 Stub webhook stopped")
+    finally:
+        server.server_close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -17,7 +17,8 @@ from sqlalchemy.orm import Session
 # Add the backend directory to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from app.core.database import engine, Base, get_db
+from app.core.database import get_db
+from app.core.migrations import migrate
 from app.core.security import get_password_hash
 from app.models.user import User, UserRole
 from app.models.company import Company
@@ -28,10 +29,10 @@ from app.models.response import CeremonyResponse
 from app.models.chat_integration import ChatIntegration
 
 def create_tables():
-    """Create all database tables"""
+    """Create all database tables by applying the migrations"""
     print("🗄️  Creating database tables...")
-    Base.metadata.create_all(bind=engine)
-    print("✅ Database tables created successfully!")
+    before, after = migrate()
+    print(f"✅ Database schema migrated from {before or 'empty'} to {after}!")
 
 def create_sample_data():
     """Create comprehensive sample data for development and testing"""
@@ -1,42 +1,103 @@
+import asyncio
+from contextlib import suppress
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from app.api.api_v1.api import api_router
+from app.api.api_v1.api import include_api_routers
 from app.core.config import settings
-from app.core.database import engine, Base
-
-# Import models in specific order to avoid circular dependencies
-from app.models.user import User
-from app.models.company import Company
-from app.models.team import Team, TeamMember, TeamManager
-from app.models.ceremony import Ceremony, CeremonyQuestion
-from app.models.response import CeremonyResponse, QuestionResponse, ResponseAttachment
-from app.models.question import Question, QuestionOption
-from app.models.notification import Notification, NotificationTemplate
-from app.models.chat_integration import ChatIntegration
-from app.models.work_schedule import WorkSchedule
-
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI(
-    title="StandUp API",
-    description="Virtual Daily Stand-up Web Application API",
-    version="1.0.0",
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
-)
-
-# Set up CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.BACKEND_CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# Include API router
-app.include_router(api_router, prefix=settings.API_V1_STR)
+from app.core.database import async_engine, engine
+from app.core.migrations import verify_schema_revision
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.core.security import password_hasher
+
+# Registers every model with the mapper before the first query. The
+# endpoints import the models they use; this covers the relationships.
+from app import models  # noqa: F401
+
+def create_app() -> FastAPI:
+    application = FastAPI(
+        title="StandUp API",
+        description="Virtual Daily Stand-up Web Application API",
+        version="1.0.0",
+        openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    )
+
+    # Set up CORS
+    application.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.BACKEND_CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Content-Range", "Content-Disposition"],
+    )
+
+    # Include API routers
+    include_api_routers(application, settings.API_V1_STR)
+    return application
+
+app = create_app()
+
+@app.on_event("startup")
+async def check_schema():
+    # Schema changes are applied by `python migrate.py`, once, before the workers start
+    if settings.SCHEMA_CHECK_ON_STARTUP:
+        verify_schema_revision(engine)
+
+# The background services (and jinja2, httpx with them) are imported only
+# by the workers that run them.
+
+@app.on_event("startup")
+async def start_scheduler():
+    # Single-process deployments only; otherwise run scheduler_worker.py once
+    if settings.SCHEDULER_ENABLED:
+        from app.services.ceremony_digest import dispatch_digests
+        from app.services.ceremony_scheduler import closing_scheduler, run_scheduler
+        from app.services.reminder_planner import dispatch_reminders
+
+        app.state.scheduler_task = asyncio.create_task(run_scheduler(dispatch_reminders))
+        app.state.closing_task = asyncio.create_task(run_scheduler(dispatch_digests, closing_scheduler))
+
+@app.on_event("startup")
+async def start_notification_worker():
+    if settings.NOTIFICATION_WORKER_ENABLED:
+        from app.services.notification_delivery import NotificationWorker
+
+        app.state.notification_stop = asyncio.Event()
+        app.state.notification_task = asyncio.create_task(
+            NotificationWorker().run(app.state.notification_stop)
+        )
+
+@app.on_event("shutdown")
+async def stop_scheduler():
+    for name in ("scheduler_task", "closing_task"):
+        task = getattr(app.state, name, None)
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+
+@app.on_event("shutdown")
+async def stop_notification_worker():
+    task = getattr(app.state, "notification_task", None)
+    if task is not None:
+        # Let the batch in flight finish so its results are written back
+        app.state.notification_stop.set()
+        await task
+
+@app.on_event("shutdown")
+async def stop_preview_pipeline():
+    from app.services.attachment_previews import preview_pipeline
+
+    preview_pipeline.close()
+
+@app.on_event("shutdown")
+async def stop_password_hasher():
+    password_hasher.close()
+
+@app.on_event("shutdown")
+async def close_async_engine():
+    await async_engine.dispose()
 
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Database Migration Script
+
+Brings the database schema to the latest revision. Run it once per deploy,
+before starting the app: the app itself only checks the revision and
+refuses to start when it is behind.
+
+Usage:
+    python migrate.py                    # upgrade to the latest revision
+    python migrate.py --check            # report the revision, exit 1 if behind
+    python migrate.py --stamp 0001       # mark an existing database as being at a revision
+"""
+
+import argparse
+import sys
+import os
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import engine
+from app.core.migrations import SchemaOutOfDate, head_revision, migrate, stamp, verify_schema_revision
+
+def check():
+    """Compare the database revision with the newest migration"""
+    try:
+        revision = verify_schema_revision(engine)
+    except SchemaOutOfDate as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"✅ Database schema is up to date ({revision})")
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply database migrations")
+    parser.add_argument("--check", action="store_true", help="Only report whether the schema is up to date")
+    parser.add_argument("--stamp", metavar="REVISION", help="Record REVISION as applied without running migrations")
+    args = parser.parse_args()
+
+    if args.check:
+        return check()
+
+    if args.stamp:
+        stamp(args.stamp)
+        print(f"✅ Database stamped at revision {args.stamp}")
+        return 0
+
+    print(f"🗄️  Migrating database to {head_revision()}...")
+    try:
+        before, after = migrate()
+    except SchemaOutOfDate as e:
+        print(f"❌ {e}")
+        return 1
+    if before == after:
+        print(f"✅ Already up to date ({after})")
+    else:
+        print(f"✅ Migrated from {before or 'empty'} to {after}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
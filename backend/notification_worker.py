@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Notification Delivery Worker
+
+Delivers pending notifications (email, chat, in-app) in leased batches.
+Several workers can run side by side; each claims its own batch.
+
+Usage:
+    python notification_worker.py           # run until interrupted
+    python notification_worker.py --once    # deliver one batch and exit
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.notification_delivery import NotificationWorker
+
+async def run(once=False):
+    """Deliver one batch, or keep delivering until interrupted"""
+    worker = NotificationWorker()
+    if once:
+        try:
+            handled = await worker.run_once()
+        finally:
+            await worker.close()
+        print(f"✅ Handled {handled} notifications")
+        return 0
+
+    print("📨 Notification worker started (Ctrl+C to stop)")
+    await worker.run()
+    return 0
+
+def main():
+    parser = argparse.ArgumentParser(description="Deliver pending notifications")
+    parser.add_argument("--once", action="store_true", help="Deliver a single batch and exit")
+    args = parser.parse_args()
+
+    try:
+        return asyncio.run(run(args.once))
+    except KeyboardInterrupt:
+        print("👋 Notification worker stopped")
+        return 0
+    except Exception as e:
+        print(f"❌ Notification worker failed: {e}")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
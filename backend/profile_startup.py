@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Worker Startup Profiler
+
+Starts the app the way a fresh worker does, in a new interpreter each run:
+imports main (building the app and its routes) and runs the startup hooks,
+with the scheduler and notification worker turned off. Prints the median
+time of each phase and where the import time goes, per app module and per
+third-party package.
+
+Usage:
+    python profile_startup.py                    # 5 runs, top 15 imports
+    python profile_startup.py --runs 10 --top 30
+    python profile_startup.py --budget-ms 2000   # exit 1 if startup is slower
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import Counter
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Runs in the child interpreter; its last stdout line is the JSON timing
+PROBE = """
+import asyncio, json, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+asyncio.run(main.app.router.startup())
+ready = time.perf_counter()
+asyncio.run(main.app.router.shutdown())
+print(json.dumps({"import_ms": (imported - started) * 1000, "startup_ms": (ready - imported) * 1000}))
+"""
+
+def run_probe(importtime=False):
+    """One cold start: (timings, -X importtime lines)"""
+    env = dict(os.environ, SCHEDULER_ENABLED="false", NOTIFICATION_WORKER_ENABLED="false")
+    options = ["-X", "importtime"] if importtime else []
+    result = subprocess.run(
+        [sys.executable, *options, "-c", PROBE],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "probe failed")
+    return json.loads(result.stdout.strip().splitlines()[-1]), result.stderr.splitlines()
+
+def import_breakdown(lines):
+    """
+    Self time (ms) per group: app modules by name, everything else by
+    top-level package. Self times add up to the whole import.
+    """
+    groups = Counter()
+    for line in lines:
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        group = name if name == "main" or name.startswith("app.") else name.split(".")[0]
+        groups[group] += int(self_us) / 1000
+    return groups
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile a cold worker start")
+    parser.add_argument("--runs", type=int, default=5, help="Cold starts to take the median of")
+    parser.add_argument("--top", type=int, default=15, help="Import groups to list")
+    parser.add_argument("--budget-ms", type=float, help="Fail when the median start takes longer")
+    args = parser.parse_args()
+
+    print(f"🚀 Profiling {args.runs} cold starts...")
+    try:
+        runs = [run_probe() for _ in range(args.runs)]
+
+        # -X importtime slows the import down, so the breakdown comes from a run of its own
+        _, lines = run_probe(importtime=True)
+    except RuntimeError as e:
+        print(f"❌ Startup failed: {e}")
+        return 1
+
+    import_ms = statistics.median(timings["import_ms"] for timings, _ in runs)
+    startup_ms = statistics.median(timings["startup_ms"] for timings, _ in runs)
+    total_ms = import_ms + startup_ms
+    groups = import_breakdown(lines)
+    measured = sum(groups.values())
+
+    print(f"📦 Import:  {import_ms:.0f} ms")
+    print(f"⚙️  Startup: {startup_ms:.0f} ms")
+    print(f"⏱️  Total:   {total_ms:.0f} ms")
+    print()
+    print(f"📊 Import time by module, self time under -X importtime (top {args.top}):")
+    for group, ms in groups.most_common(args.top):
+        print(f"   {ms:8.1f} ms  {ms / measured:5.1%}  {group}")
+
+    if args.budget_ms is not None:
+        if total_ms > args.budget_ms:
+            print(f"❌ Startup took {total_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+            return 1
+        print(f"✅ Within the {args.budget_ms:.0f} ms budget")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Ceremony Response Aggregates Maintenance Script
+
+Backfills the ceremony_response_aggregates table from the raw answers, or
+checks the maintained aggregates against a full recompute.
+
+Usage:
+    python rebuild_aggregates.py                    # rebuild every ceremony
+    python rebuild_aggregates.py --ceremony-id 3    # rebuild one ceremony
+    python rebuild_aggregates.py --check            # report drift, exit 1 if any
+"""
+
+import argparse
+import sys
+import os
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.database import SessionLocal
+from app.models.ceremony import Ceremony
+from app.services.response_aggregates import (
+    check_ceremony_aggregates,
+    rebuild_all_aggregates,
+    rebuild_ceremony_aggregates,
+)
+
+def rebuild(db, ceremony_id=None):
+    """Rebuild aggregates for one ceremony or all of them"""
+    if ceremony_id is not None:
+        rows = rebuild_ceremony_aggregates(db, ceremony_id)
+        db.commit()
+        print(f"✅ Rebuilt {rows} question aggregates for ceremony {ceremony_id}")
+        return 0
+
+    ceremonies = rebuild_all_aggregates(db)
+    print(f"✅ Rebuilt aggregates for {ceremonies} ceremonies")
+    return 0
+
+def check(db, ceremony_id=None):
+    """Compare aggregates with a full recompute and report any drift"""
+    if ceremony_id is not None:
+        ceremony_ids = [ceremony_id]
+    else:
+        ceremony_ids = [row.id for row in db.query(Ceremony.id).order_by(Ceremony.id).all()]
+
+    problems = []
+    for current_id in ceremony_ids:
+        problems.extend(check_ceremony_aggregates(db, current_id))
+
+    if not problems:
+        print(f"✅ Aggregates consistent for {len(ceremony_ids)} ceremonies")
+        return 0
+
+    print(f"❌ Found {len(problems)} inconsistent question aggregates:")
+    for problem in problems:
+        print(
+            f"   ceremony {problem['ceremony_id']} question {problem['question_id']}: "
+            f"expected {problem['expected']}, stored {problem['actual']}"
+        )
+    return 1
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild or check ceremony response aggregates")
+    parser.add_argument("--ceremony-id", type=int, default=None, help="Only process this ceremony")
+    parser.add_argument("--check", action="store_true", help="Check consistency instead of rebuilding")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.check:
+            return check(db, args.ceremony_id)
+        return rebuild(db, args.ceremony_id)
+    except Exception as e:
+        print(f"❌ Aggregate maintenance failed: {e}")
+        db.rollback()
+        return 1
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
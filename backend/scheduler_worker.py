@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Ceremony Scheduler Worker
+
+Plans ceremony reminders when they are due and digests each occurrence
+once it is over. Run exactly one per deployment: every running scheduler
+dispatches every occurrence. The web app leaves the scheduler off
+(SCHEDULER_ENABLED=false) so adding uvicorn workers does not add
+schedulers.
+
+Usage:
+    python scheduler_worker.py              # run until interrupted
+"""
+
+import asyncio
+import sys
+import os
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.ceremony_digest import dispatch_digests
+from app.services.ceremony_scheduler import closing_scheduler, run_scheduler
+from app.services.reminder_planner import dispatch_reminders
+
+async def run():
+    """Run the reminder and closing schedulers side by side"""
+    print("⏰ Ceremony scheduler started (Ctrl+C to stop)")
+    await asyncio.gather(
+        run_scheduler(dispatch_reminders),
+        run_scheduler(dispatch_digests, closing_scheduler),
+    )
+    return 0
+
+def main():
+    try:
+        return asyncio.run(run())
+    except KeyboardInterrupt:
+        print("👋 Ceremony scheduler stopped")
+        return 0
+    except Exception as e:
+        print(f"❌ Ceremony scheduler failed: {e}")
+        return 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+SMTP Stub Server
+
+A local stand-in for the SMTP server, for trying email notifications end to
+end. Point the worker at it with SMTP_HOST=127.0.0.1 SMTP_PORT=1025
+SMTP_TLS=false and run the notification worker; every message is printed.
+Any AUTH PLAIN login is accepted.
+
+Usage:
+    python smtp_stub.py                      # listen on 127.0.0.1:1025
+    python smtp_stub.py --port 2525
+    python smtp_stub.py --delay 5            # take 5 s to accept each message
+    python smtp_stub.py --refuse-every 3     # refuse every 3rd recipient with 550
+"""
+
+import argparse
+import asyncio
+import sys
+from email import message_from_bytes
+from email.policy import default as default_policy
+
+class StubSmtpServer:
+    def __init__(self, delay=0.0, refuse_every=0):
+        self.delay = delay
+        self.refuse_every = refuse_every
+        self.messages = 0
+        self.recipients = 0
+
+    async def handle(self, reader, writer):
+        peer_port = writer.get_extra_info("peername")[1]
+
+        async def reply(line):
+            writer.write(line.encode() + b"\r\n")
+            await writer.drain()
+
+        await reply("220 stub ESMTP ready")
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                command, _, argument = line.decode(errors="replace").strip().partition(" ")
+                command = command.upper()
+
+                if command == "EHLO":
+                    await reply("250-stub")
+                    await reply("250-8BITMIME")
+                    await reply("250 AUTH PLAIN")
+                elif command == "HELO":
+                    await reply("250 stub")
+                elif command == "AUTH":
+                    await reply("235 2.7.0 Authentication successful")
+                elif command == "STARTTLS":
+                    await reply("454 4.7.0 TLS not available, run the worker with SMTP_TLS=false")
+                elif command == "MAIL":
+                    await reply("250 OK")
+                elif command == "RCPT":
+                    self.recipients += 1
+                    if self.refuse_every and self.recipients % self.refuse_every == 0:
+                        print(f"🚫 Refused {argument}")
+                        await reply("550 5.1.1 Mailbox unavailable")
+                    else:
+                        await reply("250 OK")
+                elif command == "DATA":
+                    await reply("354 End data with <CR><LF>.<CR><LF>")
+                    body = await self.read_data(reader)
+                    if self.delay:
+                        await asyncio.sleep(self.delay)
+                    self.messages += 1
+                    message = message_from_bytes(body, policy=default_policy)
+                    print(f"📧 #{self.messages} to {message['To']} (connection from port {peer_port})")
+                    print(f"   {message['Subject']}")
+                    await reply("250 OK")
+                elif command in ("RSET", "NOOP"):
+                    await reply("250 OK")
+                elif command == "QUIT":
+                    await reply("221 Bye")
+                    break
+                else:
+                    await reply("502 Command not implemented")
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def read_data(reader):
+        lines = []
+        while True:
+            line = await reader.readline()
+            if not line or line in (b".\r\n", b".\n"):
+                return b"".join(lines)
+            lines.append(line[1:] if line.startswith(b"..") else line)
+
+async def serve(args):
+    stub = StubSmtpServer(args.delay, args.refuse_every)
+    server = await asyncio.start_server(stub.handle, args.host, args.port)
+    print(f"🧪 Stub SMTP server listening on {args.host}:{args.port} (Ctrl+C to stop)")
+    async with server:
+        await server.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Print emails sent over SMTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=1025)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to wait before accepting each message")
+    parser.add_argument("--refuse-every", type=int, default=0, help="Refuse every Nth recipient with 550")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        print("👋 Stub SMTP server stopped")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,10 +12,18 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 if __name__ == "__main__":
     import uvicorn
     from app.core.config import settings
+    from app.core.migrations import migrate
+    
+    # Apply pending migrations once, before the server (and its reloader) starts
+    before, after = migrate()
+    if before != after:
+        print(f"🗄️  Database migrated from {before or 'empty'} to {after}")
     
     print("🚀 Starting StandUp Backend Server...")
     print(f"📡 API will be available at: http://localhost:8000")
     print(f"📚 API documentation at: http://localhost:8000/docs")
+    if not settings.SCHEDULER_ENABLED:
+        print("⏰ Reminders and digests need the scheduler: python scheduler_worker.py")
     
     uvicorn.run(
         "main:app",